@@ -1,11 +1,16 @@
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import List, Literal, Optional
 import os
 from functools import lru_cache
 
 class Settings(BaseSettings):
     # Database settings
     DATABASE_URL: str = "sqlite:///./debt_planner.db"
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_TIMEOUT_SECONDS: int = 30
     
     # Security settings
     SECRET_KEY: str = os.getenv("SECRET_KEY", "your-production-secret-key")
@@ -18,12 +23,69 @@ class Settings(BaseSettings):
         "https://your-production-domain.com"
     ]
     
+    # Authenticated users are remembered briefly so requests skip the user lookup
+    USER_CACHE_TTL_SECONDS: int = 60
+    USER_CACHE_MAX_ENTRIES: int = 4096
+
+    # Password hashing settings; hashes made with other rounds are upgraded on login
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = min(os.cpu_count() or 1, 4)
+
     # Server settings
     HOST: str = "0.0.0.0"
     PORT: int = 8000
 
+    # Payoff simulation limits
+    MAX_PLAN_MONTHS: int = 1200
+    PLAN_TIME_BUDGET_SECONDS: float = 5
+    # Interest rounding of the cents engine
+    CENTS_ROUNDING: Literal["half_even", "half_up", "truncate"] = "half_even"
+
+    # Calculation pool settings; a size of 0 runs calculations in the thread pool instead
+    CALC_POOL_SIZE: int = min(os.cpu_count() or 1, 4)
+    CALC_QUEUE_LIMIT: int = 32
+
+    # Plan cache settings
+    PLAN_CACHE_BACKEND: Literal["memory", "sqlite", "off"] = "memory"
+    PLAN_CACHE_PATH: str = "./plan_cache.db"
+    PLAN_CACHE_MAX_ENTRIES: int = 512
+    PLAN_CACHE_TTL_SECONDS: int = 3600
+    # Last plan kept per user (per process) for incremental replanning
+    REPLAN_MAX_USERS: int = 256
+    REPLAN_TTL_SECONDS: int = 3600
+
+    # Ledger settings: rows per import executemany, bad rows reported before an
+    # import gives up, and rows fetched per export batch
+    IMPORT_CHUNK_SIZE: int = 5000
+    IMPORT_MAX_ERRORS: int = 20
+    EXPORT_BATCH_SIZE: int = 2000
+    # Answer the summary endpoints from the monthly rollup tables instead of the raw rows
+    SUMMARY_FROM_ROLLUPS: bool = False
+
+    # Response settings; responses smaller than RESPONSE_COMPRESS_MIN_BYTES are sent uncompressed
+    RESPONSE_COMPRESS_MIN_BYTES: int = 1024
+    RESPONSE_GZIP_LEVEL: int = 6
+    RESPONSE_BROTLI_QUALITY: int = 4
+
+    # Metrics settings; every uvicorn worker process keeps (and serves) its own counts.
+    # The metrics endpoint has no authentication, so only expose it to the scraper's network
+    METRICS_ENABLED: bool = False
+    METRICS_PATH: str = "/metrics"
+
+    # Profiler settings; off unless PROFILE_MODE is set. Sampled profiles of
+    # requests faster than PROFILE_SLOW_MS are discarded. Header mode only
+    # profiles requests whose header carries PROFILE_TOKEN, none while it is unset
+    PROFILE_MODE: Literal["off", "header", "sample"] = "off"
+    PROFILE_HEADER: str = "x-profile"
+    PROFILE_TOKEN: Optional[str] = None
+    PROFILE_SAMPLE_RATE: float = 0.01
+    PROFILE_SLOW_MS: float = 500
+    PROFILE_DIR: str = "./profiles"
+    PROFILE_ENGINE: Literal["pyinstrument", "cprofile"] = "pyinstrument"
+
     class Config:
         env_file = ".env"
+        extra = "ignore"
 
 @lru_cache()
 def get_settings():
@@ -1,8 +1,23 @@
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response
 import uvicorn
-from app.database import Base, engine
+from app.config import get_settings
+from app.database import Base, engine, async_engine
 from app.routes import debt, auth, payments, expenses
+from app.services.worker_pool import calculation_pool
+from app.services.serialization import FastJSONResponse
+from app.services.plan_cache import plan_cache
+from app.services.metrics import (
+    CONTENT_TYPE,
+    MetricsMiddleware,
+    instrument_engine,
+    registry
+)
+from app.services.profiling import ProfilerMiddleware
+
+settings = get_settings()
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
@@ -10,7 +25,8 @@ Base.metadata.create_all(bind=engine)
 app = FastAPI(
     title="Debt Payoff Planner API",
     description="API for calculating credit card debt payoff strategies",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=FastJSONResponse
 )
 
 # Configure CORS - Allow all origins for now
@@ -22,12 +38,50 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Profiling runs inside the metrics middleware, so profiled requests are still counted
+if settings.PROFILE_MODE != "off":
+    app.add_middleware(ProfilerMiddleware)
+
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+    instrument_engine(async_engine, "async")
+    instrument_engine(engine, "sync")
+
+    plan_cache_hits = registry.counter("plan_cache_hits_total", "Plan cache hits")
+    plan_cache_misses = registry.counter("plan_cache_misses_total", "Plan cache misses")
+    plan_cache_entries = registry.gauge("plan_cache_entries", "Plans currently cached")
+    calculation_pool_pending = registry.gauge("calculation_pool_pending", "Calculations running or queued")
+    calculation_pool_rejected = registry.counter(
+        "calculation_pool_rejected_total", "Calculations rejected as the pool was full"
+    )
+
+    def collect_service_stats():
+        cache_stats = plan_cache.stats()
+        plan_cache_hits.set(cache_stats["hits"])
+        plan_cache_misses.set(cache_stats["misses"])
+        plan_cache_entries.set(cache_stats["entries"])
+        pool_stats = calculation_pool.stats()
+        calculation_pool_pending.set(pool_stats["pending"])
+        calculation_pool_rejected.set(pool_stats["rejected"])
+
+    registry.add_collector(collect_service_stats)
+
+    @app.get(settings.METRICS_PATH, include_in_schema=False)
+    async def metrics():
+        # The collectors may query the SQLite plan cache, so render off the event loop
+        content = await run_in_threadpool(registry.render)
+        return Response(content=content, media_type=CONTENT_TYPE)
+
 # Include routers
 app.include_router(debt.router)
 app.include_router(auth.router)
 app.include_router(payments.router)
 app.include_router(expenses.router)
 
+@app.on_event("shutdown")
+def shutdown_calculation_pool():
+    calculation_pool.shutdown()
+
 @app.get("/")
 async def root():
     return {"message": "Welcome to the Debt Payoff Planner"}
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Boolean, Numeric
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Boolean, Numeric, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -46,6 +46,12 @@ class Payment(Base):
     user = relationship("User", back_populates="payments")
     credit_card = relationship("CreditCard", back_populates="payments")
 
+    # Newest-first listings, per user and per card
+    __table_args__ = (
+        Index("ix_payments_user_id_payment_date", "user_id", "payment_date"),
+        Index("ix_payments_user_id_credit_card_id_payment_date", "user_id", "credit_card_id", "payment_date"),
+    )
+
 class Expense(Base):
     __tablename__ = "expenses"
 
@@ -59,11 +65,51 @@ class Expense(Base):
     user = relationship("User", back_populates="expenses")
     credit_card = relationship("CreditCard", back_populates="expenses")
 
+    # Newest-first listings, per user and per card
+    __table_args__ = (
+        Index("ix_expenses_user_id_date", "user_id", "date"),
+        Index("ix_expenses_user_id_credit_card_id_date", "user_id", "credit_card_id", "date"),
+    )
+
 class UserBalance(Base):
     __tablename__ = "user_balances"
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), unique=True)
     balance = Column(Numeric(10, 2))
+    # Running total of cash expenses, kept in step with the expenses ledger
+    cash_spent = Column(Numeric(10, 2), nullable=False, default=0, server_default="0")
+
+    user = relationship("User", back_populates="balance")
+
+class ExpenseMonthlyTotal(Base):
+    """Per-user, per-month, per-card expense totals kept in step with the expenses table."""
+    __tablename__ = "expense_monthly_totals"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    period = Column(Integer, nullable=False)  # year * 100 + month
+    credit_card_id = Column(Integer, nullable=False, default=0)  # 0 for cash expenses
+    count = Column(Integer, nullable=False, default=0)
+    total = Column(Numeric(12, 2), nullable=False, default=0)
+
+    __table_args__ = (
+        UniqueConstraint("user_id", "period", "credit_card_id", name="uq_expense_monthly_totals"),
+    )
+
+class PaymentMonthlyTotal(Base):
+    """Per-user, per-month, per-card payment totals kept in step with the payments table."""
+    __tablename__ = "payment_monthly_totals"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    period = Column(Integer, nullable=False)  # year * 100 + month
+    credit_card_id = Column(Integer, nullable=False, default=0)  # 0 once the card is deleted
+    count = Column(Integer, nullable=False, default=0)
+    amount = Column(Float, nullable=False, default=0)
+    interest = Column(Float, nullable=False, default=0)
+    principal = Column(Float, nullable=False, default=0)
 
-    user = relationship("User", back_populates="balance")
\ No newline at end of file
+    __table_args__ = (
+        UniqueConstraint("user_id", "period", "credit_card_id", name="uq_payment_monthly_totals"),
+    )
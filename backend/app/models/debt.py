@@ -1,24 +1,24 @@
-from pydantic import BaseModel, Field, validator
-from typing import List, Literal, Optional
+from pydantic import BaseModel, Field, PlainSerializer, validator
+from typing import Annotated, List, Literal, Optional
 from decimal import Decimal
 from uuid import uuid4
 from datetime import datetime
 
+# Decimal amount that is written to JSON as a number
+Money = Annotated[Decimal, PlainSerializer(float, return_type=float, when_used="json")]
+
 class CreditCard(BaseModel):
     id: Optional[int] = None
     name: str
-    balance: Decimal = Field(gt=0)
-    interest_rate: Decimal = Field(gt=0)
-    min_payment: Decimal = Field(gt=0)
+    balance: Money = Field(gt=0)
+    interest_rate: Money = Field(gt=0)
+    min_payment: Money = Field(gt=0)
     
     @validator('id', pre=True, always=True)
     def default_id(cls, v):
         return v or str(uuid4())
     
     class Config:
-        json_encoders = {
-            Decimal: lambda v: float(v)
-        }
         from_attributes = True
 
 class DebtPayoffRequest(BaseModel):
@@ -34,39 +34,148 @@ class DebtPayoffRequest(BaseModel):
                 raise ValueError(f"Monthly payment must be at least {total_min}")
         return v
 
+class StrategySpec(BaseModel):
+    name: Optional[str] = None
+    strategy: Literal["avalanche", "snowball", "custom", "hybrid"]
+    # custom: card ids in the order they should receive extra payments
+    card_order: Optional[List[int]] = None
+    # hybrid: cards below this balance go first (smallest first), then highest rate
+    balance_threshold: Optional[Decimal] = Field(default=None, gt=0)
+
+    @validator('card_order', always=True)
+    def validate_card_order(cls, v, values):
+        if values.get('strategy') == "custom" and not v:
+            raise ValueError("card_order is required for the custom strategy")
+        return v
+
+    @validator('balance_threshold', always=True)
+    def validate_balance_threshold(cls, v, values):
+        if values.get('strategy') == "hybrid" and v is None:
+            raise ValueError("balance_threshold is required for the hybrid strategy")
+        return v
+
+class DebtCompareRequest(BaseModel):
+    credit_cards: List[CreditCard] = Field(min_length=1)
+    monthly_payment: Decimal = Field(gt=0)
+    strategies: List[StrategySpec] = Field(
+        default_factory=lambda: [StrategySpec(strategy="avalanche"), StrategySpec(strategy="snowball")],
+        min_length=1,
+        max_length=20
+    )
+
+    @validator('monthly_payment')
+    def validate_monthly_payment(cls, v, values):
+        if 'credit_cards' in values:
+            total_min = sum(card.min_payment for card in values['credit_cards'])
+            if v < total_min:
+                raise ValueError(f"Monthly payment must be at least {total_min}")
+        return v
+
+class StrategySummary(BaseModel):
+    name: str
+    total_months: int
+    total_interest_paid: Money
+    total_amount_paid: Money
+    payoff_order: List[int]
+    pays_off: bool = True
+    # "never_pays_off" or "max_months" when pays_off is False
+    stop_reason: Optional[str] = None
+
+class DebtCompareResponse(BaseModel):
+    results: List[StrategySummary]
+    # Best strategies among those that pay off, None if none does
+    fewest_months: Optional[str]
+    least_interest: Optional[str]
+
+class OptimizeRequest(BaseModel):
+    credit_cards: List[CreditCard] = Field(min_length=1)
+    monthly_payment: Decimal = Field(gt=0)
+    objective: Literal["interest", "months"] = "interest"
+
+    @validator('monthly_payment')
+    def validate_monthly_payment(cls, v, values):
+        if 'credit_cards' in values:
+            total_min = sum(card.min_payment for card in values['credit_cards'])
+            if v < total_min:
+                raise ValueError(f"Monthly payment must be at least {total_min}")
+        return v
+
+class OptimizeResponse(BaseModel):
+    objective: str
+    card_order: List[int]
+    payoff_order: List[int]
+    total_months: int
+    total_interest_paid: Money
+    total_amount_paid: Money
+    baselines: List[StrategySummary]
+    pays_off: bool = True
+    # "never_pays_off" or "max_months" when pays_off is False
+    stop_reason: Optional[str] = None
+
+class SolvePaymentRequest(BaseModel):
+    credit_cards: List[CreditCard] = Field(min_length=1)
+    strategy: Literal["avalanche", "snowball"]
+    target_months: int = Field(ge=1, le=1200)
+
+class SolvePaymentResponse(BaseModel):
+    target_months: int
+    monthly_payment: Money
+    total_months: int
+    total_interest_paid: Money
+    total_amount_paid: Money
+
+class UserPlanRequest(BaseModel):
+    strategy: Literal["avalanche", "snowball"]
+    monthly_payment: Decimal = Field(gt=0)
+
 class CardPayment(BaseModel):
     card_id: int
     card_name: str
-    payment: Decimal
-    interest_paid: Decimal
-    remaining_balance: Decimal
-    
-    class Config:
-        json_encoders = {
-            Decimal: lambda v: float(v)
-        }
+    payment: Money
+    interest_paid: Money
+    remaining_balance: Money
 
 class PaymentStep(BaseModel):
     month: int
     card_payments: List[CardPayment]
-    total_payment: Decimal
-    remaining_debt: Decimal
-    
-    class Config:
-        json_encoders = {
-            Decimal: lambda v: float(v)
-        }
-    
+    total_payment: Money
+    remaining_debt: Money
+
 class DebtPayoffResponse(BaseModel):
     total_months: int
-    total_interest_paid: Decimal
-    total_amount_paid: Decimal
+    total_interest_paid: Money
+    total_amount_paid: Money
     monthly_breakdown: List[PaymentStep]
-    
-    class Config:
-        json_encoders = {
-            Decimal: lambda v: float(v)
-        }
+    pays_off: bool = True
+    # "never_pays_off", "max_months" or "time_budget" when pays_off is False
+    stop_reason: Optional[str] = None
+
+class BatchPayoffRequest(BaseModel):
+    credit_cards: List[CreditCard]
+    strategy: Literal["avalanche", "snowball"]
+    monthly_payments: List[Decimal] = Field(min_length=1, max_length=1000)
+    rounding: Literal["none", "half_even", "half_up"] = "none"
+
+    @validator('monthly_payments')
+    def validate_monthly_payments(cls, v, values):
+        if 'credit_cards' in values:
+            total_min = sum(card.min_payment for card in values['credit_cards'])
+            for payment in v:
+                if payment < total_min:
+                    raise ValueError(f"Monthly payment must be at least {total_min}")
+        return v
+
+class BatchScenarioResult(BaseModel):
+    monthly_payment: Money
+    total_months: int
+    total_interest_paid: Money
+    total_amount_paid: Money
+    pays_off: bool = True
+    # "never_pays_off" or "max_months" when pays_off is False
+    stop_reason: Optional[str] = None
+
+class BatchPayoffResponse(BaseModel):
+    scenarios: List[BatchScenarioResult]
 
 
 class PaymentCreate(BaseModel):
@@ -81,4 +190,31 @@ class Payment(PaymentCreate):
     user_id: int
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class PaymentPage(BaseModel):
+    payments: List[Payment]
+    # Cursor for the following page, None on the last one; same convention as the expense listing
+    nextCursor: Optional[str] = None
+
+class PaymentImportRow(PaymentCreate):
+    credit_card_id: int
+    # Imports clamp each card at zero once, after summing its principal; that only
+    # matches applying the rows one by one when no row adds to the balance
+    principal_portion: Decimal = Field(ge=0)
+    payment_date: Optional[datetime] = None  # defaults to the time of the import
+
+class PaymentMonthSummary(BaseModel):
+    month: str  # YYYY-MM
+    credit_card_id: Optional[int] = None
+    count: int
+    amount: float
+    interest_portion: float
+    principal_portion: float
+
+class PaymentSummary(BaseModel):
+    months: List[PaymentMonthSummary]
+    count: int
+    amount: float
+    interest_portion: float
+    principal_portion: float
\ No newline at end of file
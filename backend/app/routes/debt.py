@@ -1,27 +1,283 @@
-from fastapi import APIRouter, HTTPException, Depends
-from app.models.debt import DebtPayoffRequest, DebtPayoffResponse
-from app.services.calculator import calculate_debt_payoff
-from sqlalchemy.orm import Session
-from app.database import get_db
-from app.models.db_models import User, CreditCard as DBCreditCard
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+from fastapi.concurrency import run_in_threadpool
+from app.models.debt import (
+    DebtPayoffRequest,
+    DebtPayoffResponse,
+    BatchPayoffRequest,
+    BatchPayoffResponse,
+    UserPlanRequest,
+    DebtCompareRequest,
+    DebtCompareResponse,
+    OptimizeRequest,
+    OptimizeResponse,
+    SolvePaymentRequest,
+    SolvePaymentResponse,
+    CreditCard
+)
+from app.services.calculator import payoff_schedule, iter_debt_payoff
+from app.services.cents_calculator import payoff_schedule_cents, CENTS_ROUNDING
+from app.services.event_calculator import calculate_debt_payoff_events
+from app.services.batch_calculator import calculate_debt_payoff_batch
+from app.services.plan_cache import plan_cache, cache_key
+from app.services.strategy_compare import compare_strategies
+from app.services.optimizer import optimize_allocation
+from app.services.payment_solver import solve_minimum_payment
+from app.services.replanner import get_user_plan, invalidate_user_plan
+from app.services.worker_pool import calculation_pool, PoolSaturatedError
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db
+from app.models.db_models import User, CreditCard as DBCreditCard, Expense, Payment
 from app.services.auth import get_current_user
-from typing import List
+from app.services.cash_ledger import apply_cash_delta
+from app.services.summaries import rebuild_rollups
+from app.services.serialization import (
+    MSGPACK_MEDIA_TYPE,
+    encode,
+    encode_model,
+    negotiate,
+    negotiated_response
+)
+from app.services.metrics import record_calculation
+from typing import List, Literal, Optional
 from decimal import Decimal
+import json
+import time
 
 router = APIRouter(prefix="/debt", tags=["debt"])
 
+async def _offload(fn, *args):
+    """Run a calculation in the process pool, mapping failures to HTTP errors."""
+    try:
+        return await calculation_pool.run(fn, *args)
+    except PoolSaturatedError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def _calculate_body(
+    credit_cards, strategy, monthly_payment, engine, detail, offset, limit, rounding, media_type
+):
+    """
+    Compute and serialize a plan inside a pool worker, so only the encoded body crosses back,
+    along with the plan totals (total_months, pays_off, stop_reason), the engine that ran and
+    the calculation's wall time for the metrics.
+    """
+    start = time.perf_counter()
+    content, totals, engine = _calculate(
+        credit_cards, strategy, monthly_payment, engine, detail, offset, limit, rounding, media_type
+    )
+    return content, totals, engine, time.perf_counter() - start
+
+def _calculate(credit_cards, strategy, monthly_payment, engine, detail, offset, limit, rounding, media_type):
+    """Returns (content, totals, engine used); summaries of the monthly engine run on the event engine."""
+    if engine == "cents":
+        schedule, totals = payoff_schedule_cents(
+            credit_cards,
+            strategy,
+            monthly_payment,
+            rounding,
+            detail=detail,
+            offset=offset,
+            limit=limit
+        )
+        return encode(schedule.to_dict(totals), media_type), totals, "cents"
+    # Totals alone never need the month-by-month walk
+    if detail == "summary" or (engine == "event" and detail == "monthly"):
+        result = calculate_debt_payoff_events(
+            credit_cards,
+            strategy,
+            monthly_payment,
+            include_breakdown=detail == "monthly",
+            offset=offset,
+            limit=limit
+        )
+        totals = {
+            "total_months": result.total_months,
+            "pays_off": result.pays_off,
+            "stop_reason": result.stop_reason
+        }
+        return encode_model(result, media_type), totals, "event"
+    # The month-by-month plan goes from its columns to the body without building models
+    schedule, totals = payoff_schedule(
+        credit_cards,
+        strategy,
+        monthly_payment,
+        detail=detail,
+        offset=offset,
+        limit=limit
+    )
+    return encode(schedule.to_dict(totals), media_type), totals, "monthly"
+
 @router.post("/calculate", response_model=DebtPayoffResponse)
-async def calculate_payoff(request: DebtPayoffRequest):
+async def calculate_payoff(
+    request: DebtPayoffRequest,
+    http_request: Request,
+    engine: Literal["monthly", "event", "cents"] = Query("monthly"),
+    detail: Literal["summary", "yearly", "monthly"] = Query("monthly"),
+    offset: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1),
+    # Interest rounding for the cents engine
+    rounding: Literal["half_even", "half_up", "truncate"] = Query(CENTS_ROUNDING)
+):
+    options = {"engine": engine, "detail": detail, "offset": offset, "limit": limit}
+    if engine == "cents":
+        options["rounding"] = rounding
+    media_type, encoding = negotiate(http_request)
+    if media_type == MSGPACK_MEDIA_TYPE:
+        options["format"] = "msgpack"
+    key = cache_key(request, **options)
+    cached = await plan_cache.get_async(key)
+    if cached is not None:
+        return await negotiated_response(cached, media_type, encoding)
+
+    content, totals, engine_used, seconds = await _offload(
+        _calculate_body,
+        request.credit_cards,
+        request.strategy,
+        request.monthly_payment,
+        engine,
+        detail,
+        offset,
+        limit,
+        rounding,
+        media_type
+    )
+    record_calculation(engine_used, request.strategy, len(request.credit_cards), totals["total_months"], seconds)
+    # How far a plan gets within the time budget depends on server load, so a cut-short plan is not cached
+    if totals["stop_reason"] != "time_budget":
+        await plan_cache.set_async(key, content)
+    return await negotiated_response(content, media_type, encoding)
+
+@router.get("/cache/stats")
+async def get_cache_stats():
+    return await plan_cache.stats_async()
+
+@router.get("/pool/stats")
+async def get_pool_stats():
+    return calculation_pool.stats()
+
+def _ndjson_schedule(schedule):
+    """Serialize each PaymentStep as one JSON line, followed by a totals record."""
+    while True:
+        try:
+            step = next(schedule)
+        except StopIteration as stop:
+            totals = stop.value
+            break
+        yield step.model_dump_json() + "\n"
+
+    yield json.dumps({
+        "total_months": totals["total_months"],
+        "total_interest_paid": float(totals["total_interest_paid"]),
+        "total_amount_paid": float(totals["total_amount_paid"]),
+        "pays_off": totals["pays_off"],
+        "stop_reason": totals["stop_reason"]
+    }) + "\n"
+
+@router.post("/calculate/stream")
+async def calculate_payoff_stream(
+    request: DebtPayoffRequest,
+    detail: Literal["yearly", "monthly"] = Query("monthly"),
+    offset: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1)
+):
     try:
-        result = calculate_debt_payoff(
+        schedule = iter_debt_payoff(
             request.credit_cards,
             request.strategy,
+            request.monthly_payment,
+            detail=detail,
+            offset=offset,
+            limit=limit
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return StreamingResponse(_ndjson_schedule(schedule), media_type="application/x-ndjson")
+
+@router.post("/calculate/batch", response_model=BatchPayoffResponse)
+async def calculate_payoff_batch(request: BatchPayoffRequest):
+    return await _offload(
+        calculate_debt_payoff_batch,
+        request.credit_cards,
+        request.strategy,
+        request.monthly_payments,
+        request.rounding
+    )
+
+@router.post("/compare", response_model=DebtCompareResponse)
+async def compare_payoff_strategies(request: DebtCompareRequest):
+    return await _offload(
+        compare_strategies,
+        request.credit_cards,
+        request.monthly_payment,
+        request.strategies
+    )
+
+@router.post("/optimize", response_model=OptimizeResponse)
+async def optimize_payoff(request: OptimizeRequest):
+    return await _offload(
+        optimize_allocation,
+        request.credit_cards,
+        request.monthly_payment,
+        request.objective
+    )
+
+@router.post("/solve-payment", response_model=SolvePaymentResponse)
+async def solve_payment(request: SolvePaymentRequest):
+    return await _offload(
+        solve_minimum_payment,
+        request.credit_cards,
+        request.strategy,
+        request.target_months
+    )
+
+def _schedule_body(schedule, totals: dict, media_type: str) -> bytes:
+    return encode(schedule.to_dict(totals), media_type)
+
+@router.post("/plan", response_model=DebtPayoffResponse)
+async def calculate_user_plan(
+    request: UserPlanRequest,
+    http_request: Request,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    result = await db.execute(
+        select(DBCreditCard).where(
+            DBCreditCard.user_id == current_user.id,
+            DBCreditCard.balance > 0
+        ).order_by(DBCreditCard.id)
+    )
+    cards = result.scalars().all()
+
+    try:
+        credit_cards = [
+            CreditCard(
+                id=card.id,
+                name=card.name,
+                balance=Decimal(str(card.balance)),
+                interest_rate=Decimal(str(card.interest_rate)),
+                min_payment=Decimal(str(card.min_payment))
+            )
+            for card in cards
+        ]
+        # Stored plans live in this process, so replan in a thread rather than the pool
+        schedule, totals = await run_in_threadpool(
+            get_user_plan,
+            current_user.id,
+            credit_cards,
+            request.strategy,
             request.monthly_payment
         )
-        return result
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+    media_type, encoding = negotiate(http_request)
+    body = await run_in_threadpool(_schedule_body, schedule, totals, media_type)
+    return await negotiated_response(body, media_type, encoding)
+
 # Optional: Add routes for saving credit cards to the database
 @router.post("/cards", status_code=201)
 async def create_credit_card(
@@ -30,7 +286,7 @@ async def create_credit_card(
     interest_rate: float, 
     min_payment: float,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     # Create new credit card
     db_card = DBCreditCard(
@@ -42,8 +298,8 @@ async def create_credit_card(
     )
     
     db.add(db_card)
-    db.commit()
-    db.refresh(db_card)
+    await db.commit()
+    invalidate_user_plan(current_user.id)
     
     return {
         "id": db_card.id,
@@ -56,9 +312,10 @@ async def create_credit_card(
 @router.get("/cards", response_model=List[dict])
 async def get_credit_cards(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    cards = db.query(DBCreditCard).filter(DBCreditCard.user_id == current_user.id).all()
+    result = await db.execute(select(DBCreditCard).where(DBCreditCard.user_id == current_user.id))
+    cards = result.scalars().all()
     return [
         {
             "id": str(card.id),
@@ -74,20 +331,40 @@ async def get_credit_cards(
 async def delete_credit_card(
     card_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    card = db.query(DBCreditCard).filter(
-        DBCreditCard.id == card_id, 
-        DBCreditCard.user_id == current_user.id
-    ).first()
+    # Unlink the card's expenses and payments in bulk rather than loading them through the relationships;
+    # the unlinked expenses then count as cash spending
+    unlinked = (await db.execute(
+        update(Expense)
+        .where(Expense.credit_card_id == card_id, Expense.user_id == current_user.id)
+        .values(credit_card_id=None)
+        .returning(Expense.amount)
+        .execution_options(synchronize_session=False)
+    )).scalars().all()
+    await db.execute(
+        update(Payment)
+        .where(Payment.credit_card_id == card_id, Payment.user_id == current_user.id)
+        .values(credit_card_id=None)
+        .execution_options(synchronize_session=False)
+    )
+    card = (await db.execute(
+        delete(DBCreditCard)
+        .where(DBCreditCard.id == card_id, DBCreditCard.user_id == current_user.id)
+        .returning(DBCreditCard.id)
+    )).first()
     
     if not card:
+        await db.rollback()
         raise HTTPException(
             status_code=404,
             detail="Credit card not found"
         )
     
-    db.delete(card)
-    db.commit()
+    if unlinked:
+        await apply_cash_delta(db, current_user.id, sum(unlinked))
+    await rebuild_rollups(db, current_user.id)
+    await db.commit()
+    invalidate_user_plan(current_user.id)
     
     return {"message": "Credit card deleted successfully"}
\ No newline at end of file
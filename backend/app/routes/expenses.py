@@ -1,11 +1,19 @@
-from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.orm import Session
-from app.database import get_db
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.orm import joinedload
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db
 from app.models.db_models import User, Expense, UserBalance, CreditCard
 from app.services.auth import get_current_user
-from typing import List
-from decimal import Decimal
+from app.services.cash_ledger import apply_cash_delta, current_cash_balance, to_cents
+from app.services.pagination import keyset_page, next_cursor
+from app.services.summaries import expense_summary, parse_month, record_expense
+from app.services.ledger_export import export_ledger
+from app.services.ledger_import import import_expenses, iter_records, LedgerImportError
+from typing import List, Literal, Optional
 from datetime import datetime
+from decimal import Decimal
 from app.schemas import ExpenseCreate
 
 router = APIRouter(prefix="/expenses", tags=["expenses"])
@@ -14,44 +22,53 @@ router = APIRouter(prefix="/expenses", tags=["expenses"])
 async def set_initial_balance(
     balance_data: dict,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     balance = balance_data.get("balance")
     if balance is None:
         raise HTTPException(status_code=400, detail="Balance is required")
     
-    # Check if user already has a balance record
-    user_balance = db.query(UserBalance).filter(UserBalance.user_id == current_user.id).first()
-    
-    if user_balance:
-        # Update existing balance
-        user_balance.balance = balance
-    else:
-        # Create new balance record
-        user_balance = UserBalance(user_id=current_user.id, balance=balance)
-        db.add(user_balance)
+    # Update the existing balance record, create it the first time
+    updated = await db.execute(
+        update(UserBalance).where(UserBalance.user_id == current_user.id).values(balance=balance)
+    )
+    if updated.rowcount == 0:
+        db.add(UserBalance(user_id=current_user.id, balance=balance))
     
-    db.commit()
+    await db.commit()
     return {"message": "Balance updated successfully"}
 
 @router.get("")
 async def get_user_expenses(
+    credit_card_id: Optional[int] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=500),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    expenses = db.query(Expense).filter(Expense.user_id == current_user.id).all()
-    
-    # Get user's initial balance
-    user_balance = db.query(UserBalance).filter(UserBalance.user_id == current_user.id).first()
-    initial_balance = user_balance.balance if user_balance else Decimal("0")
+    # Each expense's card is loaded in the same query
+    query = select(Expense).options(joinedload(Expense.credit_card)).where(Expense.user_id == current_user.id)
+    if credit_card_id is not None:
+        query = query.where(Expense.credit_card_id == credit_card_id)
+    if start_date is not None:
+        query = query.where(Expense.date >= start_date)
+    if end_date is not None:
+        query = query.where(Expense.date < end_date)
     
-    # Only include cash expenses (where credit_card_id is None) in the total
-    total_expenses = sum(expense.amount for expense in expenses if expense.credit_card_id is None)
-    current_balance = initial_balance - total_expenses
+    # Newest first, one keyset page at a time when a limit is given
+    try:
+        query = keyset_page(query, Expense.date, Expense.id, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    expenses, following = next_cursor((await db.execute(query)).scalars().all(), limit, "date")
     
-    # Get all credit cards for the user
-    credit_cards = db.query(CreditCard).filter(CreditCard.user_id == current_user.id).all()
-    card_map = {card.id: card for card in credit_cards}
+    # Initial balance minus the running total of cash expenses
+    user_balance = (await db.execute(
+        select(UserBalance).where(UserBalance.user_id == current_user.id)
+    )).scalars().first()
+    current_balance = current_cash_balance(user_balance)
     
     return {
         "expenses": [
@@ -61,61 +78,143 @@ async def get_user_expenses(
                 "amount": expense.amount,
                 "date": expense.date.isoformat(),
                 "credit_card_id": expense.credit_card_id,
-                "credit_card": card_map.get(expense.credit_card_id) if expense.credit_card_id else None,
+                "credit_card": expense.credit_card,
                 "balance_type": "credit_card" if expense.credit_card_id else "cash"
             }
             for expense in expenses
         ],
-        "currentBalance": current_balance
+        "currentBalance": current_balance,
+        "nextCursor": following
     }
 
+@router.get("/export")
+async def export_user_expenses(
+    format: Literal["csv", "parquet"] = Query("csv"),
+    current_user: User = Depends(get_current_user)
+):
+    try:
+        chunks = export_ledger(current_user.id, "expenses", format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    media_type = "text/csv" if format == "csv" else "application/vnd.apache.parquet"
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="expenses.{format}"'}
+    )
+
+@router.get("/summary")
+async def get_expense_summary(
+    start_month: Optional[str] = Query(None, pattern=r"^\d{4}-(0[1-9]|1[0-2])$"),
+    end_month: Optional[str] = Query(None, pattern=r"^\d{4}-(0[1-9]|1[0-2])$"),
+    credit_card_id: Optional[int] = None,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await expense_summary(
+        db,
+        current_user.id,
+        parse_month(start_month),
+        parse_month(end_month),
+        credit_card_id
+    )
+
+@router.post("/import", status_code=201)
+async def import_user_expenses(
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Bulk-create expenses from a CSV (text/csv) or JSON array body.
+
+    Columns: description, amount, date, credit_card_id (blank for cash).
+    """
+    try:
+        imported = await import_expenses(db, current_user.id, iter_records(request))
+    except LedgerImportError as e:
+        raise HTTPException(status_code=422, detail=e.errors)
+    
+    user_balance = (await db.execute(
+        select(UserBalance).where(UserBalance.user_id == current_user.id)
+    )).scalars().first()
+    return {"imported": imported, "currentBalance": current_cash_balance(user_balance)}
+
+async def _adjust_card_balance(db: AsyncSession, user_id: int, card_id: int, delta: float):
+    """
+    Shift a card's balance in one UPDATE ... RETURNING; (None, None) when the user has no such card.
+
+    The statement also returns the user's cash balance through a scalar
+    subquery, so card writes don't read it back after the commit.
+    """
+    cash_balance = func.coalesce(
+        select(UserBalance.balance - UserBalance.cash_spent)
+        .where(UserBalance.user_id == user_id)
+        .scalar_subquery(),
+        0
+    )
+    row = (await db.execute(
+        update(CreditCard)
+        .where(CreditCard.id == card_id, CreditCard.user_id == user_id)
+        .values(balance=CreditCard.balance + delta)
+        .returning(
+            CreditCard.id,
+            CreditCard.name,
+            CreditCard.balance,
+            CreditCard.interest_rate,
+            CreditCard.min_payment,
+            cash_balance.label("current_balance")
+        )
+    )).first()
+    if row is None:
+        return None, None
+    card = dict(row._mapping)
+    return card, Decimal(str(card.pop("current_balance")))
+
+async def _current_balance(db: AsyncSession, user_id: int, cash_row=None):
+    # Cash writes already returned the balance row; only a write to a missing card needs to read it
+    if cash_row is None:
+        cash_row = (await db.execute(
+            select(UserBalance.balance, UserBalance.cash_spent).where(UserBalance.user_id == user_id)
+        )).first()
+    return current_cash_balance(cash_row)
+
 @router.post("/expenses")
 async def create_expense(
     expense: ExpenseCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     if expense.balance_type == "credit_card" and not expense.credit_card_id:
         raise HTTPException(status_code=400, detail="Credit card ID is required for credit card expenses")
     
     # If it's a credit card expense, update the card's balance
-    updated_card = None
+    updated_card = current_balance = None
     if expense.balance_type == "credit_card" and expense.credit_card_id:
-        card = db.query(CreditCard).filter(
-            CreditCard.id == expense.credit_card_id,
-            CreditCard.user_id == current_user.id
-        ).first()
-        if card:
-            # Convert expense amount to float before addition
-            expense_amount = float(expense.amount)
-            card.balance += expense_amount
-            db.add(card)
-            db.flush()  # Flush to get the updated card data
-            updated_card = {
-                "id": card.id,
-                "name": card.name,
-                "balance": card.balance,
-                "interest_rate": card.interest_rate,
-                "min_payment": card.min_payment
-            }
+        updated_card, current_balance = await _adjust_card_balance(
+            db, current_user.id, expense.credit_card_id, float(expense.amount)
+        )
     
+    amount = to_cents(expense.amount)
     db_expense = Expense(
         description=expense.description,
-        amount=expense.amount,
+        amount=amount,
         date=expense.date,
         credit_card_id=expense.credit_card_id if expense.balance_type == "credit_card" else None,
         user_id=current_user.id
     )
     db.add(db_expense)
-    db.commit()
-    db.refresh(db_expense)
+    # Cash expenses move the running total in the same transaction as the insert
+    cash_row = None
+    if db_expense.credit_card_id is None:
+        cash_row = await apply_cash_delta(db, current_user.id, amount)
+    await record_expense(db, db_expense)
+    await db.commit()
     
     # Get current balance (only for cash expenses)
-    user_balance = db.query(UserBalance).filter(UserBalance.user_id == current_user.id).first()
-    initial_balance = user_balance.balance if user_balance else Decimal("0")
-    expenses = db.query(Expense).filter(Expense.user_id == current_user.id).all()
-    total_expenses = sum(expense.amount for expense in expenses if expense.credit_card_id is None)
-    current_balance = initial_balance - total_expenses
+    if current_balance is None:
+        current_balance = await _current_balance(db, current_user.id, cash_row)
     
     # Create the expense response with balance_type
     expense_response = {
@@ -138,12 +237,14 @@ async def create_expense(
 async def delete_expense(
     expense_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    expense = db.query(Expense).filter(
-        Expense.id == expense_id,
-        Expense.user_id == current_user.id
-    ).first()
+    # Delete and read back the row in one statement
+    expense = (await db.execute(
+        delete(Expense)
+        .where(Expense.id == expense_id, Expense.user_id == current_user.id)
+        .returning(Expense.user_id, Expense.amount, Expense.date, Expense.credit_card_id)
+    )).first()
     
     if not expense:
         raise HTTPException(
@@ -152,35 +253,20 @@ async def delete_expense(
         )
     
     # If expense was linked to a credit card, update its balance
-    updated_card = None
+    updated_card = current_balance = None
+    cash_row = None
     if expense.credit_card_id:
-        card = db.query(CreditCard).filter(
-            CreditCard.id == expense.credit_card_id,
-            CreditCard.user_id == current_user.id
-        ).first()
-        if card:
-            # Convert expense amount to float before subtraction
-            expense_amount = float(expense.amount)
-            card.balance -= expense_amount
-            db.add(card)
-            db.flush()  # Flush to get the updated card data
-            updated_card = {
-                "id": card.id,
-                "name": card.name,
-                "balance": card.balance,
-                "interest_rate": card.interest_rate,
-                "min_payment": card.min_payment
-            }
-    
-    db.delete(expense)
-    db.commit()
+        updated_card, current_balance = await _adjust_card_balance(
+            db, current_user.id, expense.credit_card_id, -float(expense.amount)
+        )
+    else:
+        cash_row = await apply_cash_delta(db, current_user.id, -expense.amount)
+    await record_expense(db, expense, sign=-1)
+    await db.commit()
     
     # Recalculate current balance (only including cash expenses)
-    user_balance = db.query(UserBalance).filter(UserBalance.user_id == current_user.id).first()
-    initial_balance = user_balance.balance if user_balance else Decimal("0")
-    expenses = db.query(Expense).filter(Expense.user_id == current_user.id).all()
-    total_expenses = sum(expense.amount for expense in expenses if expense.credit_card_id is None)
-    current_balance = initial_balance - total_expenses
+    if current_balance is None:
+        current_balance = await _current_balance(db, current_user.id, cash_row)
     
     return {
         "message": "Expense deleted successfully",
@@ -1,11 +1,17 @@
-from fastapi import APIRouter, HTTPException, Depends, status
-from sqlalchemy.orm import Session
-from app.database import get_db
-from app.models.debt import PaymentCreate, Payment
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import case, delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db
+from app.models.debt import PaymentCreate, Payment, PaymentPage, PaymentSummary
 from app.models.db_models import Payment as DBPayment, CreditCard, User
 from app.services.auth import get_current_user
+from app.services.pagination import keyset_page, next_cursor
+from app.services.summaries import payment_summary, parse_month, record_payment
+from app.services.ledger_export import export_ledger
+from app.services.ledger_import import import_payments, iter_records, LedgerImportError
 from datetime import datetime
-from typing import List
+from typing import Literal, Optional
 
 router = APIRouter(prefix="/payments", tags=["payments"])
 
@@ -13,13 +19,23 @@ router = APIRouter(prefix="/payments", tags=["payments"])
 async def create_payment(
     payment_data: PaymentCreate,
     current_user = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    # Verify card belongs to user
-    card = db.query(CreditCard).filter(
-        CreditCard.id == payment_data.credit_card_id,
-        CreditCard.user_id == current_user.id
-    ).first()
+    # Update the balance of the user's card in one statement, which also verifies ownership
+    principal = float(payment_data.principal_portion)
+    paid_off = CreditCard.balance - principal <= 0
+    card = (await db.execute(
+        update(CreditCard)
+        .where(
+            CreditCard.id == payment_data.credit_card_id,
+            CreditCard.user_id == current_user.id
+        )
+        .values(
+            balance=case((paid_off, 0), else_=CreditCard.balance - principal),
+            is_paid_off=case((paid_off, True), else_=CreditCard.is_paid_off)
+        )
+        .returning(CreditCard.id)
+    )).first()
     
     if not card:
         raise HTTPException(
@@ -31,46 +47,124 @@ async def create_payment(
     db_payment = DBPayment(
         amount=float(payment_data.amount),
         interest_portion=float(payment_data.interest_portion),
-        principal_portion=float(payment_data.principal_portion),
+        principal_portion=principal,
         user_id=current_user.id,
         credit_card_id=payment_data.credit_card_id,
         payment_date=datetime.now()
     )
     
-    # Update card balance
-    card.balance -= float(payment_data.principal_portion)
-    if card.balance <= 0:
-        card.is_paid_off = True
-        card.balance = 0
-    
     db.add(db_payment)
-    db.commit()
-    db.refresh(db_payment)
+    await record_payment(db, db_payment)
+    await db.commit()
     
     return db_payment
 
-@router.get("/", response_model=List[Payment])
+def _payment_filters(query, start_date: Optional[datetime], end_date: Optional[datetime]):
+    if start_date is not None:
+        query = query.where(DBPayment.payment_date >= start_date)
+    if end_date is not None:
+        query = query.where(DBPayment.payment_date < end_date)
+    return query
+
+async def _payment_page(db: AsyncSession, query, cursor: Optional[str], limit: Optional[int]) -> dict:
+    """Run a newest-first payment listing, returning the page and the next page's cursor."""
+    try:
+        query = keyset_page(query, DBPayment.payment_date, DBPayment.id, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    payments, following = next_cursor((await db.execute(query)).scalars().all(), limit, "payment_date")
+    return {"payments": payments, "nextCursor": following}
+
+@router.post("/import", status_code=status.HTTP_201_CREATED)
+async def import_user_payments(
+    request: Request,
+    current_user = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Bulk-create payments from a CSV (text/csv) or JSON array body.
+
+    Columns: credit_card_id, amount, interest_portion, principal_portion,
+    payment_date (optional, defaults to now).
+    """
+    try:
+        imported = await import_payments(db, current_user.id, iter_records(request))
+    except LedgerImportError as e:
+        raise HTTPException(status_code=422, detail=e.errors)
+    
+    return {"imported": imported}
+
+@router.get("/", response_model=PaymentPage)
 async def get_user_payments(
+    credit_card_id: Optional[int] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=500),
     current_user = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
+):
+    query = _payment_filters(
+        select(DBPayment).where(DBPayment.user_id == current_user.id),
+        start_date,
+        end_date
+    )
+    if credit_card_id is not None:
+        query = query.where(DBPayment.credit_card_id == credit_card_id)
+    
+    return await _payment_page(db, query, cursor, limit)
+
+@router.get("/export")
+async def export_user_payments(
+    format: Literal["csv", "parquet"] = Query("csv"),
+    current_user = Depends(get_current_user)
 ):
-    payments = db.query(DBPayment).filter(
-        DBPayment.user_id == current_user.id
-    ).order_by(DBPayment.payment_date.desc()).all()
+    try:
+        chunks = export_ledger(current_user.id, "payments", format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    return payments
+    media_type = "text/csv" if format == "csv" else "application/vnd.apache.parquet"
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="payments.{format}"'}
+    )
+
+@router.get("/summary", response_model=PaymentSummary)
+async def get_payment_summary(
+    start_month: Optional[str] = Query(None, pattern=r"^\d{4}-(0[1-9]|1[0-2])$"),
+    end_month: Optional[str] = Query(None, pattern=r"^\d{4}-(0[1-9]|1[0-2])$"),
+    credit_card_id: Optional[int] = None,
+    current_user = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await payment_summary(
+        db,
+        current_user.id,
+        parse_month(start_month),
+        parse_month(end_month),
+        credit_card_id
+    )
 
-@router.get("/cards/{card_id}", response_model=List[Payment])
+@router.get("/cards/{card_id}", response_model=PaymentPage)
 async def get_card_payments(
     card_id: int,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=500),
     current_user = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     # Verify card belongs to user
-    card = db.query(CreditCard).filter(
-        CreditCard.id == card_id,
-        CreditCard.user_id == current_user.id
-    ).first()
+    result = await db.execute(
+        select(CreditCard).where(
+            CreditCard.id == card_id,
+            CreditCard.user_id == current_user.id
+        )
+    )
+    card = result.scalars().first()
     
     if not card:
         raise HTTPException(
@@ -78,22 +172,37 @@ async def get_card_payments(
             detail="Credit card not found"
         )
     
-    payments = db.query(DBPayment).filter(
-        DBPayment.credit_card_id == card_id
-    ).order_by(DBPayment.payment_date.desc()).all()
+    # The user filter is redundant for an owned card but lets the (user, card, date) index serve it
+    query = _payment_filters(
+        select(DBPayment).where(
+            DBPayment.user_id == current_user.id,
+            DBPayment.credit_card_id == card_id
+        ),
+        start_date,
+        end_date
+    )
     
-    return payments
+    return await _payment_page(db, query, cursor, limit)
 
 @router.delete("/{payment_id}")
 async def delete_payment(
     payment_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    payment = db.query(DBPayment).filter(
-        DBPayment.id == payment_id,
-        DBPayment.user_id == current_user.id
-    ).first()
+    # Delete and read back the payment in one statement
+    payment = (await db.execute(
+        delete(DBPayment)
+        .where(DBPayment.id == payment_id, DBPayment.user_id == current_user.id)
+        .returning(
+            DBPayment.user_id,
+            DBPayment.credit_card_id,
+            DBPayment.payment_date,
+            DBPayment.amount,
+            DBPayment.interest_portion,
+            DBPayment.principal_portion
+        )
+    )).first()
     
     if not payment:
         raise HTTPException(
@@ -101,19 +210,15 @@ async def delete_payment(
             detail="Payment not found"
         )
     
-    # Get the associated credit card
-    card = db.query(CreditCard).filter(
-        CreditCard.id == payment.credit_card_id,
-        CreditCard.user_id == current_user.id
-    ).first()
-    
-    if card:
-        # Add the payment amount back to the card balance
-        card.balance += payment.amount
-        db.add(card)
+    # Add the payment amount back to the card balance
+    if payment.credit_card_id is not None:
+        await db.execute(
+            update(CreditCard)
+            .where(CreditCard.id == payment.credit_card_id, CreditCard.user_id == current_user.id)
+            .values(balance=CreditCard.balance + payment.amount)
+        )
     
-    # Delete the payment
-    db.delete(payment)
-    db.commit()
+    await record_payment(db, payment, sign=-1)
+    await db.commit()
     
     return {"message": "Payment deleted successfully"}
\ No newline at end of file
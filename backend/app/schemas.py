@@ -7,4 +7,10 @@ class ExpenseCreate(BaseModel):
     amount: float
     date: datetime
     credit_card_id: Optional[int] = None
-    balance_type: str  # "credit_card" or "cash" 
\ No newline at end of file
+    balance_type: str  # "credit_card" or "cash"
+
+class ExpenseImportRow(BaseModel):
+    description: str
+    amount: float
+    date: datetime
+    credit_card_id: Optional[int] = None  # empty for cash expenses
@@ -1,42 +1,76 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import get_settings
 from app.models.user import TokenData
-from app.database import get_db
+from app.database import get_async_db
 from app.models.db_models import User
-import os
+from app.services.plan_cache import MemoryCacheBackend
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+settings = get_settings()
+
 # Security settings
-SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-for-development")
-ALGORITHM = "HS256"
-ACCESS_TOKEN_EXPIRE_MINUTES = 30
+SECRET_KEY = settings.SECRET_KEY
+ALGORITHM = settings.ALGORITHM
+ACCESS_TOKEN_EXPIRE_MINUTES = settings.ACCESS_TOKEN_EXPIRE_MINUTES
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
-def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+# bcrypt releases the GIL, so a small thread pool keeps it off the event loop
+# and caps how many hashes burn CPU at once
+_hash_executor = ThreadPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash")
+
+async def _run_hasher(fn, *args):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hash_executor, fn, *args)
+
+async def verify_and_update_password(plain_password, hashed_password) -> Tuple[bool, Optional[str]]:
+    """Verify a password; the second value is a fresh hash when the stored one uses outdated settings."""
+    return await _run_hasher(pwd_context.verify_and_update, plain_password, hashed_password)
+
+async def get_password_hash(password) -> str:
+    return await _run_hasher(pwd_context.hash, password)
 
-def get_password_hash(password):
-    return pwd_context.hash(password)
+# Authenticated users are remembered briefly so requests skip the user lookup
+_user_cache = MemoryCacheBackend(settings.USER_CACHE_MAX_ENTRIES, settings.USER_CACHE_TTL_SECONDS)
 
-def get_user(db: Session, email: str):
-    return db.query(User).filter(User.email == email).first()
+def cache_user(user: User):
+    _user_cache.set(str(user.id), user.email)
 
-def authenticate_user(db: Session, email: str, password: str):
-    user = get_user(db, email)
+def invalidate_cached_user(user_id: int):
+    """Drop a user from the auth cache; call after changing or deleting the user."""
+    _user_cache.delete(str(user_id))
+
+async def get_user(db: AsyncSession, email: str):
+    result = await db.execute(select(User).where(User.email == email))
+    return result.scalars().first()
+
+async def authenticate_user(db: AsyncSession, email: str, password: str):
+    user = await get_user(db, email)
     if not user:
         return False
-    if not verify_password(password, user.hashed_password):
+    valid, new_hash = await verify_and_update_password(password, user.hashed_password)
+    if not valid:
         return False
+    if new_hash:
+        # Migrate the stored hash to the current cost settings; the next request re-reads the user
+        user.hashed_password = new_hash
+        await db.commit()
+        invalidate_cached_user(user.id)
+        return user
+    cache_user(user)
     return user
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
@@ -49,7 +83,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-async def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)):
+async def get_current_user(db: AsyncSession = Depends(get_async_db), token: str = Depends(oauth2_scheme)):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -60,10 +94,20 @@ async def get_current_user(db: Session = Depends(get_db), token: str = Depends(o
         email: str = payload.get("sub")
         if email is None:
             raise credentials_exception
-        token_data = TokenData(email=email)
+        token_data = TokenData(email=email, user_id=payload.get("uid"))
     except JWTError:
         raise credentials_exception
-    user = get_user(db, email=token_data.email)
+
+    if token_data.user_id is None:
+        # Tokens issued before the user id claim still resolve by email
+        user = await get_user(db, email=token_data.email)
+    else:
+        cached_email = _user_cache.get(str(token_data.user_id))
+        if cached_email is not None:
+            # Routes only read id and email, so a detached instance saves the query
+            return User(id=token_data.user_id, email=cached_email)
+        user = await db.get(User, token_data.user_id)
     if user is None:
         raise credentials_exception
+    cache_user(user)
     return user
\ No newline at end of file
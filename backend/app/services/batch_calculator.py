@@ -0,0 +1,148 @@
+from typing import List
+from decimal import Decimal
+import numpy as np
+from app.models.debt import CreditCard, BatchScenarioResult, BatchPayoffResponse
+from app.services.calculator import MAX_PLAN_MONTHS
+from app.services.feasibility import analyze_feasibility
+
+
+def _round_cents(values: np.ndarray, rounding: str) -> np.ndarray:
+    """Round monetary amounts to cents using the requested rounding mode."""
+    if rounding == "half_even":
+        return np.round(values, 2)
+    if rounding == "half_up":
+        return np.floor(values * 100 + 0.5) / 100
+    return values
+
+
+def _stalled(balances: np.ndarray, interest: np.ndarray, min_payments: np.ndarray, budget: np.ndarray) -> np.ndarray:
+    """
+    Per scenario, whether no open card can ever be cleared: the vectorized
+    calculator._stalled. The first open card gets what the budget leaves
+    after the other open cards' minimums, and none of the payments beats
+    the card's interest.
+    """
+    open_cards = balances > 0
+    first = open_cards & (np.cumsum(open_cards, axis=1) == 1)
+    others = open_cards & ~first
+    target_payment = budget - np.where(others, min_payments, 0.0).sum(axis=1)
+    target_interest = np.where(first, interest, 0.0).sum(axis=1)
+    others_behind = np.all(~others | (min_payments <= interest), axis=1)
+    return open_cards.any(axis=1) & (target_payment <= target_interest) & others_behind
+
+
+def calculate_debt_payoff_batch(
+    credit_cards: List[CreditCard],
+    strategy: str,
+    monthly_payments: List[Decimal],
+    rounding: str = "none",
+    max_months: int = MAX_PLAN_MONTHS
+) -> BatchPayoffResponse:
+    """
+    Simulate many monthly payment amounts for the same cards in lockstep.
+
+    Balances, rates and minimum payments are held as (scenario x card)
+    arrays and every scenario advances one month per iteration, following
+    the same rules as calculate_debt_payoff.
+
+    Parameters:
+    -----------
+    credit_cards : List[CreditCard]
+        List of credit cards with their details
+    strategy : str
+        Either 'avalanche' (highest interest first) or 'snowball' (lowest balance first)
+    monthly_payments : List[Decimal]
+        Total monthly payment amount for each scenario
+    rounding : str
+        'none' keeps full float precision, 'half_even' or 'half_up' round
+        each month's interest to the cent
+    max_months : int
+        Scenarios still carrying debt after this many months stop there
+
+    Returns:
+    --------
+    BatchPayoffResponse
+        Totals for each scenario, in the order the payments were given.
+        Like the other engines, a scenario that does not pay off has
+        pays_off False and a stop_reason: 'never_pays_off' when the
+        feasibility check rules it out or it stalls (see _stalled), else
+        'max_months'
+    """
+    if strategy == "avalanche":
+        ordered = sorted(credit_cards, key=lambda card: card.interest_rate, reverse=True)
+    else:  # snowball
+        ordered = sorted(credit_cards, key=lambda card: card.balance)
+
+    total_min_payment = sum(card.min_payment for card in ordered)
+    for monthly_payment in monthly_payments:
+        if monthly_payment < total_min_payment:
+            raise ValueError(f"Monthly payment must be at least {total_min_payment}")
+
+    scenarios = len(monthly_payments)
+    budget = np.array([float(p) for p in monthly_payments])
+    balances = np.tile(np.array([float(card.balance) for card in ordered]), (scenarios, 1))
+    rates = np.array([float(card.interest_rate) / 100 / 12 for card in ordered])
+    min_payments = np.array([float(card.min_payment) for card in ordered])
+
+    months = np.zeros(scenarios, dtype=np.int64)
+    total_interest = np.zeros(scenarios)
+    total_paid = np.zeros(scenarios)
+    never_pays_off = np.array([
+        analyze_feasibility(credit_cards, monthly_payment) == "never_pays_off"
+        for monthly_payment in monthly_payments
+    ])
+    # Scenarios whose allocation changed (a card was cleared) since their last stall check
+    allocation_changed = ~never_pays_off
+
+    for _ in range(max_months):
+        active = (balances > 0) & ~never_pays_off[:, None]
+        interest = _round_cents(np.where(active, balances * rates, 0.0), rounding)
+        if allocation_changed.any():
+            never_pays_off |= allocation_changed & _stalled(
+                np.where(active, balances, 0.0), interest, min_payments, budget
+            )
+            active &= ~never_pays_off[:, None]
+            interest = np.where(active, interest, 0.0)
+        running = active.any(axis=1)
+        if not running.any():
+            break
+        months += running
+
+        # Interest and minimum payments on every open card
+        balances += interest
+        payments = np.where(active, np.minimum(min_payments, balances), 0.0)
+        balances -= payments
+
+        # Roll the leftover budget down the cards in strategy order
+        remaining = np.where(running, budget - payments.sum(axis=1), 0.0)
+        ahead = np.cumsum(balances, axis=1) - balances
+        extra = np.clip(remaining[:, None] - ahead, 0.0, balances)
+        balances -= extra
+
+        total_interest += interest.sum(axis=1)
+        total_paid += payments.sum(axis=1) + extra.sum(axis=1)
+        allocation_changed = (active & (balances <= 0)).any(axis=1)
+
+    unfinished = (balances > 0).any(axis=1)
+    # A plan that stalls on its last month still never pays off, as in the other engines
+    if (allocation_changed & unfinished).any():
+        interest = _round_cents(np.where(balances > 0, balances * rates, 0.0), rounding)
+        never_pays_off |= allocation_changed & _stalled(balances, interest, min_payments, budget)
+    stop_reasons = [
+        "never_pays_off" if never_pays_off[i] else "max_months" if unfinished[i] else None
+        for i in range(scenarios)
+    ]
+
+    return BatchPayoffResponse(
+        scenarios=[
+            BatchScenarioResult(
+                monthly_payment=monthly_payments[i],
+                total_months=int(months[i]),
+                total_interest_paid=Decimal(str(round(total_interest[i], 2))),
+                total_amount_paid=Decimal(str(round(total_paid[i], 2))),
+                pays_off=stop_reasons[i] is None,
+                stop_reason=stop_reasons[i]
+            )
+            for i in range(scenarios)
+        ]
+    )
@@ -1,29 +1,23 @@
-from typing import List
+from typing import Callable, Generator, List, Optional, Tuple
 from decimal import Decimal
-from app.models.debt import CreditCard, CardPayment, PaymentStep, DebtPayoffResponse
+import time
+from app.config import get_settings
+from app.models.debt import CreditCard, PaymentStep, DebtPayoffResponse
+from app.services.feasibility import analyze_feasibility
+from app.services.schedule import PaymentSchedule, ZERO
 
-def calculate_debt_payoff(
-    credit_cards: List[CreditCard], 
+settings = get_settings()
+
+# Simulation limits
+MAX_PLAN_MONTHS = settings.MAX_PLAN_MONTHS
+PLAN_TIME_BUDGET_SECONDS = settings.PLAN_TIME_BUDGET_SECONDS
+
+def _prepare_cards(
+    credit_cards: List[CreditCard],
     strategy: str,
     monthly_payment: Decimal
-) -> DebtPayoffResponse:
-    """
-    Calculate debt payoff schedule using either avalanche or snowball method.
-    
-    Parameters:
-    -----------
-    credit_cards : List[CreditCard]
-        List of credit cards with their details
-    strategy : str
-        Either 'avalanche' (highest interest first) or 'snowball' (lowest balance first)
-    monthly_payment : Decimal
-        Total monthly payment amount
-        
-    Returns:
-    --------
-    DebtPayoffResponse
-        Complete payoff plan with schedule
-    """
+) -> List[dict]:
+    """Copy the cards into plain dicts, validate the budget and sort by strategy."""
     # Create a copy of the credit cards to work with
     cards = [
         {
@@ -51,92 +45,295 @@ def calculate_debt_payoff(
         # Sort by balance (lowest first)
         cards.sort(key=lambda x: x["balance"])
     
+    return cards
+
+def _stalled(
+    balances: list,
+    min_payments: list,
+    monthly_payment,
+    interest: Callable[[int], object]
+) -> bool:
+    """
+    Whether no open card can ever be cleared from here.
+
+    Every open card is paid its minimum and the first one (in strategy order)
+    also gets what is left of the budget. If none of those payments beats
+    the card's interest, `interest(i)`, no balance falls, so no interest
+    falls and the same payments repeat every month. The allocation only
+    changes when a card is cleared, so this needs checking only at the start
+    and after each payoff. The event engine stops at the same point.
+    """
+    open_cards = [i for i, balance in enumerate(balances) if balance > 0]
+    if not open_cards:
+        return False
+    others = open_cards[1:]
+    if monthly_payment - sum(min_payments[i] for i in others) > interest(open_cards[0]):
+        return False
+    return all(min_payments[i] <= interest(i) for i in others)
+
+def _simulate(
+    cards: List[dict],
+    monthly_payment: Decimal,
+    detail: str,
+    offset: int,
+    limit: Optional[int],
+    schedule: PaymentSchedule,
+    start_month: int = 0,
+    max_months: Optional[int] = MAX_PLAN_MONTHS,
+    time_budget: Optional[float] = PLAN_TIME_BUDGET_SECONDS
+) -> Generator[None, None, dict]:
+    """
+    Simulate month by month, appending the steps inside the requested window
+    to `schedule` and yielding after each one.
+    `start_month` resumes a plan part-way through, with the cards already
+    holding their balances at that point. The simulation gives up after
+    `max_months` months or `time_budget` seconds of simulating (time spent
+    suspended between steps does not count), or as soon as it is stalled
+    (see _stalled), reporting why in the totals.
+    """
     # Initialize counters
-    month = 0
-    total_interest_paid = Decimal("0")
-    total_amount_paid = Decimal("0")
-    monthly_breakdown = []
+    month = start_month
+    stop_reason = None
+    # Seconds spent simulating; time paused at a yield (e.g. a slow stream reader) is not counted
+    spent = 0.0
+    resumed = time.perf_counter()
+    total_interest_paid = ZERO
+    total_amount_paid = ZERO
+    period = 12 if detail == "yearly" else 1
+    window_end = None if limit is None else offset + limit
+    
+    # Per-card state as parallel columns, in strategy order
+    balances = [card["balance"] for card in cards]
+    min_payments = [card["min_payment"] for card in cards]
+    monthly_rates = [card["interest_rate"] / Decimal("100") / Decimal("12") for card in cards]
+    open_cards = sum(1 for balance in balances if balance > ZERO)
+    # Whether a card was cleared since the last stall check
+    allocation_changed = True
+    
+    # Running per-card payment/interest for the current period
+    period_payments = [ZERO] * len(cards)
+    period_interest = [ZERO] * len(cards)
+    period_total = ZERO
     
     # Continue until all cards are paid off
-    while any(card["balance"] > Decimal("0") for card in cards):
+    while open_cards:
+        if allocation_changed:
+            allocation_changed = False
+            if _stalled(balances, min_payments, monthly_payment, lambda i: balances[i] * monthly_rates[i]):
+                stop_reason = "never_pays_off"
+                break
+        if max_months is not None and month >= max_months:
+            stop_reason = "max_months"
+            break
+        if time_budget is not None and spent + time.perf_counter() - resumed > time_budget:
+            stop_reason = "time_budget"
+            break
         month += 1
         payment_remaining = monthly_payment
-        card_payments = []
         
         # First, pay minimum on all cards
-        for card in cards:
-            if card["balance"] <= Decimal("0"):
-                card_payments.append(CardPayment(
-                    card_id=card["id"],
-                    card_name=card["name"],
-                    payment=Decimal("0"),
-                    interest_paid=Decimal("0"),
-                    remaining_balance=Decimal("0")
-                ))
+        for i, balance in enumerate(balances):
+            if balance <= ZERO:
                 continue
                 
-            # Calculate interest for this month
-            monthly_interest_rate = card["interest_rate"] / Decimal("100") / Decimal("12")
-            interest = card["balance"] * monthly_interest_rate
+            # Apply this month's interest to the balance
+            interest = balance * monthly_rates[i]
             total_interest_paid += interest
-            
-            # Apply interest to balance
-            card["balance"] += interest
+            balance += interest
             
             # Determine payment for this card
-            payment = min(card["min_payment"], card["balance"])
+            payment = min(min_payments[i], balance)
             payment_remaining -= payment
-            
-            # Update balance
-            card["balance"] -= payment
+            balances[i] = balance - payment
             total_amount_paid += payment
             
-            card_payments.append(CardPayment(
-                card_id=card["id"],
-                card_name=card["name"],
-                payment=payment,
-                interest_paid=interest,
-                remaining_balance=card["balance"]
-            ))
+            period_payments[i] += payment
+            period_interest[i] += interest
+            if balances[i] <= ZERO:
+                open_cards -= 1
+                allocation_changed = True
         
         # Apply extra payment to first card with balance > 0 according to strategy
-        for card in cards:
-            if card["balance"] <= Decimal("0") or payment_remaining <= Decimal("0"):
-                continue
-                
-            extra_payment = min(payment_remaining, card["balance"])
-            payment_remaining -= extra_payment
-            
-            # Update card balance
-            card["balance"] -= extra_payment
-            total_amount_paid += extra_payment
-            
-            # Update payment in card_payments
-            for i, payment_info in enumerate(card_payments):
-                if payment_info.card_id == card["id"]:
-                    card_payments[i] = CardPayment(
-                        card_id=payment_info.card_id,
-                        card_name=payment_info.card_name,
-                        payment=payment_info.payment + extra_payment,
-                        interest_paid=payment_info.interest_paid,
-                        remaining_balance=card["balance"]
-                    )
-                    break
+        if payment_remaining > ZERO:
+            for i, balance in enumerate(balances):
+                if balance <= ZERO:
+                    continue
                     
-            if payment_remaining <= Decimal("0"):
-                break
+                extra_payment = min(payment_remaining, balance)
+                payment_remaining -= extra_payment
+                balances[i] = balance - extra_payment
+                total_amount_paid += extra_payment
+                period_payments[i] += extra_payment
+                if balances[i] <= ZERO:
+                    open_cards -= 1
+                    allocation_changed = True
+                        
+                if payment_remaining <= ZERO:
+                    break
         
-        # Add to monthly breakdown
-        monthly_breakdown.append(PaymentStep(
-            month=month,
-            card_payments=card_payments,
-            total_payment=monthly_payment - payment_remaining,
-            remaining_debt=sum(card["balance"] for card in cards)
-        ))
+        period_total += monthly_payment - payment_remaining
+        
+        # Close the period at the end of each month (or year) and on the final month
+        if detail == "summary":
+            continue
+        if month % period and open_cards:
+            continue
+        
+        step = (month - 1) // period
+        if step >= offset and (window_end is None or step < window_end):
+            schedule.append(month, period_payments, period_interest, balances, period_total, sum(balances))
+            spent += time.perf_counter() - resumed
+            yield
+            resumed = time.perf_counter()
+        period_payments = [ZERO] * len(cards)
+        period_interest = [ZERO] * len(cards)
+        period_total = ZERO
+    
+    for card, balance in zip(cards, balances):
+        card["balance"] = balance
+    
+    return {
+        "total_months": month,
+        "total_interest_paid": total_interest_paid,
+        "total_amount_paid": total_amount_paid,
+        "pays_off": stop_reason is None,
+        "stop_reason": stop_reason
+    }
+
+def _generate_steps(
+    cards: List[dict],
+    monthly_payment: Decimal,
+    detail: str,
+    offset: int,
+    limit: Optional[int],
+    start_month: int = 0,
+    max_months: Optional[int] = MAX_PLAN_MONTHS,
+    time_budget: Optional[float] = PLAN_TIME_BUDGET_SECONDS
+) -> Generator[PaymentStep, None, dict]:
+    """
+    Yield the steps of `_simulate` as PaymentStep models, one at a time.
+    Only the step being yielded is ever buffered, and the generator returns
+    the plan totals as its StopIteration value.
+    """
+    schedule = PaymentSchedule(cards)
+    simulation = _simulate(
+        cards, monthly_payment, detail, offset, limit, schedule, start_month, max_months, time_budget
+    )
+    while True:
+        try:
+            next(simulation)
+        except StopIteration as stop:
+            return stop.value
+        yield schedule.step(0)
+        schedule.clear()
+
+def _never_pays_off() -> Generator[PaymentStep, None, dict]:
+    """Empty schedule for a plan the feasibility check already ruled out."""
+    return {
+        "total_months": 0,
+        "total_interest_paid": Decimal("0"),
+        "total_amount_paid": Decimal("0"),
+        "pays_off": False,
+        "stop_reason": "never_pays_off"
+    }
+    yield
+
+def iter_debt_payoff(
+    credit_cards: List[CreditCard], 
+    strategy: str,
+    monthly_payment: Decimal,
+    detail: str = "monthly",
+    offset: int = 0,
+    limit: Optional[int] = None,
+    max_months: Optional[int] = MAX_PLAN_MONTHS,
+    time_budget: Optional[float] = PLAN_TIME_BUDGET_SECONDS
+) -> Generator[PaymentStep, None, dict]:
+    """
+    Lazily generate the payoff schedule one PaymentStep at a time.
+    
+    Input is validated immediately so errors surface before iteration starts,
+    and plans that provably never pay off are answered without simulating.
+    Steps outside the offset/limit window are simulated but never built, and
+    the generator returns the plan totals (total_months, total_interest_paid,
+    total_amount_paid, pays_off, stop_reason) as its StopIteration value.
+    """
+    cards = _prepare_cards(credit_cards, strategy, monthly_payment)
+    if analyze_feasibility(credit_cards, monthly_payment) == "never_pays_off":
+        return _never_pays_off()
+    return _generate_steps(cards, monthly_payment, detail, offset, limit, 0, max_months, time_budget)
+
+def payoff_schedule(
+    credit_cards: List[CreditCard], 
+    strategy: str,
+    monthly_payment: Decimal,
+    detail: str = "monthly",
+    offset: int = 0,
+    limit: Optional[int] = None,
+    max_months: Optional[int] = MAX_PLAN_MONTHS,
+    time_budget: Optional[float] = PLAN_TIME_BUDGET_SECONDS
+) -> Tuple[PaymentSchedule, dict]:
+    """
+    Run the plan into a columnar PaymentSchedule, returning (schedule, totals).
+    
+    Takes the same arguments as calculate_debt_payoff. No Pydantic models
+    are built; callers that serialize the plan directly (see
+    PaymentSchedule.to_dict) skip them altogether.
+    """
+    cards = _prepare_cards(credit_cards, strategy, monthly_payment)
+    schedule = PaymentSchedule(cards)
+    if analyze_feasibility(credit_cards, monthly_payment) == "never_pays_off":
+        simulation = _never_pays_off()
+    else:
+        simulation = _simulate(
+            cards, monthly_payment, detail, offset, limit, schedule, 0, max_months, time_budget
+        )
+    while True:
+        try:
+            next(simulation)
+        except StopIteration as stop:
+            return schedule, stop.value
+
+def calculate_debt_payoff(
+    credit_cards: List[CreditCard], 
+    strategy: str,
+    monthly_payment: Decimal,
+    detail: str = "monthly",
+    offset: int = 0,
+    limit: Optional[int] = None,
+    max_months: Optional[int] = MAX_PLAN_MONTHS,
+    time_budget: Optional[float] = PLAN_TIME_BUDGET_SECONDS
+) -> DebtPayoffResponse:
+    """
+    Calculate debt payoff schedule using either avalanche or snowball method.
     
-    return DebtPayoffResponse(
-        total_months=month,
-        total_interest_paid=total_interest_paid,
-        total_amount_paid=total_amount_paid,
-        monthly_breakdown=monthly_breakdown
-    )
\ No newline at end of file
+    Parameters:
+    -----------
+    credit_cards : List[CreditCard]
+        List of credit cards with their details
+    strategy : str
+        Either 'avalanche' (highest interest first) or 'snowball' (lowest balance first)
+    monthly_payment : Decimal
+        Total monthly payment amount
+    detail : str
+        'monthly' for one step per month, 'yearly' for one step per 12 months
+        (payments and interest summed, balances at year end), or 'summary'
+        for the totals only
+    offset : int
+        Number of leading steps to skip in the breakdown
+    limit : Optional[int]
+        Maximum number of steps to return, all remaining steps if None
+    max_months : Optional[int]
+        Stop simulating after this many months
+    time_budget : Optional[float]
+        Stop simulating after this many seconds spent simulating
+        
+    Returns:
+    --------
+    DebtPayoffResponse
+        Complete payoff plan with schedule; pays_off is False (with the
+        stop_reason) when the debt is not cleared within the limits
+    """
+    schedule, totals = payoff_schedule(
+        credit_cards, strategy, monthly_payment, detail, offset, limit, max_months, time_budget
+    )
+    return DebtPayoffResponse(monthly_breakdown=schedule.to_steps(), **totals)
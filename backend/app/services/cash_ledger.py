@@ -0,0 +1,86 @@
+from decimal import Decimal, ROUND_HALF_UP
+from typing import List
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.db_models import Expense, UserBalance
+from app.services.increments import increment_row
+
+CENT = Decimal("0.01")
+
+
+def to_cents(amount) -> Decimal:
+    """Round an amount the way the Numeric(10, 2) columns store it."""
+    return Decimal(str(amount)).quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+async def apply_cash_delta(db: AsyncSession, user_id: int, delta: Decimal):
+    """
+    Add delta to the user's running cash total inside the caller's transaction.
+
+    The increment happens in SQL, so concurrent expenses for the same user
+    cannot overwrite each other. Users without a balance row get one with a
+    zero starting balance, which is what the balance endpoints assumed before.
+    Returns the row's balance and cash_spent after the change when the
+    database can report them in the same statement.
+    """
+    return await increment_row(
+        db,
+        UserBalance,
+        {"user_id": user_id},
+        {"cash_spent": delta},
+        defaults={"balance": Decimal("0")},
+        returning=(UserBalance.balance, UserBalance.cash_spent)
+    )
+
+
+def current_cash_balance(user_balance) -> Decimal:
+    if user_balance is None:
+        return Decimal("0")
+    return (user_balance.balance or Decimal("0")) - (user_balance.cash_spent or Decimal("0"))
+
+
+def reconcile_cash_totals(db: Session, fix: bool = False) -> List[dict]:
+    """
+    Compare every user's running cash total with the sum of their cash expenses.
+
+    Parameters:
+    -----------
+    db : Session
+        Synchronous session (the job runs from a script, outside the event loop)
+    fix : bool
+        Overwrite drifted totals with the ledger sum and commit
+
+    Returns:
+    --------
+    List[dict]
+        One entry per mismatched user with user_id, stored and expected totals
+    """
+    ledger = dict(
+        db.execute(
+            select(Expense.user_id, func.coalesce(func.sum(Expense.amount), 0))
+            .where(Expense.credit_card_id.is_(None))
+            .group_by(Expense.user_id)
+        ).all()
+    )
+    balances = {row.user_id: row for row in db.execute(select(UserBalance)).scalars()}
+
+    mismatches = []
+    for user_id in set(ledger) | set(balances):
+        expected = to_cents(ledger.get(user_id, 0))
+        row = balances.get(user_id)
+        stored = to_cents(row.cash_spent if row is not None else 0)
+        if stored == expected:
+            continue
+        mismatches.append({"user_id": user_id, "stored": stored, "expected": expected})
+        if fix:
+            if row is None:
+                db.add(UserBalance(user_id=user_id, balance=Decimal("0"), cash_spent=expected))
+            else:
+                row.cash_spent = expected
+
+    if fix and mismatches:
+        db.commit()
+    return mismatches
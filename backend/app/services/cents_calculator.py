@@ -0,0 +1,229 @@
+import time
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Generator, List, Optional, Tuple
+
+from app.config import get_settings
+from app.models.debt import CreditCard
+from app.services.calculator import (
+    MAX_PLAN_MONTHS,
+    PLAN_TIME_BUDGET_SECONDS,
+    _never_pays_off,
+    _prepare_cards,
+    _stalled
+)
+from app.services.feasibility import analyze_feasibility
+from app.services.schedule import PaymentSchedule
+
+# How each month's interest is posted to the cent when not given per request
+CENTS_ROUNDING = get_settings().CENTS_ROUNDING
+
+ROUNDING_MODES = ("half_even", "half_up", "truncate")
+
+
+def to_cents(amount: Decimal) -> int:
+    """Whole cents of an amount, half-up like the ledger."""
+    return int((Decimal(amount) * 100).to_integral_value(rounding=ROUND_HALF_UP))
+
+
+def _monthly_rate(interest_rate: Decimal) -> Tuple[int, int]:
+    """An APR in percent as an exact monthly (numerator, denominator) fraction."""
+    numerator, denominator = Decimal(interest_rate).as_integer_ratio()
+    return numerator, denominator * 1200
+
+
+def _round_interest(balance: int, numerator: int, denominator: int, rounding: str) -> int:
+    """A month's interest in whole cents, as the simulation posts it."""
+    if rounding == "half_even":
+        interest, remainder = divmod(balance * numerator, denominator)
+        remainder *= 2
+        if remainder > denominator or (remainder == denominator and interest & 1):
+            interest += 1
+        return interest
+    if rounding == "half_up":
+        return (2 * balance * numerator + denominator) // (2 * denominator)
+    return balance * numerator // denominator
+
+
+def _simulate_cents(
+    cards: List[dict],
+    monthly_payment: int,
+    rounding: str,
+    detail: str,
+    offset: int,
+    limit: Optional[int],
+    schedule: PaymentSchedule,
+    max_months: Optional[int] = MAX_PLAN_MONTHS,
+    time_budget: Optional[float] = PLAN_TIME_BUDGET_SECONDS
+) -> Generator[None, None, dict]:
+    """
+    The month-by-month rules of calculator._simulate in integer cents.
+
+    Interest is rounded to the cent every month before it is added to the
+    balance, so every amount in the schedule is a whole number of cents.
+    """
+    month = 0
+    stop_reason = None
+    # Seconds spent simulating; time paused at a yield (e.g. a slow stream reader) is not counted
+    spent = 0.0
+    resumed = time.perf_counter()
+    total_interest_paid = 0
+    total_amount_paid = 0
+    period = 12 if detail == "yearly" else 1
+    window_end = None if limit is None else offset + limit
+
+    balances = [to_cents(card["balance"]) for card in cards]
+    min_payments = [to_cents(card["min_payment"]) for card in cards]
+    rates = [_monthly_rate(card["interest_rate"]) for card in cards]
+    # Indices of the cards still carrying a balance, in strategy order
+    open_cards = [i for i, balance in enumerate(balances) if balance > 0]
+    half_even = rounding == "half_even"
+    half_up = rounding == "half_up"
+
+    period_payments = [0] * len(cards)
+    period_interest = [0] * len(cards)
+    period_total = 0
+
+    paid_off = True
+    while open_cards:
+        # Only a payoff changes the allocation, so only then can the plan become stalled
+        if paid_off and _stalled(
+            balances, min_payments, monthly_payment, lambda i: _round_interest(balances[i], *rates[i], rounding)
+        ):
+            stop_reason = "never_pays_off"
+            break
+        if max_months is not None and month >= max_months:
+            stop_reason = "max_months"
+            break
+        if time_budget is not None and spent + time.perf_counter() - resumed > time_budget:
+            stop_reason = "time_budget"
+            break
+        month += 1
+        payment_remaining = monthly_payment
+        paid_off = False
+
+        # Post interest, then pay the minimum on every open card
+        for i in open_cards:
+            balance = balances[i]
+            numerator, denominator = rates[i]
+            if half_even:
+                interest, remainder = divmod(balance * numerator, denominator)
+                remainder *= 2
+                if remainder > denominator or (remainder == denominator and interest & 1):
+                    interest += 1
+            elif half_up:
+                interest = (2 * balance * numerator + denominator) // (2 * denominator)
+            else:
+                interest = balance * numerator // denominator
+            total_interest_paid += interest
+            balance += interest
+
+            payment = min_payments[i]
+            if payment > balance:
+                payment = balance
+            payment_remaining -= payment
+            balances[i] = balance - payment
+            total_amount_paid += payment
+
+            period_payments[i] += payment
+            period_interest[i] += interest
+            if balances[i] <= 0:
+                paid_off = True
+
+        # Roll the rest of the budget down the cards in strategy order
+        if payment_remaining > 0:
+            for i in open_cards:
+                balance = balances[i]
+                if balance <= 0:
+                    continue
+                extra_payment = payment_remaining if payment_remaining < balance else balance
+                payment_remaining -= extra_payment
+                balances[i] = balance - extra_payment
+                total_amount_paid += extra_payment
+                period_payments[i] += extra_payment
+                if balances[i] <= 0:
+                    paid_off = True
+                if payment_remaining <= 0:
+                    break
+
+        period_total += monthly_payment - payment_remaining
+        if paid_off:
+            open_cards = [i for i in open_cards if balances[i] > 0]
+
+        if detail == "summary":
+            continue
+        if month % period and open_cards:
+            continue
+
+        step = (month - 1) // period
+        if step >= offset and (window_end is None or step < window_end):
+            schedule.append(month, period_payments, period_interest, balances, period_total, sum(balances))
+            spent += time.perf_counter() - resumed
+            yield
+            resumed = time.perf_counter()
+        period_payments = [0] * len(cards)
+        period_interest = [0] * len(cards)
+        period_total = 0
+
+    return {
+        "total_months": month,
+        "total_interest_paid": Decimal(total_interest_paid).scaleb(-2),
+        "total_amount_paid": Decimal(total_amount_paid).scaleb(-2),
+        "pays_off": stop_reason is None,
+        "stop_reason": stop_reason
+    }
+
+
+def payoff_schedule_cents(
+    credit_cards: List[CreditCard],
+    strategy: str,
+    monthly_payment: Decimal,
+    rounding: str = CENTS_ROUNDING,
+    detail: str = "monthly",
+    offset: int = 0,
+    limit: Optional[int] = None,
+    max_months: Optional[int] = MAX_PLAN_MONTHS,
+    time_budget: Optional[float] = PLAN_TIME_BUDGET_SECONDS
+) -> Tuple[PaymentSchedule, dict]:
+    """
+    Fixed-point variant of payoff_schedule working in integer cents.
+
+    Balances, payments and the budget are converted to whole cents once and
+    each month's interest is posted rounded to the cent, the way issuers
+    post it to a statement. Schedules are cent-exact and reproducible across
+    platforms, and the arithmetic is plain integer math instead of Decimal.
+
+    Parameters:
+    -----------
+    credit_cards : List[CreditCard]
+        List of credit cards with their details
+    strategy : str
+        Either 'avalanche' (highest interest first) or 'snowball' (lowest balance first)
+    monthly_payment : Decimal
+        Total monthly payment amount
+    rounding : str
+        How monthly interest is rounded to the cent: 'half_even' (banker's),
+        'half_up' or 'truncate'
+    detail, offset, limit, max_months, time_budget
+        As for calculate_debt_payoff
+
+    Returns:
+    --------
+    Tuple[PaymentSchedule, dict]
+        The schedule, whose amounts are all whole cents, and the plan totals
+    """
+    if rounding not in ROUNDING_MODES:
+        raise ValueError(f"Unknown rounding mode: {rounding}")
+    cards = _prepare_cards(credit_cards, strategy, monthly_payment)
+    schedule = PaymentSchedule(cards, cents=True)
+    if analyze_feasibility(credit_cards, monthly_payment) == "never_pays_off":
+        simulation = _never_pays_off()
+    else:
+        simulation = _simulate_cents(
+            cards, to_cents(monthly_payment), rounding, detail, offset, limit, schedule, max_months, time_budget
+        )
+    while True:
+        try:
+            next(simulation)
+        except StopIteration as stop:
+            return schedule, stop.value
+
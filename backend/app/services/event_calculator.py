@@ -0,0 +1,386 @@
+from typing import List, Optional, Tuple
+from decimal import Decimal, ROUND_CEILING
+import math
+from app.models.debt import CreditCard, CardPayment, PaymentStep, DebtPayoffResponse
+from app.services.calculator import MAX_PLAN_MONTHS
+from app.services.feasibility import analyze_feasibility
+
+ZERO = Decimal("0")
+ONE = Decimal("1")
+
+
+class NeverPaysOffError(ValueError):
+    """Raised when no active card can ever be cleared; carries the segments planned so far."""
+
+    def __init__(self, segments: List[dict]):
+        super().__init__("Monthly payment does not cover the interest, the debt will never be paid off")
+        self.segments = segments
+
+
+def card_states(credit_cards: List[CreditCard]) -> List[dict]:
+    """Copy the cards into plain dicts with the monthly rate precomputed."""
+    return [
+        {
+            "id": card.id,
+            "name": card.name,
+            "balance": card.balance,
+            "rate": card.interest_rate / Decimal("100") / Decimal("12"),
+            "min_payment": card.min_payment
+        }
+        for card in credit_cards
+    ]
+
+
+def sort_cards(cards: List[dict], strategy: str) -> List[dict]:
+    """Fresh copies of the card states, sorted the same way as calculate_debt_payoff."""
+    if strategy == "avalanche":
+        ordered = sorted(cards, key=lambda x: x["rate"], reverse=True)
+    else:  # snowball
+        ordered = sorted(cards, key=lambda x: x["balance"])
+    return [dict(card) for card in ordered]
+
+
+def _balance_after(balance: Decimal, rate: Decimal, payment: Decimal, months: int) -> Decimal:
+    """Annuity closed form: balance after `months` months of interest followed by `payment`."""
+    if months == 0:
+        return balance
+    if rate == ZERO:
+        return balance - payment * months
+    anchor = payment / rate
+    return (balance - anchor) * (ONE + rate) ** months + anchor
+
+
+def _months_to_payoff(balance: Decimal, rate: Decimal, payment: Decimal) -> Optional[int]:
+    """
+    Month (counting from 1) in which a card paying a fixed `payment` is cleared,
+    i.e. the first month whose post-interest balance is <= payment.
+    Returns None if the payment never catches up with the interest.
+    """
+    if balance * (ONE + rate) <= payment:
+        return 1
+    if rate == ZERO:
+        return int((balance / payment).to_integral_value(rounding=ROUND_CEILING))
+    if payment <= balance * rate:
+        return None
+
+    # Estimate with floats, then settle the exact month with Decimal
+    anchor = float(payment / rate)
+    threshold = float(payment / (ONE + rate))
+    ratio = (anchor - threshold) / (anchor - float(balance))
+    months = max(1, math.ceil(math.log(ratio) / math.log1p(float(rate))) + 1)
+
+    def cleared(month: int) -> bool:
+        return _balance_after(balance, rate, payment, month - 1) * (ONE + rate) <= payment
+
+    while months > 1 and cleared(months - 1):
+        months -= 1
+    while not cleared(months):
+        months += 1
+    return months
+
+
+def _simulate_month(cards: List[dict], monthly_payment: Decimal) -> List[tuple]:
+    """
+    Run a single month exactly as calculate_debt_payoff does.
+    Mutates the card balances and returns (payment, interest) per card.
+    """
+    payment_remaining = monthly_payment
+    results = []
+
+    for card in cards:
+        if card["balance"] <= ZERO:
+            results.append((ZERO, ZERO))
+            continue
+        interest = card["balance"] * card["rate"]
+        card["balance"] += interest
+        payment = min(card["min_payment"], card["balance"])
+        payment_remaining -= payment
+        card["balance"] -= payment
+        results.append((payment, interest))
+
+    for i, card in enumerate(cards):
+        if card["balance"] <= ZERO or payment_remaining <= ZERO:
+            continue
+        extra_payment = min(payment_remaining, card["balance"])
+        payment_remaining -= extra_payment
+        card["balance"] -= extra_payment
+        payment, interest = results[i]
+        results[i] = (payment + extra_payment, interest)
+        if payment_remaining <= ZERO:
+            break
+
+    return results
+
+
+def plan_segments(cards: List[dict], monthly_payment: Decimal, max_months: Optional[int] = None) -> List[dict]:
+    """
+    Walk the plan from one payoff event to the next.
+
+    Each segment covers a run of months in which every active card pays a fixed
+    amount (its minimum, or the rolled-over budget for the target card),
+    followed by the single event month in which at least one card is cleared.
+    If the next event lies beyond `max_months`, the last segment only carries
+    the balances up to `max_months`, has no event (None), and the cards are
+    left with what they still owe, the same as calculate_debt_payoff.
+    """
+    segments = []
+    months = 0
+
+    while True:
+        active = [i for i, card in enumerate(cards) if card["balance"] > ZERO]
+        if not active:
+            return segments
+
+        target = active[0]
+        others_min = sum(cards[i]["min_payment"] for i in active[1:])
+        payments = {i: cards[i]["min_payment"] for i in active}
+        payments[target] = monthly_payment - others_min
+
+        horizons = [
+            _months_to_payoff(cards[i]["balance"], cards[i]["rate"], payments[i])
+            for i in active
+        ]
+        horizons = [h for h in horizons if h is not None]
+        if not horizons:
+            raise NeverPaysOffError(segments)
+        steady_months = min(horizons) - 1
+        reaches_limit = max_months is not None and months + steady_months + 1 > max_months
+        if reaches_limit:
+            steady_months = max_months - months
+        months += steady_months + 1
+
+        start_balances = [card["balance"] for card in cards]
+        interest = ZERO
+        for i in active:
+            card = cards[i]
+            card["balance"] = _balance_after(card["balance"], card["rate"], payments[i], steady_months)
+            interest += payments[i] * steady_months - (start_balances[i] - card["balance"])
+
+        event_balances = [card["balance"] for card in cards]
+        event = None if reaches_limit else _simulate_month(cards, monthly_payment)
+
+        segments.append({
+            "start_balances": start_balances,
+            "payments": payments,
+            "steady_months": steady_months,
+            "steady_interest": interest,
+            "event_balances": event_balances,
+            "event": event,
+        })
+        if reaches_limit:
+            return segments
+
+
+def plan_within_limits(
+    cards: List[dict],
+    monthly_payment: Decimal,
+    max_months: Optional[int] = MAX_PLAN_MONTHS,
+    never_pays_off: bool = False
+) -> Tuple[List[dict], Optional[str]]:
+    """
+    Plan segments as far as the plan goes within `max_months`, returning
+    (segments, stop_reason) rather than raising when it never pays off.
+    `never_pays_off` is the feasibility check's verdict, which skips planning.
+    """
+    if never_pays_off:
+        return [], "never_pays_off"
+    try:
+        segments = plan_segments(cards, monthly_payment, max_months)
+    except NeverPaysOffError as e:
+        return e.segments, "never_pays_off"
+    if any(card["balance"] > ZERO for card in cards):
+        return segments, "max_months"
+    return segments, None
+
+
+def summarize_segments(segments: List[dict], monthly_payment: Decimal) -> dict:
+    """Plan totals from the planned segments."""
+    total_months = 0
+    total_interest_paid = ZERO
+    total_amount_paid = ZERO
+    for segment in segments:
+        total_months += segment["steady_months"]
+        total_interest_paid += segment["steady_interest"]
+        total_amount_paid += monthly_payment * segment["steady_months"]
+        if segment["event"] is None:
+            continue
+        total_months += 1
+        for payment, interest in segment["event"]:
+            total_interest_paid += interest
+            total_amount_paid += payment
+
+    return {
+        "total_months": total_months,
+        "total_interest_paid": total_interest_paid,
+        "total_amount_paid": total_amount_paid
+    }
+
+
+def payoff_order(cards: List[dict], segments: List[dict]) -> List[int]:
+    """Card ids in the order their balances reach zero."""
+    order = []
+    for segment in segments:
+        if segment["event"] is None:
+            # Cut off at max_months before any card was cleared
+            continue
+        for i, (payment, interest) in enumerate(segment["event"]):
+            balance = segment["event_balances"][i]
+            if balance > ZERO and balance + interest - payment <= ZERO:
+                order.append(cards[i]["id"])
+    return order
+
+
+def _expand_segments(
+    cards: List[dict],
+    segments: List[dict],
+    monthly_payment: Decimal,
+    offset: int = 0,
+    limit: Optional[int] = None
+) -> List[PaymentStep]:
+    """
+    Fill in the per-month schedule for previously planned segments.
+    Months before `offset` are skipped with the closed form rather than replayed.
+    """
+    monthly_breakdown = []
+    last_month = None if limit is None else offset + limit
+    month = 0
+
+    for segment in segments:
+        if last_month is not None and month >= last_month:
+            break
+        segment_months = segment["steady_months"] + (segment["event"] is not None)
+        if month + segment_months <= offset:
+            month += segment_months
+            continue
+
+        payments = segment["payments"]
+        skipped = min(max(offset - month, 0), segment["steady_months"])
+        balances = list(segment["start_balances"])
+        for i in payments:
+            balances[i] = _balance_after(balances[i], cards[i]["rate"], payments[i], skipped)
+        month += skipped
+
+        for _ in range(segment["steady_months"] - skipped):
+            month += 1
+            if last_month is not None and month > last_month:
+                break
+            card_payments = []
+            for i, card in enumerate(cards):
+                if i not in payments:
+                    card_payments.append(CardPayment(
+                        card_id=card["id"],
+                        card_name=card["name"],
+                        payment=ZERO,
+                        interest_paid=ZERO,
+                        remaining_balance=ZERO
+                    ))
+                    continue
+                interest = balances[i] * card["rate"]
+                balances[i] = balances[i] + interest - payments[i]
+                card_payments.append(CardPayment(
+                    card_id=card["id"],
+                    card_name=card["name"],
+                    payment=payments[i],
+                    interest_paid=interest,
+                    remaining_balance=balances[i]
+                ))
+            monthly_breakdown.append(PaymentStep(
+                month=month,
+                card_payments=card_payments,
+                total_payment=monthly_payment,
+                remaining_debt=sum(b for b in balances if b > ZERO)
+            ))
+        else:
+            if segment["event"] is None:
+                break
+            # Replay the event month from its recorded starting point
+            month += 1
+            if last_month is not None and month > last_month:
+                break
+            balances = list(segment["event_balances"])
+            card_payments = []
+            total_payment = ZERO
+            for i, card in enumerate(cards):
+                payment, interest = segment["event"][i]
+                if balances[i] > ZERO:
+                    balances[i] = balances[i] + interest - payment
+                total_payment += payment
+                card_payments.append(CardPayment(
+                    card_id=card["id"],
+                    card_name=card["name"],
+                    payment=payment,
+                    interest_paid=interest,
+                    remaining_balance=max(balances[i], ZERO)
+                ))
+            monthly_breakdown.append(PaymentStep(
+                month=month,
+                card_payments=card_payments,
+                total_payment=total_payment,
+                remaining_debt=sum(b for b in balances if b > ZERO)
+            ))
+
+    return monthly_breakdown
+
+
+def calculate_debt_payoff_events(
+    credit_cards: List[CreditCard],
+    strategy: str,
+    monthly_payment: Decimal,
+    include_breakdown: bool = False,
+    offset: int = 0,
+    limit: Optional[int] = None,
+    max_months: Optional[int] = MAX_PLAN_MONTHS
+) -> DebtPayoffResponse:
+    """
+    Event-driven variant of calculate_debt_payoff.
+
+    Instead of stepping one month at a time, the plan jumps from one payoff
+    event to the next using the annuity closed form for the months in between,
+    so the totals cost O(cards²) regardless of how long the plan runs.
+
+    Parameters:
+    -----------
+    credit_cards : List[CreditCard]
+        List of credit cards with their details
+    strategy : str
+        Either 'avalanche' (highest interest first) or 'snowball' (lowest balance first)
+    monthly_payment : Decimal
+        Total monthly payment amount
+    include_breakdown : bool
+        Expand the month-by-month schedule; left empty when False
+    offset : int
+        Number of leading months to skip in the breakdown
+    limit : Optional[int]
+        Maximum number of months to return, all remaining months if None
+    max_months : Optional[int]
+        Stop planning at the first payoff event beyond this many months
+
+    Returns:
+    --------
+    DebtPayoffResponse
+        Payoff plan totals, with the schedule only if requested; pays_off is
+        False (with the stop_reason) when the debt is not cleared
+    """
+    cards = sort_cards(card_states(credit_cards), strategy)
+
+    total_min_payment = sum(card["min_payment"] for card in cards)
+    if monthly_payment < total_min_payment:
+        raise ValueError(f"Monthly payment must be at least {total_min_payment}")
+
+    segments, stop_reason = plan_within_limits(
+        cards,
+        monthly_payment,
+        max_months,
+        analyze_feasibility(credit_cards, monthly_payment) == "never_pays_off"
+    )
+
+    monthly_breakdown = []
+    if include_breakdown:
+        monthly_breakdown = _expand_segments(cards, segments, monthly_payment, offset, limit)
+
+    return DebtPayoffResponse(
+        monthly_breakdown=monthly_breakdown,
+        pays_off=stop_reason is None,
+        stop_reason=stop_reason,
+        **summarize_segments(segments, monthly_payment)
+    )
@@ -0,0 +1,44 @@
+from typing import List
+from decimal import Decimal
+from app.models.debt import CreditCard
+
+
+def analyze_feasibility(credit_cards: List[CreditCard], monthly_payment: Decimal) -> str:
+    """
+    Decide in O(cards log cards) whether a plan can pay off, before simulating it.
+
+    No group of cards ever receives more than the whole monthly payment. If
+    a group's interest at its lowest rate, D_group * r_min, is already at or
+    above the payment, the group's debt never shrinks and the plan never pays
+    off. Taking the cards in descending rate order covers every group worth
+    checking, a single card whose interest eats the whole budget included.
+
+    With total debt D and the highest monthly rate r_max, a payment above
+    D * r_max shrinks the debt every month, so the plan pays off.
+
+    Plans in between depend on how the budget rolls over as cards are
+    cleared; the simulation decides those (see calculator._stalled).
+
+    Returns:
+    --------
+    str
+        'pays_off', 'never_pays_off' or 'unknown'
+    """
+    cards = sorted(
+        ((card.interest_rate / Decimal("100") / Decimal("12"), card.balance) for card in credit_cards),
+        key=lambda card: card[0],
+        reverse=True
+    )
+    total_debt = sum(balance for _, balance in cards)
+    if total_debt <= Decimal("0"):
+        return "pays_off"
+
+    group_debt = Decimal("0")
+    for rate, balance in cards:
+        group_debt += balance
+        if monthly_payment <= group_debt * rate:
+            return "never_pays_off"
+
+    if monthly_payment > total_debt * cards[0][0]:
+        return "pays_off"
+    return "unknown"
@@ -0,0 +1,53 @@
+from sqlalchemy import insert, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+_UPSERT_DIALECTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+async def increment_row(
+    db: AsyncSession,
+    model,
+    keys: dict,
+    deltas: dict,
+    defaults: dict = None,
+    returning: tuple = ()
+):
+    """
+    Add deltas to the row identified by keys, creating it when missing.
+
+    keys must match a unique constraint. On PostgreSQL and SQLite this is a
+    single INSERT ... ON CONFLICT DO UPDATE, so the row is created or bumped
+    in one statement without a race; other databases fall back to an UPDATE
+    followed by an INSERT when nothing matched. defaults only apply to a
+    newly created row. Returns the requested columns of the resulting row
+    (None on the fallback path when the row was just inserted).
+    """
+    table = model.__table__
+    make_insert = _UPSERT_DIALECTS.get(db.bind.dialect.name)
+
+    if make_insert is not None:
+        statement = make_insert(table).values({**(defaults or {}), **keys, **deltas})
+        statement = statement.on_conflict_do_update(
+            index_elements=list(keys),
+            set_={name: table.c[name] + statement.excluded[name] for name in deltas}
+        )
+        if returning:
+            return (await db.execute(statement.returning(*returning))).first()
+        await db.execute(statement)
+        return None
+
+    statement = (
+        update(table)
+        .where(*(table.c[name] == value for name, value in keys.items()))
+        .values({name: table.c[name] + value for name, value in deltas.items()})
+    )
+    if returning:
+        row = (await db.execute(statement.returning(*returning))).first()
+        updated = row is not None
+    else:
+        row = None
+        updated = (await db.execute(statement)).rowcount > 0
+    if not updated:
+        await db.execute(insert(table).values({**(defaults or {}), **keys, **deltas}))
+    return row
@@ -0,0 +1,171 @@
+import csv
+import io
+from typing import AsyncIterator, List
+
+from sqlalchemy import select
+
+from app.config import get_settings
+from app.database import AsyncSessionLocal
+from app.models.db_models import Expense, Payment
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Optional, only needed for Parquet exports
+    pa = pq = None
+
+settings = get_settings()
+
+EXPENSE_COLUMNS = ["id", "date", "description", "amount", "credit_card_id", "balance_type"]
+PAYMENT_COLUMNS = ["id", "payment_date", "credit_card_id", "amount", "interest_portion", "principal_portion"]
+
+
+def parquet_available() -> bool:
+    return pq is not None
+
+
+def _expense_query(user_id: int):
+    return (
+        select(Expense.id, Expense.date, Expense.description, Expense.amount, Expense.credit_card_id)
+        .where(Expense.user_id == user_id)
+        .order_by(Expense.date, Expense.id)
+    )
+
+
+def _expense_values(row) -> list:
+    return [
+        row.id,
+        row.date,
+        row.description,
+        row.amount,
+        row.credit_card_id,
+        "credit_card" if row.credit_card_id else "cash"
+    ]
+
+
+def _payment_query(user_id: int):
+    return (
+        select(
+            Payment.id,
+            Payment.payment_date,
+            Payment.credit_card_id,
+            Payment.amount,
+            Payment.interest_portion,
+            Payment.principal_portion
+        )
+        .where(Payment.user_id == user_id)
+        .order_by(Payment.payment_date, Payment.id)
+    )
+
+
+async def _batches(query, to_values) -> AsyncIterator[List[list]]:
+    """
+    Stream a query in EXPORT_BATCH_SIZE batches from a server-side cursor.
+
+    Opens its own session: the response body is produced after the
+    request's dependencies (and their session) have already closed.
+    """
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(query.execution_options(yield_per=settings.EXPORT_BATCH_SIZE))
+        async for partition in result.partitions():
+            yield [to_values(row) for row in partition]
+
+
+async def _csv_chunks(columns: List[str], batches) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    async for batch in batches:
+        writer.writerows(
+            [value.isoformat() if hasattr(value, "isoformat") else value for value in values]
+            for values in batch
+        )
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands whatever ParquetWriter wrote back to the caller."""
+
+    def __init__(self):
+        self.chunks = []
+        self.position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def take(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def _arrow_schema(kind: str):
+    if kind == "expenses":
+        return pa.schema([
+            ("id", pa.int64()),
+            ("date", pa.timestamp("us")),
+            ("description", pa.string()),
+            ("amount", pa.decimal128(10, 2)),
+            ("credit_card_id", pa.int64()),
+            ("balance_type", pa.string())
+        ])
+    return pa.schema([
+        ("id", pa.int64()),
+        ("payment_date", pa.timestamp("us")),
+        ("credit_card_id", pa.int64()),
+        ("amount", pa.float64()),
+        ("interest_portion", pa.float64()),
+        ("principal_portion", pa.float64())
+    ])
+
+
+async def _parquet_chunks(schema, batches) -> AsyncIterator[bytes]:
+    """One Parquet row group per batch, flushed to the client as each is written."""
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema)
+    async for batch in batches:
+        writer.write_table(pa.Table.from_pylist([dict(zip(schema.names, values)) for values in batch], schema=schema))
+        yield sink.take()
+    writer.close()
+    yield sink.take()
+
+
+def export_ledger(user_id: int, kind: str, file_format: str) -> AsyncIterator[bytes]:
+    """
+    Byte chunks of a user's full expense or payment history, oldest first.
+
+    Rows flow from a yield_per cursor into CSV text or Parquet row groups
+    one batch at a time, so memory stays flat however long the ledger is.
+
+    Parameters:
+    -----------
+    user_id : int
+        Owner of the ledger
+    kind : str
+        'expenses' or 'payments'
+    file_format : str
+        'csv' or 'parquet' (needs pyarrow)
+    """
+    if file_format == "parquet" and not parquet_available():
+        raise ValueError("Parquet export requires the pyarrow package")
+
+    if kind == "expenses":
+        columns, batches = EXPENSE_COLUMNS, _batches(_expense_query(user_id), _expense_values)
+    else:
+        columns, batches = PAYMENT_COLUMNS, _batches(_payment_query(user_id), list)
+
+    if file_format == "parquet":
+        return _parquet_chunks(_arrow_schema(kind), batches)
+    return _csv_chunks(columns, batches)
@@ -0,0 +1,274 @@
+import codecs
+import csv
+import json
+from collections import defaultdict
+from datetime import datetime
+from decimal import Decimal
+from typing import AsyncIterator, List
+
+from fastapi import Request
+from pydantic import ValidationError
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.models.db_models import CreditCard, Expense, Payment
+from app.models.debt import PaymentImportRow
+from app.schemas import ExpenseImportRow
+from app.services.cash_ledger import apply_cash_delta, to_cents
+from app.services.summaries import rebuild_rollups
+
+settings = get_settings()
+
+
+class LedgerImportError(ValueError):
+    """Raised when an import has invalid rows; nothing is written."""
+
+    def __init__(self, errors: List[dict]):
+        super().__init__(f"{len(errors)} invalid row(s)")
+        self.errors = errors
+
+
+def _split_records(text: str, pending: str):
+    """
+    Cut decoded CSV text into complete records.
+
+    A line only ends a record when the quotes seen so far are balanced,
+    so quoted fields may span lines and network chunks.
+    """
+    lines = (pending + text).split("\n")
+    tail = lines.pop()
+    records, record = [], ""
+    for line in lines:
+        record += line + "\n"
+        if record.count('"') % 2 == 0:
+            records.append(record)
+            record = ""
+    return records, record + tail
+
+
+async def _csv_records(chunks) -> AsyncIterator[dict]:
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    header = None
+    pending = ""
+    finished = False
+    while not finished:
+        try:
+            chunk = await chunks.__anext__()
+            records, pending = _split_records(decoder.decode(chunk), pending)
+        except StopAsyncIteration:
+            finished = True
+            records, pending = _split_records(decoder.decode(b"", final=True) + "\n", pending)
+            if pending.strip():
+                # Unbalanced quote at the end of the file, let the csv module make sense of it
+                records.append(pending)
+
+        for values in csv.reader(records):
+            if not any(value.strip() for value in values):
+                continue
+            if header is None:
+                header = [name.strip().lower() for name in values]
+                continue
+            yield dict(zip(header, values))
+
+
+async def iter_records(request: Request) -> AsyncIterator[dict]:
+    """Rows of a text/csv body (parsed as it streams in) or of a JSON array body."""
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type == "text/csv":
+        async for record in _csv_records(request.stream().__aiter__()):
+            yield record
+    elif content_type == "application/json":
+        try:
+            rows = json.loads(await request.body())
+        except ValueError:
+            raise LedgerImportError([{"row": None, "error": "Body is not valid JSON"}])
+        if not isinstance(rows, list):
+            raise LedgerImportError([{"row": None, "error": "Expected a JSON array of rows"}])
+        for row in rows:
+            yield row
+    else:
+        raise LedgerImportError([{"row": None, "error": "Send text/csv or a JSON array (application/json)"}])
+
+
+def _clean(record) -> dict:
+    if not isinstance(record, dict):
+        raise ValueError("Expected an object with named fields")
+    # CSV cells are strings, blank ones mean "not given"
+    return {
+        key: value.strip() if isinstance(value, str) else value
+        for key, value in record.items()
+        if value is not None and not (isinstance(value, str) and not value.strip())
+    }
+
+
+def _describe(error: Exception) -> str:
+    if isinstance(error, ValidationError):
+        return "; ".join(
+            f"{'.'.join(str(part) for part in detail['loc'])}: {detail['msg']}"
+            for detail in error.errors()
+        )
+    return str(error)
+
+
+class _ChunkWriter:
+    """Buffers row mappings and sends them as one executemany per chunk."""
+
+    def __init__(self, db: AsyncSession, model):
+        self.db = db
+        self.model = model
+        self.rows = []
+        self.written = 0
+
+    async def add(self, row: dict):
+        self.rows.append(row)
+        if len(self.rows) >= settings.IMPORT_CHUNK_SIZE:
+            await self.flush()
+
+    async def flush(self):
+        if self.rows:
+            # Core insert on the table: a plain executemany, without the ORM's per-row bookkeeping
+            await self.db.execute(insert(self.model.__table__), self.rows)
+            self.written += len(self.rows)
+            self.rows = []
+
+
+async def _user_card_ids(db: AsyncSession, user_id: int) -> set:
+    result = await db.execute(select(CreditCard.id).where(CreditCard.user_id == user_id))
+    return set(result.scalars().all())
+
+
+async def import_expenses(db: AsyncSession, user_id: int, records: AsyncIterator[dict]) -> int:
+    """
+    Validate and insert expense rows in one transaction.
+
+    Rows are written in chunks while they stream in; card balances and the
+    running cash total are summed as Decimal and adjusted once per card at
+    the end rather than once per row, and the monthly rollups (when
+    enabled) are rebuilt from the ledger. Any invalid row rolls the whole
+    import back.
+
+    Returns:
+    --------
+    int
+        Number of expenses imported
+    """
+    card_ids = await _user_card_ids(db, user_id)
+    writer = _ChunkWriter(db, Expense)
+    card_deltas = defaultdict(Decimal)
+    cash_spent = Decimal("0")
+    errors = []
+
+    row_number = 0
+    async for record in records:
+        row_number += 1
+        try:
+            row = ExpenseImportRow(**_clean(record))
+            if row.credit_card_id is not None and row.credit_card_id not in card_ids:
+                raise ValueError(f"Credit card {row.credit_card_id} not found")
+        except (ValueError, TypeError) as e:
+            errors.append({"row": row_number, "error": _describe(e)})
+            if len(errors) >= settings.IMPORT_MAX_ERRORS:
+                break
+            continue
+        if errors:
+            # Keep validating to report more problems, but nothing will be written
+            continue
+
+        amount = to_cents(row.amount)
+        await writer.add({
+            "description": row.description,
+            "amount": amount,
+            "date": row.date,
+            "credit_card_id": row.credit_card_id,
+            "user_id": user_id
+        })
+        if row.credit_card_id is None:
+            cash_spent += amount
+        else:
+            card_deltas[row.credit_card_id] += amount
+
+    if errors:
+        await db.rollback()
+        raise LedgerImportError(errors)
+
+    await writer.flush()
+    for card_id, delta in card_deltas.items():
+        await db.execute(
+            update(CreditCard).where(CreditCard.id == card_id).values(balance=CreditCard.balance + float(delta))
+        )
+    if cash_spent:
+        await apply_cash_delta(db, user_id, cash_spent)
+    await rebuild_rollups(db, user_id)
+    await db.commit()
+    return writer.written
+
+
+async def import_payments(db: AsyncSession, user_id: int, records: AsyncIterator[dict]) -> int:
+    """
+    Validate and insert payment rows in one transaction.
+
+    Each card's balance drops by its principal, summed exactly as Decimal,
+    in a single update and is then clamped at zero. Principal portions are
+    validated as non-negative, so a balance never rises again after
+    crossing zero and the result matches applying the payments one at a
+    time. Any invalid row rolls the whole import back.
+
+    Returns:
+    --------
+    int
+        Number of payments imported
+    """
+    card_ids = await _user_card_ids(db, user_id)
+    writer = _ChunkWriter(db, Payment)
+    principal_by_card = defaultdict(Decimal)
+    imported_at = datetime.now()
+    errors = []
+
+    row_number = 0
+    async for record in records:
+        row_number += 1
+        try:
+            row = PaymentImportRow(**_clean(record))
+            if row.credit_card_id not in card_ids:
+                raise ValueError(f"Credit card {row.credit_card_id} not found")
+        except (ValueError, TypeError) as e:
+            errors.append({"row": row_number, "error": _describe(e)})
+            if len(errors) >= settings.IMPORT_MAX_ERRORS:
+                break
+            continue
+        if errors:
+            continue
+
+        payment_date = row.payment_date or imported_at
+        amount = float(row.amount)
+        interest = float(row.interest_portion)
+        principal = float(row.principal_portion)
+        await writer.add({
+            "amount": amount,
+            "interest_portion": interest,
+            "principal_portion": principal,
+            "payment_date": payment_date,
+            "credit_card_id": row.credit_card_id,
+            "user_id": user_id
+        })
+        principal_by_card[row.credit_card_id] += row.principal_portion
+
+    if errors:
+        await db.rollback()
+        raise LedgerImportError(errors)
+
+    await writer.flush()
+    for card_id, principal in principal_by_card.items():
+        await db.execute(
+            update(CreditCard).where(CreditCard.id == card_id).values(balance=CreditCard.balance - float(principal))
+        )
+    if principal_by_card:
+        await db.execute(
+            update(CreditCard)
+            .where(CreditCard.id.in_(list(principal_by_card)), CreditCard.balance <= 0)
+            .values(balance=0, is_paid_off=True)
+        )
+    await rebuild_rollups(db, user_id)
+    await db.commit()
+    return writer.written
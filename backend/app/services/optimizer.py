@@ -0,0 +1,105 @@
+from typing import List
+from decimal import Decimal
+from app.models.debt import CreditCard, StrategySpec, OptimizeResponse
+from app.services.calculator import MAX_PLAN_MONTHS
+from app.services.event_calculator import card_states, plan_within_limits, summarize_segments, payoff_order
+from app.services.feasibility import analyze_feasibility
+from app.services.strategy_compare import compare_strategies
+
+
+def _score(cards: List[dict], monthly_payment: Decimal, objective: str, never_pays_off: bool):
+    segments, stop_reason = plan_within_limits(
+        [dict(card) for card in cards], monthly_payment, MAX_PLAN_MONTHS, never_pays_off
+    )
+    totals = {
+        **summarize_segments(segments, monthly_payment),
+        "pays_off": stop_reason is None,
+        "stop_reason": stop_reason
+    }
+    # Orders that pay off always beat those that don't
+    if objective == "months":
+        return (stop_reason is not None, totals["total_months"], totals["total_interest_paid"]), segments, totals
+    return (stop_reason is not None, totals["total_interest_paid"], totals["total_months"]), segments, totals
+
+
+def optimize_allocation(
+    credit_cards: List[CreditCard],
+    monthly_payment: Decimal,
+    objective: str = "interest"
+) -> OptimizeResponse:
+    """
+    Find the extra-payment priority order that minimizes interest or months.
+
+    Every month each card pays its minimum and the rest of the budget is
+    poured into cards by priority. The greedy marginal-rate rule (send every
+    spare dollar to the highest monthly rate) is optimal:
+
+    Exchange argument: take any allocation that, in some month, puts a dollar
+    on card L while card H with r_H > r_L still carries a balance, and move
+    that dollar to H. H's balance is one dollar lower and L's one dollar
+    higher; k months later that dollar has cost (1+r_L)^k on L instead of
+    (1+r_H)^k on H, so the total balance, and with it the interest accrued,
+    is no higher in every later month. Minimums are fixed amounts and any
+    freed minimum rejoins the same budget, so the swap changes nothing else.
+    Repeating the swap turns any allocation into highest-rate-first without
+    ever increasing cumulative interest at any horizon. Because the total
+    balance evolves as D' = D + interest - budget, lower interest at every
+    horizon also means debt-free no later.
+
+    The argument leaves the order within groups of equal rates open (and
+    the final partial month rounds differently), so adjacent equal-rate
+    cards are swapped while the objective improves. Each evaluation uses the
+    event engine, keeping the search O(cards³) at worst and O(cards²) typical.
+
+    Parameters:
+    -----------
+    credit_cards : List[CreditCard]
+        List of credit cards with their details
+    monthly_payment : Decimal
+        Total monthly payment amount
+    objective : str
+        'interest' (total interest paid) or 'months' (time to debt-free)
+
+    Returns:
+    --------
+    OptimizeResponse
+        Optimal priority order and its totals, next to avalanche and snowball;
+        pays_off is False (with the stop_reason) when even that order does not
+        clear the debt within MAX_PLAN_MONTHS
+    """
+    cards = card_states(credit_cards)
+    total_min_payment = sum(card["min_payment"] for card in cards)
+    if monthly_payment < total_min_payment:
+        raise ValueError(f"Monthly payment must be at least {total_min_payment}")
+
+    never_pays_off = analyze_feasibility(credit_cards, monthly_payment) == "never_pays_off"
+
+    # Greedy marginal-rate order; smaller balances first within a rate so minimums free up sooner
+    order = sorted(cards, key=lambda card: (-card["rate"], card["balance"]))
+    best, segments, totals = _score(order, monthly_payment, objective, never_pays_off)
+
+    improved = True
+    while improved:
+        improved = False
+        for i in range(len(order) - 1):
+            if order[i]["rate"] != order[i + 1]["rate"]:
+                continue
+            candidate = order[:i] + [order[i + 1], order[i]] + order[i + 2:]
+            score, candidate_segments, candidate_totals = _score(candidate, monthly_payment, objective, never_pays_off)
+            if score < best:
+                order, best, segments, totals = candidate, score, candidate_segments, candidate_totals
+                improved = True
+
+    baselines = compare_strategies(
+        credit_cards,
+        monthly_payment,
+        [StrategySpec(strategy="avalanche"), StrategySpec(strategy="snowball")]
+    ).results
+
+    return OptimizeResponse(
+        objective=objective,
+        card_order=[card["id"] for card in order],
+        payoff_order=payoff_order(order, segments),
+        baselines=baselines,
+        **totals
+    )
@@ -0,0 +1,50 @@
+import base64
+from datetime import datetime
+from typing import Optional, Tuple
+
+from sqlalchemy import and_, or_
+
+
+def encode_cursor(date: datetime, row_id: int) -> str:
+    """Opaque cursor pointing just past a row in (date DESC, id DESC) order."""
+    raw = f"{date.isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        date, row_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(date), int(row_id)
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError("Invalid cursor")
+
+
+def keyset_page(query, date_column, id_column, cursor: Optional[str], limit: Optional[int]):
+    """
+    Apply newest-first keyset pagination to a select.
+
+    Rows after the cursor are found with a range condition on the
+    (date, id) index rather than an OFFSET, so every page costs the same
+    no matter how deep into the history it is. One extra row is fetched to
+    tell whether another page follows; see next_cursor.
+    """
+    if cursor is not None:
+        date, row_id = decode_cursor(cursor)
+        query = query.where(or_(
+            date_column < date,
+            and_(date_column == date, id_column < row_id)
+        ))
+    query = query.order_by(date_column.desc(), id_column.desc())
+    if limit is not None:
+        query = query.limit(limit + 1)
+    return query
+
+
+def next_cursor(rows: list, limit: Optional[int], date_attribute: str) -> Tuple[list, Optional[str]]:
+    """Trim the look-ahead row from a keyset page and build the cursor for the next one."""
+    if limit is None or len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(getattr(last, date_attribute), last.id)
@@ -0,0 +1,75 @@
+from typing import List
+from decimal import Decimal, ROUND_CEILING
+from app.models.debt import CreditCard, SolvePaymentResponse
+from app.services.event_calculator import ZERO, ONE, card_states, sort_cards, plan_segments, summarize_segments
+
+CENT = Decimal("0.01")
+
+
+def _fits(cards: List[dict], monthly_payment: Decimal, target_months: int):
+    """Plan summary if the payment clears every card within target_months, else None."""
+    trial = [dict(card) for card in cards]
+    try:
+        segments = plan_segments(trial, monthly_payment, max_months=target_months)
+    except ValueError:
+        # Interest outpaces the payment, so no horizon is reachable
+        return None
+    if any(card["balance"] > ZERO for card in trial):
+        return None
+    return summarize_segments(segments, monthly_payment)
+
+
+def solve_minimum_payment(
+    credit_cards: List[CreditCard],
+    strategy: str,
+    target_months: int
+) -> SolvePaymentResponse:
+    """
+    Find the smallest monthly payment (to the cent) that is debt-free within target_months.
+
+    Months to payoff never increase as the payment grows, so a bisection over
+    whole cents between the total minimum payment and the amount that clears
+    everything in the first month finds the answer. Each trial is a
+    summary-only event-engine plan that stops as soon as it runs past the
+    target horizon.
+
+    Parameters:
+    -----------
+    credit_cards : List[CreditCard]
+        List of credit cards with their details
+    strategy : str
+        Either 'avalanche' (highest interest first) or 'snowball' (lowest balance first)
+    target_months : int
+        Number of months in which all cards must be paid off
+
+    Returns:
+    --------
+    SolvePaymentResponse
+        Minimum monthly payment and the totals of the resulting plan
+    """
+    cards = sort_cards(card_states(credit_cards), strategy)
+
+    total_min_payment = sum(card["min_payment"] for card in cards)
+    low = int((total_min_payment / CENT).to_integral_value(rounding=ROUND_CEILING))
+    # Paying every balance plus one month of interest clears the plan in month one
+    payoff_now = sum(card["balance"] * (ONE + card["rate"]) for card in cards)
+    high = max(low, int((payoff_now / CENT).to_integral_value(rounding=ROUND_CEILING)))
+
+    totals = _fits(cards, low * CENT, target_months)
+    if totals is not None:
+        high = low
+    else:
+        totals = _fits(cards, high * CENT, target_months)
+        while high - low > 1:
+            middle = (low + high) // 2
+            trial = _fits(cards, middle * CENT, target_months)
+            if trial is None:
+                low = middle
+            else:
+                high, totals = middle, trial
+
+    return SolvePaymentResponse(
+        target_months=target_months,
+        monthly_payment=high * CENT,
+        **totals
+    )
@@ -0,0 +1,227 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import closing, contextmanager
+from decimal import Decimal
+from typing import Any, Optional
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.config import get_settings
+from app.models.debt import DebtPayoffRequest
+
+settings = get_settings()
+
+
+def _normalize_decimal(value: Decimal) -> str:
+    """Render a Decimal so that 300, 300.0 and 300.00 hash identically."""
+    normalized = value.normalize()
+    return format(normalized, "f")
+
+
+def cache_key(request: DebtPayoffRequest, **options) -> str:
+    """
+    Canonical SHA-256 of a payoff request plus any response options.
+
+    Card order is preserved because it breaks ties in the strategy sort.
+    """
+    payload = {
+        "strategy": request.strategy,
+        "monthly_payment": _normalize_decimal(request.monthly_payment),
+        "credit_cards": [
+            {
+                "id": str(card.id),
+                "name": card.name,
+                "balance": _normalize_decimal(card.balance),
+                "interest_rate": _normalize_decimal(card.interest_rate),
+                "min_payment": _normalize_decimal(card.min_payment)
+            }
+            for card in request.credit_cards
+        ],
+        "options": options
+    }
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+class MemoryCacheBackend:
+    """Per-process LRU dict bounded by entry count and age."""
+
+    # Lookups are in-memory, so async callers needn't leave the event loop
+    blocking = False
+
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if time.time() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any):
+        with self._lock:
+            self._entries[key] = (time.time(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def size(self) -> int:
+        return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteCacheBackend:
+    """LRU store in a local SQLite file, shared by every worker on the host."""
+
+    # Every call opens a connection and may wait up to 5 s on the file lock
+    blocking = True
+
+    def __init__(self, path: str, max_entries: int, ttl_seconds: int):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS plan_cache ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, "
+                "stored_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_plan_cache_accessed_at ON plan_cache (accessed_at)")
+
+    @contextmanager
+    def _connect(self):
+        # A fresh connection per call keeps the backend safe across forked workers
+        with closing(sqlite3.connect(self.path, timeout=5, isolation_level=None)) as conn:
+            yield conn
+
+    def get(self, key: str) -> Optional[bytes]:
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT value, stored_at FROM plan_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, stored_at = row
+            if now - stored_at > self.ttl_seconds:
+                conn.execute("DELETE FROM plan_cache WHERE key = ?", (key,))
+                return None
+            conn.execute("UPDATE plan_cache SET accessed_at = ? WHERE key = ?", (now, key))
+            return value
+
+    def set(self, key: str, value: bytes):
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO plan_cache (key, value, stored_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, value, now, now)
+            )
+            conn.execute(
+                "DELETE FROM plan_cache WHERE stored_at < ? OR key IN ("
+                "SELECT key FROM plan_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (now - self.ttl_seconds, self.max_entries)
+            )
+
+    def delete(self, key: str):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM plan_cache WHERE key = ?", (key,))
+
+    def size(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM plan_cache").fetchone()[0]
+
+    def clear(self):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM plan_cache")
+
+
+class PlanCache:
+    """
+    Cache of encoded payoff responses with hit/miss counters (counted per process).
+
+    Async handlers use get_async/set_async/stats_async, which run a blocking
+    backend's calls in the threadpool instead of on the event loop.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        if self.backend is None:
+            return None
+        value = self.backend.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key: str, value: bytes):
+        if self.backend is not None:
+            self.backend.set(key, value)
+
+    @property
+    def blocking(self) -> bool:
+        return getattr(self.backend, "blocking", False)
+
+    async def get_async(self, key: str) -> Optional[bytes]:
+        if self.blocking:
+            return await run_in_threadpool(self.get, key)
+        return self.get(key)
+
+    async def set_async(self, key: str, value: bytes):
+        if self.blocking:
+            await run_in_threadpool(self.set, key, value)
+        else:
+            self.set(key, value)
+
+    async def stats_async(self) -> dict:
+        if self.blocking:
+            return await run_in_threadpool(self.stats)
+        return self.stats()
+
+    def stats(self) -> dict:
+        return {
+            "backend": settings.PLAN_CACHE_BACKEND,
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": self.backend.size() if self.backend is not None else 0,
+            "max_entries": settings.PLAN_CACHE_MAX_ENTRIES,
+            "ttl_seconds": settings.PLAN_CACHE_TTL_SECONDS
+        }
+
+
+def _create_backend():
+    if settings.PLAN_CACHE_BACKEND == "sqlite":
+        return SQLiteCacheBackend(
+            settings.PLAN_CACHE_PATH, settings.PLAN_CACHE_MAX_ENTRIES, settings.PLAN_CACHE_TTL_SECONDS
+        )
+    if settings.PLAN_CACHE_BACKEND == "memory":
+        return MemoryCacheBackend(settings.PLAN_CACHE_MAX_ENTRIES, settings.PLAN_CACHE_TTL_SECONDS)
+    return None
+
+
+plan_cache = PlanCache(_create_backend())
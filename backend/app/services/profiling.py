@@ -0,0 +1,135 @@
+import cProfile
+import hmac
+import os
+import random
+import re
+import time
+
+try:
+    from pyinstrument import Profiler as PyinstrumentProfiler
+except ImportError:  # Optional, cProfile is used without it
+    PyinstrumentProfiler = None
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.config import get_settings
+
+settings = get_settings()
+PROFILE_HEADER = settings.PROFILE_HEADER.lower()
+
+
+class _CProfileRecorder:
+    extension = "prof"
+
+    def __init__(self):
+        self._profile = cProfile.Profile()
+
+    def start(self):
+        self._profile.enable()
+
+    def stop(self):
+        self._profile.disable()
+
+    def save(self, path: str):
+        # Readable with pstats, snakeviz or gprof2dot
+        self._profile.dump_stats(path)
+
+
+class _PyinstrumentRecorder:
+    extension = "html"
+
+    def __init__(self):
+        # Attributes time spent awaiting to the awaiting coroutine, not to other requests
+        self._profiler = PyinstrumentProfiler(async_mode="enabled")
+
+    def start(self):
+        self._profiler.start()
+
+    def stop(self):
+        self._profiler.stop()
+
+    def save(self, path: str):
+        with open(path, "w") as f:
+            f.write(self._profiler.output_html())
+
+
+def _recorder():
+    if settings.PROFILE_ENGINE == "pyinstrument" and PyinstrumentProfiler is not None:
+        return _PyinstrumentRecorder()
+    return _CProfileRecorder()
+
+
+def _save(recorder, path: str):
+    os.makedirs(settings.PROFILE_DIR, exist_ok=True)
+    recorder.save(path)
+
+
+def _dump_path(scope, extension: str) -> str:
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", scope["path"]).strip("_") or "root"
+    name = f"{int(time.time() * 1000)}-{scope['method']}-{slug}.{extension}"
+    return os.path.join(settings.PROFILE_DIR, name)
+
+
+class ProfilerMiddleware:
+    """
+    Opt-in per-request profiler, dumping one file per profiled request to PROFILE_DIR.
+
+    With PROFILE_MODE=header, requests sending the PROFILE_TOKEN secret in
+    the PROFILE_HEADER header (X-Profile: <token>) are profiled and the
+    dump's file name is returned in the same header; without a token set,
+    no request is. With PROFILE_MODE=sample, a PROFILE_SAMPLE_RATE
+    fraction of requests is profiled and kept only when it took at least
+    PROFILE_SLOW_MS.
+
+    Only one request is profiled at a time. Profilers follow the event loop
+    thread: calculations offloaded to the calculation pool show up as the
+    time spent awaiting it, so profile the calculator itself with the
+    benchmarks instead. cProfile also counts other requests interleaved on
+    the loop; pyinstrument, when installed, does not.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._active = False
+
+    def _wants_profile(self, scope) -> bool:
+        if settings.PROFILE_MODE == "header":
+            # Every profiled request writes a file, so only holders of the token may ask for one
+            if not settings.PROFILE_TOKEN:
+                return False
+            for name, value in scope["headers"]:
+                if name.decode("latin-1") == PROFILE_HEADER:
+                    return hmac.compare_digest(value.strip(), settings.PROFILE_TOKEN.encode("latin-1"))
+            return False
+        if settings.PROFILE_MODE == "sample":
+            return random.random() < settings.PROFILE_SAMPLE_RATE
+        return False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self._active or not self._wants_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        recorder = _recorder()
+        path = _dump_path(scope, recorder.extension)
+        always_save = settings.PROFILE_MODE == "header"
+
+        async def send_with_header(message):
+            if always_save and message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((PROFILE_HEADER.encode("latin-1"), os.path.basename(path).encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        self._active = True
+        start = time.perf_counter()
+        recorder.start()
+        try:
+            await self.app(scope, receive, send_with_header)
+        finally:
+            recorder.stop()
+            self._active = False
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            if always_save or elapsed_ms >= settings.PROFILE_SLOW_MS:
+                # Rendering and writing the dump is blocking work, keep it off the event loop
+                await run_in_threadpool(_save, recorder, path)
@@ -0,0 +1,190 @@
+import copy
+from decimal import Decimal
+from typing import List, Optional, Tuple
+
+from app.config import get_settings
+from app.models.debt import CreditCard
+from app.services.calculator import _prepare_cards, _simulate, _never_pays_off
+from app.services.feasibility import analyze_feasibility
+from app.services.plan_cache import MemoryCacheBackend
+from app.services.schedule import PaymentSchedule, ZERO
+
+settings = get_settings()
+
+# Last computed plan per user id, least recently used users dropped first.
+# Plans live in the worker that built them; any other worker simply
+# computes its own on the next request. Each keeps its schedule as
+# PaymentSchedule columns rather than response models.
+_plans = MemoryCacheBackend(settings.REPLAN_MAX_USERS, settings.REPLAN_TTL_SECONDS)
+
+
+def _drain(simulation) -> dict:
+    """Run a simulation generator to the end, returning its totals."""
+    while True:
+        try:
+            next(simulation)
+        except StopIteration as stop:
+            return stop.value
+
+
+def _run_plan(cards: List[dict], monthly_payment: Decimal, schedule: PaymentSchedule, start_month: int = 0) -> dict:
+    """Simulate already-ordered cards month by month into `schedule`, returning the totals."""
+    return _drain(_simulate(cards, monthly_payment, "monthly", 0, None, schedule, start_month))
+
+
+def _full_plan(credit_cards: List[CreditCard], strategy: str, monthly_payment: Decimal) -> dict:
+    cards = _prepare_cards(credit_cards, strategy, monthly_payment)
+    inputs = copy.deepcopy(cards)
+    schedule = PaymentSchedule(cards)
+    if analyze_feasibility(credit_cards, monthly_payment) == "never_pays_off":
+        totals = _drain(_never_pays_off())
+    else:
+        totals = _run_plan(cards, monthly_payment, schedule)
+    return {
+        "strategy": strategy,
+        "monthly_payment": monthly_payment,
+        "cards": inputs,
+        "schedule": schedule,
+        "totals": totals
+    }
+
+
+def _changed_balances(previous: dict, credit_cards: List[CreditCard]) -> Optional[List[tuple]]:
+    """
+    List (position, new balance) for cards whose balance moved since the last plan.
+    Returns None if anything other than balances changed.
+    """
+    incoming = {str(card.id): card for card in credit_cards}
+    if len(incoming) != len(previous["cards"]) or len(incoming) != len(credit_cards):
+        return None
+
+    changes = []
+    for position, card in enumerate(previous["cards"]):
+        current = incoming.get(str(card["id"]))
+        if current is None:
+            return None
+        if (current.name, current.interest_rate, current.min_payment) != (
+            card["name"], card["interest_rate"], card["min_payment"]
+        ):
+            return None
+        if current.balance != card["balance"]:
+            changes.append((position, current.balance))
+    return changes
+
+
+def _keeps_order(previous: dict, position: int, balance: Decimal) -> bool:
+    """Snowball orders by balance, so the new balance must stay strictly between its neighbours."""
+    if previous["strategy"] != "snowball":
+        return True
+    cards = previous["cards"]
+    if position > 0 and cards[position - 1]["balance"] >= balance:
+        return False
+    if position + 1 < len(cards) and cards[position + 1]["balance"] <= balance:
+        return False
+    return True
+
+
+def _replan_card(previous: dict, credit_cards: List[CreditCard], position: int, balance: Decimal) -> dict:
+    """
+    Rebuild a plan after one card's starting balance changed.
+
+    While the card neither pays off nor would under its new balance, it keeps
+    paying exactly what it paid before and the leftover budget reaching the
+    other cards is unchanged. Those months are copied from the previous
+    schedule's columns with only the changed card's interest and balance
+    rewritten; the simulation restarts at the first month where that no
+    longer holds.
+    """
+    monthly_payment = previous["monthly_payment"]
+    if analyze_feasibility(credit_cards, monthly_payment) == "never_pays_off":
+        # Nothing to reuse or simulate, see _full_plan
+        return _full_plan(credit_cards, previous["strategy"], monthly_payment)
+    old = previous["schedule"]
+    width = len(old.card_ids)
+    monthly_interest_rate = previous["cards"][position]["interest_rate"] / Decimal("100") / Decimal("12")
+    starting_balance = balance
+
+    cards = copy.deepcopy(previous["cards"])
+    schedule = PaymentSchedule(cards)
+    reused = 0
+    for row in range(len(old)):
+        start, end = row * width, (row + 1) * width
+        old_payment, old_balance = old.payments[start + position], old.balances[start + position]
+        if old_balance <= ZERO:
+            break
+        interest = balance * monthly_interest_rate
+        if balance + interest - old_payment <= ZERO:
+            break
+        balance = balance + interest - old_payment
+
+        interest_row, balance_row = old.interest[start:end], old.balances[start:end]
+        interest_row[position], balance_row[position] = interest, balance
+        schedule.append(
+            old.months[row],
+            old.payments[start:end],
+            interest_row,
+            balance_row,
+            old.total_payments[row],
+            old.remaining_debts[row] - old_balance + balance
+        )
+        reused += 1
+
+    # Resume from the balances at the end of the reused months
+    if reused:
+        for resumed, resumed_balance in zip(cards, schedule.balances[(reused - 1) * width:]):
+            resumed["balance"] = resumed_balance
+    cards[position]["balance"] = balance
+    totals = _run_plan(cards, monthly_payment, schedule, start_month=reused)
+    totals["total_interest_paid"] += sum(schedule.interest[:reused * width], ZERO)
+    totals["total_amount_paid"] += sum(schedule.total_payments[:reused], ZERO)
+
+    inputs = copy.deepcopy(previous["cards"])
+    inputs[position]["balance"] = starting_balance
+    return {
+        "strategy": previous["strategy"],
+        "monthly_payment": monthly_payment,
+        "cards": inputs,
+        "schedule": schedule,
+        "totals": totals
+    }
+
+
+def get_user_plan(
+    user_id: int,
+    credit_cards: List[CreditCard],
+    strategy: str,
+    monthly_payment: Decimal
+) -> Tuple[PaymentSchedule, dict]:
+    """
+    Return the user's payoff plan as (schedule, totals), reusing their last
+    computed plan when possible.
+
+    Unchanged inputs return the stored plan as is; a balance change on a
+    single card is replanned from the first affected month; anything else
+    is computed from scratch. The schedule is shared with the stored plan,
+    so callers must not modify it.
+    """
+    previous = _plans.get(str(user_id))
+
+    plan = None
+    if previous and previous["strategy"] == strategy and previous["monthly_payment"] == monthly_payment:
+        changes = _changed_balances(previous, credit_cards)
+        if changes == []:
+            return previous["schedule"], previous["totals"]
+        if changes is not None and len(changes) == 1:
+            position, balance = changes[0]
+            if balance > Decimal("0") and _keeps_order(previous, position, balance):
+                plan = _replan_card(previous, credit_cards, position, balance)
+
+    if plan is None:
+        plan = _full_plan(credit_cards, strategy, monthly_payment)
+
+    # A plan cut short by the time budget depends on server load, so it is not reused
+    if plan["totals"]["stop_reason"] != "time_budget":
+        _plans.set(str(user_id), plan)
+    return plan["schedule"], plan["totals"]
+
+
+def invalidate_user_plan(user_id: int):
+    """Drop the stored plan, e.g. after a card was added or removed."""
+    _plans.delete(str(user_id))
@@ -0,0 +1,137 @@
+from decimal import Decimal
+from typing import Iterator, List
+
+from app.models.debt import CardPayment, PaymentStep
+
+ZERO = Decimal("0")
+
+
+class PaymentSchedule:
+    """
+    Columnar record of a payoff schedule.
+
+    Each step adds one row of per-card payment, interest and remaining
+    balance to flat step x card columns, plus the step's month, total
+    payment and remaining debt. Paid-off cards just repeat a shared zero,
+    so a month costs a few list slots rather than a PaymentStep and one
+    CardPayment per card. Models are only built when a caller asks for them.
+
+    With `cents=True` the columns hold integer cents (from the cents
+    engine) and are turned into Decimal or float amounts on the way out.
+    """
+
+    __slots__ = (
+        "card_ids",
+        "card_names",
+        "months",
+        "total_payments",
+        "remaining_debts",
+        "payments",
+        "interest",
+        "balances",
+        "cents"
+    )
+
+    def __init__(self, cards: List[dict], cents: bool = False):
+        self.card_ids = [card["id"] for card in cards]
+        self.card_names = [card["name"] for card in cards]
+        self.months = []
+        self.total_payments = []
+        self.remaining_debts = []
+        self.payments = []
+        self.interest = []
+        self.balances = []
+        self.cents = cents
+
+    def __len__(self) -> int:
+        return len(self.months)
+
+    def append(
+        self,
+        month: int,
+        payments: List[Decimal],
+        interest: List[Decimal],
+        balances: List[Decimal],
+        total_payment: Decimal,
+        remaining_debt: Decimal
+    ):
+        self.months.append(month)
+        self.total_payments.append(total_payment)
+        self.remaining_debts.append(remaining_debt)
+        self.payments.extend(payments)
+        self.interest.extend(interest)
+        zero = 0 if self.cents else ZERO
+        self.balances.extend(balance if balance > zero else zero for balance in balances)
+
+    def clear(self):
+        del self.months[:], self.total_payments[:], self.remaining_debts[:]
+        del self.payments[:], self.interest[:], self.balances[:]
+
+    def _amount(self, value) -> Decimal:
+        return Decimal(value).scaleb(-2) if self.cents else value
+
+    def _float(self, value) -> float:
+        return value / 100 if self.cents else float(value)
+
+    def step(self, index: int) -> PaymentStep:
+        """Build the PaymentStep for one recorded row."""
+        width = len(self.card_ids)
+        start = index * width
+        return PaymentStep(
+            month=self.months[index],
+            card_payments=[
+                CardPayment(
+                    card_id=self.card_ids[i],
+                    card_name=self.card_names[i],
+                    payment=self._amount(self.payments[start + i]),
+                    interest_paid=self._amount(self.interest[start + i]),
+                    remaining_balance=self._amount(self.balances[start + i])
+                )
+                for i in range(width)
+            ],
+            total_payment=self._amount(self.total_payments[index]),
+            remaining_debt=self._amount(self.remaining_debts[index])
+        )
+
+    def __iter__(self) -> Iterator[PaymentStep]:
+        return (self.step(index) for index in range(len(self)))
+
+    def to_steps(self) -> List[PaymentStep]:
+        return list(self)
+
+    def to_dict(self, totals: dict) -> dict:
+        """
+        The schedule and plan totals in DebtPayoffResponse's JSON layout, as
+        plain ints, floats and strings built straight from the columns.
+        """
+        to_float = self._float
+        width = len(self.card_ids)
+        cards = list(enumerate(zip(self.card_ids, self.card_names)))
+        payments, interest, balances = self.payments, self.interest, self.balances
+        return {
+            "total_months": totals["total_months"],
+            "total_interest_paid": float(totals["total_interest_paid"]),
+            "total_amount_paid": float(totals["total_amount_paid"]),
+            "monthly_breakdown": [
+                {
+                    "month": month,
+                    "card_payments": [
+                        {
+                            "card_id": card_id,
+                            "card_name": card_name,
+                            "payment": to_float(payments[start + i]),
+                            "interest_paid": to_float(interest[start + i]),
+                            "remaining_balance": to_float(balances[start + i])
+                        }
+                        for i, (card_id, card_name) in cards
+                    ],
+                    "total_payment": to_float(total_payment),
+                    "remaining_debt": to_float(remaining_debt)
+                }
+                for start, month, total_payment, remaining_debt in zip(
+                    range(0, len(self) * width, width), self.months, self.total_payments, self.remaining_debts
+                )
+            ],
+            "pays_off": totals["pays_off"],
+            "stop_reason": totals["stop_reason"]
+        }
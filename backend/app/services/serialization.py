@@ -0,0 +1,122 @@
+import gzip
+import json
+from decimal import Decimal
+from typing import Any, Optional, Tuple
+
+from fastapi import Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
+
+from app.config import get_settings
+
+try:
+    import orjson
+except ImportError:  # Optional, falls back to the standard json module
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # Optional, only needed for application/msgpack responses
+    msgpack = None
+
+try:
+    import brotli
+except ImportError:  # Optional, only needed for br content encoding
+    brotli = None
+
+settings = get_settings()
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+MSGPACK_MEDIA_TYPES = (MSGPACK_MEDIA_TYPE, "application/x-msgpack")
+
+
+def _default(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps_json(data: Any) -> bytes:
+    """
+    Compact UTF-8 JSON, through orjson when it is installed.
+
+    Non-string dict keys (e.g. card ids) become strings, as json.dumps does.
+    """
+    if orjson is not None:
+        return orjson.dumps(data, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, default=_default, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def dumps_msgpack(data: Any) -> bytes:
+    return msgpack.packb(data, default=_default)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson (or compact json) instead of json.dumps."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps_json(content)
+
+
+def _accepts(header: str, token: str) -> bool:
+    """Whether a comma-separated Accept-style header lists `token` without q=0."""
+    for part in header.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        if name.strip() == token:
+            return params.replace(" ", "") not in ("q=0", "q=0.0")
+    return False
+
+
+def negotiate(request: Request) -> Tuple[str, Optional[str]]:
+    """
+    Pick the (media type, content encoding) for a response from the request's
+    Accept and Accept-Encoding headers, among what is installed.
+    """
+    accept = request.headers.get("accept", "")
+    media_type = JSON_MEDIA_TYPE
+    if msgpack is not None and any(_accepts(accept, name) for name in MSGPACK_MEDIA_TYPES):
+        media_type = MSGPACK_MEDIA_TYPE
+
+    accept_encoding = request.headers.get("accept-encoding", "")
+    encoding = None
+    if brotli is not None and _accepts(accept_encoding, "br"):
+        encoding = "br"
+    elif _accepts(accept_encoding, "gzip"):
+        encoding = "gzip"
+    return media_type, encoding
+
+
+def encode(data: Any, media_type: str) -> bytes:
+    if media_type == MSGPACK_MEDIA_TYPE:
+        return dumps_msgpack(data)
+    return dumps_json(data)
+
+
+def encode_model(model: BaseModel, media_type: str) -> bytes:
+    if media_type == MSGPACK_MEDIA_TYPE:
+        return dumps_msgpack(model.model_dump(mode="json"))
+    # pydantic-core writes JSON directly, without an intermediate dict
+    return model.model_dump_json().encode()
+
+
+def compress(body: bytes, encoding: Optional[str]) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=settings.RESPONSE_BROTLI_QUALITY)
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=settings.RESPONSE_GZIP_LEVEL)
+    return body
+
+
+async def negotiated_response(body: bytes, media_type: str, encoding: Optional[str]) -> Response:
+    """
+    Response for an already encoded body, compressed with `encoding` when
+    it is large enough to be worth it. Compression runs in the thread pool
+    so multi-megabyte plans don't stall the event loop.
+    """
+    headers = {"Vary": "Accept, Accept-Encoding"}
+    if encoding is not None and len(body) >= settings.RESPONSE_COMPRESS_MIN_BYTES:
+        body = await run_in_threadpool(compress, body, encoding)
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type=media_type, headers=headers)
@@ -0,0 +1,96 @@
+from typing import List, Optional
+from decimal import Decimal
+from app.models.debt import CreditCard, StrategySpec, StrategySummary, DebtCompareResponse
+from app.services.calculator import MAX_PLAN_MONTHS
+from app.services.event_calculator import card_states, sort_cards, plan_within_limits, summarize_segments, payoff_order
+from app.services.feasibility import analyze_feasibility
+
+
+def _order_for(cards: List[dict], spec: StrategySpec) -> List[dict]:
+    """Fresh card states in the payoff order described by a strategy spec."""
+    if spec.strategy in ("avalanche", "snowball"):
+        return sort_cards(cards, spec.strategy)
+
+    if spec.strategy == "custom":
+        by_id = {card["id"]: card for card in cards}
+        unknown = [card_id for card_id in spec.card_order if card_id not in by_id]
+        if unknown:
+            raise ValueError(f"Unknown card id(s) in card_order: {unknown}")
+        listed = [by_id[card_id] for card_id in dict.fromkeys(spec.card_order)]
+        # Cards left out of the custom order follow in avalanche order
+        rest = sort_cards([card for card in cards if card["id"] not in set(spec.card_order)], "avalanche")
+        return [dict(card) for card in listed] + rest
+
+    # hybrid: clear small balances first, then highest rate
+    small = [card for card in cards if card["balance"] < spec.balance_threshold]
+    large = [card for card in cards if card["balance"] >= spec.balance_threshold]
+    return sort_cards(small, "snowball") + sort_cards(large, "avalanche")
+
+
+def _label(spec: StrategySpec) -> str:
+    if spec.name:
+        return spec.name
+    if spec.strategy == "hybrid":
+        return f"hybrid<{spec.balance_threshold}"
+    return spec.strategy
+
+
+def _best(results: List[StrategySummary], key) -> Optional[str]:
+    """Name of the best strategy by `key` among those that pay off."""
+    paying_off = [result for result in results if result.pays_off]
+    return min(paying_off, key=key).name if paying_off else None
+
+
+def compare_strategies(
+    credit_cards: List[CreditCard],
+    monthly_payment: Decimal,
+    strategies: List[StrategySpec]
+) -> DebtCompareResponse:
+    """
+    Summarize several payoff strategies over one card set.
+
+    Card states (including the monthly rates) are prepared once and shared by
+    every strategy; each strategy is then planned with the event engine, so
+    the whole comparison costs O(strategies x cards²). A strategy that does
+    not pay off within MAX_PLAN_MONTHS is reported with pays_off False and
+    its stop_reason rather than failing the comparison.
+
+    Parameters:
+    -----------
+    credit_cards : List[CreditCard]
+        List of credit cards with their details
+    monthly_payment : Decimal
+        Total monthly payment amount
+    strategies : List[StrategySpec]
+        Strategies to compare: avalanche, snowball, a custom card order, or
+        hybrid (cards under a balance threshold first, then highest rate)
+
+    Returns:
+    --------
+    DebtCompareResponse
+        Side-by-side totals plus the best strategy by months and by interest
+        among those that pay off
+    """
+    cards = card_states(credit_cards)
+    total_min_payment = sum(card["min_payment"] for card in cards)
+    if monthly_payment < total_min_payment:
+        raise ValueError(f"Monthly payment must be at least {total_min_payment}")
+
+    never_pays_off = analyze_feasibility(credit_cards, monthly_payment) == "never_pays_off"
+    results = []
+    for spec in strategies:
+        ordered = _order_for(cards, spec)
+        segments, stop_reason = plan_within_limits(ordered, monthly_payment, MAX_PLAN_MONTHS, never_pays_off)
+        results.append(StrategySummary(
+            name=_label(spec),
+            payoff_order=payoff_order(ordered, segments),
+            pays_off=stop_reason is None,
+            stop_reason=stop_reason,
+            **summarize_segments(segments, monthly_payment)
+        ))
+
+    return DebtCompareResponse(
+        results=results,
+        fewest_months=_best(results, lambda r: (r.total_months, r.total_interest_paid)),
+        least_interest=_best(results, lambda r: (r.total_interest_paid, r.total_months))
+    )
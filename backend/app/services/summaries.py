@@ -0,0 +1,241 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import Optional
+
+from sqlalchemy import Integer, cast, delete, extract, func, insert, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.models.db_models import Expense, ExpenseMonthlyTotal, Payment, PaymentMonthlyTotal
+from app.services.increments import increment_row
+
+settings = get_settings()
+
+
+def parse_month(month: Optional[str]) -> Optional[int]:
+    """'YYYY-MM' to a year * 100 + month period."""
+    if month is None:
+        return None
+    year, number = month.split("-")
+    return int(year) * 100 + int(number)
+
+
+def format_period(period: int) -> str:
+    return f"{period // 100:04d}-{period % 100:02d}"
+
+
+def _period_column(date_column):
+    return cast(extract("year", date_column) * 100 + extract("month", date_column), Integer)
+
+
+def _period_of(date: datetime, date_column):
+    """
+    The period of one row's date, computed by the database like _period_column.
+
+    Python's date.month and the database's extract() can disagree about the
+    month near midnight when timezones are involved, so rollup rows are
+    keyed the same way the summaries and rebuilds group the raw rows.
+    """
+    return _period_column(literal(date, date_column.type))
+
+
+def _filter_periods(query, period, start: Optional[int], end: Optional[int]):
+    if start is not None:
+        query = query.where(period >= start)
+    if end is not None:
+        query = query.where(period <= end)
+    return query
+
+
+async def record_expense(db: AsyncSession, expense: Expense, sign: int = 1):
+    """
+    Fold an inserted (sign=1) or deleted (sign=-1) expense into the monthly totals.
+
+    Does nothing while SUMMARY_FROM_ROLLUPS is off; rebuild_rollups.py
+    brings the tables up to date when it is turned on.
+    """
+    if not settings.SUMMARY_FROM_ROLLUPS:
+        return
+    await increment_row(
+        db,
+        ExpenseMonthlyTotal,
+        {
+            "user_id": expense.user_id,
+            "period": _period_of(expense.date, Expense.date),
+            "credit_card_id": expense.credit_card_id or 0
+        },
+        {"count": sign, "total": sign * Decimal(str(expense.amount))}
+    )
+
+
+async def record_payment(db: AsyncSession, payment: Payment, sign: int = 1):
+    """Fold an inserted (sign=1) or deleted (sign=-1) payment into the monthly totals, like record_expense."""
+    if not settings.SUMMARY_FROM_ROLLUPS:
+        return
+    await increment_row(
+        db,
+        PaymentMonthlyTotal,
+        {
+            "user_id": payment.user_id,
+            "period": _period_of(payment.payment_date, Payment.payment_date),
+            "credit_card_id": payment.credit_card_id or 0
+        },
+        {
+            "count": sign,
+            "amount": sign * payment.amount,
+            "interest": sign * payment.interest_portion,
+            "principal": sign * payment.principal_portion
+        }
+    )
+
+
+async def rebuild_rollups(db: AsyncSession, user_id: Optional[int] = None):
+    """
+    Recompute a user's (or, with no user_id, everyone's) monthly totals from
+    the ledger with INSERT ... SELECT.
+
+    Used when rows change in bulk (an import, or a deleted card unlinking
+    its expenses and payments), which is rare enough not to patch row by
+    row, and by rebuild_rollups.py when SUMMARY_FROM_ROLLUPS is turned on.
+    Does nothing while the setting is off.
+    """
+    if not settings.SUMMARY_FROM_ROLLUPS:
+        return
+    expense_totals, payment_totals = delete(ExpenseMonthlyTotal), delete(PaymentMonthlyTotal)
+    expense_rows, payment_rows = [Expense.date.isnot(None)], [Payment.payment_date.isnot(None)]
+    if user_id is not None:
+        expense_totals = expense_totals.where(ExpenseMonthlyTotal.user_id == user_id)
+        payment_totals = payment_totals.where(PaymentMonthlyTotal.user_id == user_id)
+        expense_rows.append(Expense.user_id == user_id)
+        payment_rows.append(Payment.user_id == user_id)
+    await db.execute(expense_totals)
+    await db.execute(payment_totals)
+    await db.flush()
+
+    expense_period = _period_column(Expense.date)
+    expense_card = func.coalesce(Expense.credit_card_id, 0)
+    await db.execute(insert(ExpenseMonthlyTotal).from_select(
+        ["user_id", "period", "credit_card_id", "count", "total"],
+        select(Expense.user_id, expense_period, expense_card, func.count(), func.sum(Expense.amount))
+        .where(*expense_rows)
+        .group_by(Expense.user_id, expense_period, expense_card)
+    ))
+
+    payment_period = _period_column(Payment.payment_date)
+    payment_card = func.coalesce(Payment.credit_card_id, 0)
+    await db.execute(insert(PaymentMonthlyTotal).from_select(
+        ["user_id", "period", "credit_card_id", "count", "amount", "interest", "principal"],
+        select(
+            Payment.user_id,
+            payment_period,
+            payment_card,
+            func.count(),
+            func.coalesce(func.sum(Payment.amount), 0),
+            func.coalesce(func.sum(Payment.interest_portion), 0),
+            func.coalesce(func.sum(Payment.principal_portion), 0)
+        )
+        .where(*payment_rows)
+        .group_by(Payment.user_id, payment_period, payment_card)
+    ))
+
+
+async def expense_summary(
+    db: AsyncSession,
+    user_id: int,
+    start: Optional[int] = None,
+    end: Optional[int] = None,
+    credit_card_id: Optional[int] = None
+) -> dict:
+    """
+    Expense count and total per month and card, aggregated by the database.
+
+    Cash expenses are reported with a credit_card_id of None.
+    """
+    if settings.SUMMARY_FROM_ROLLUPS:
+        period = ExpenseMonthlyTotal.period
+        card = ExpenseMonthlyTotal.credit_card_id
+        query = select(
+            period, card, func.sum(ExpenseMonthlyTotal.count), func.sum(ExpenseMonthlyTotal.total)
+        ).where(ExpenseMonthlyTotal.user_id == user_id, ExpenseMonthlyTotal.count > 0)
+    else:
+        period = _period_column(Expense.date)
+        card = func.coalesce(Expense.credit_card_id, 0)
+        query = select(
+            period, card, func.count(), func.sum(Expense.amount)
+        ).where(Expense.user_id == user_id, Expense.date.isnot(None))
+
+    query = _filter_periods(query, period, start, end)
+    if credit_card_id is not None:
+        query = query.where(card == credit_card_id)
+    rows = (await db.execute(query.group_by(period, card).order_by(period, card))).all()
+
+    months = [
+        {
+            "month": format_period(row_period),
+            "credit_card_id": row_card or None,
+            "count": count,
+            "total": float(total)
+        }
+        for row_period, row_card, count, total in rows
+    ]
+    return {
+        "months": months,
+        "count": sum(month["count"] for month in months),
+        "total": sum(month["total"] for month in months)
+    }
+
+
+async def payment_summary(
+    db: AsyncSession,
+    user_id: int,
+    start: Optional[int] = None,
+    end: Optional[int] = None,
+    credit_card_id: Optional[int] = None
+) -> dict:
+    """Payment count, amount and interest/principal split per month and card, aggregated by the database."""
+    if settings.SUMMARY_FROM_ROLLUPS:
+        period = PaymentMonthlyTotal.period
+        card = PaymentMonthlyTotal.credit_card_id
+        query = select(
+            period,
+            card,
+            func.sum(PaymentMonthlyTotal.count),
+            func.sum(PaymentMonthlyTotal.amount),
+            func.sum(PaymentMonthlyTotal.interest),
+            func.sum(PaymentMonthlyTotal.principal)
+        ).where(PaymentMonthlyTotal.user_id == user_id, PaymentMonthlyTotal.count > 0)
+    else:
+        period = _period_column(Payment.payment_date)
+        card = func.coalesce(Payment.credit_card_id, 0)
+        query = select(
+            period,
+            card,
+            func.count(),
+            func.sum(Payment.amount),
+            func.sum(Payment.interest_portion),
+            func.sum(Payment.principal_portion)
+        ).where(Payment.user_id == user_id, Payment.payment_date.isnot(None))
+
+    query = _filter_periods(query, period, start, end)
+    if credit_card_id is not None:
+        query = query.where(card == credit_card_id)
+    rows = (await db.execute(query.group_by(period, card).order_by(period, card))).all()
+
+    months = [
+        {
+            "month": format_period(row_period),
+            "credit_card_id": row_card or None,
+            "count": count,
+            "amount": amount or 0.0,
+            "interest_portion": interest or 0.0,
+            "principal_portion": principal or 0.0
+        }
+        for row_period, row_card, count, amount, interest, principal in rows
+    ]
+    return {
+        "months": months,
+        "count": sum(month["count"] for month in months),
+        "amount": sum(month["amount"] for month in months),
+        "interest_portion": sum(month["interest_portion"] for month in months),
+        "principal_portion": sum(month["principal_portion"] for month in months)
+    }
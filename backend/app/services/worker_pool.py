@@ -0,0 +1,66 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.config import get_settings
+
+settings = get_settings()
+
+
+class PoolSaturatedError(Exception):
+    """Raised when more calculations are in flight than the queue allows."""
+
+
+class CalculationPool:
+    """
+    Bounded process pool for CPU-bound payoff calculations.
+
+    Keeps heavy plans off the asyncio event loop (and off the GIL) so that
+    light endpoints stay responsive, and rejects new work once `max_pending`
+    calculations are already running or queued.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.pending = 0
+        self.rejected = 0
+        self._executor = None
+
+    def _get_executor(self):
+        # Created lazily so every uvicorn worker forks its own pool
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    async def run(self, fn, *args, **kwargs):
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise PoolSaturatedError("Too many calculations in progress, try again shortly")
+
+        self.pending += 1
+        try:
+            if self.max_workers == 0:
+                return await run_in_threadpool(fn, *args, **kwargs)
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), partial(fn, *args, **kwargs))
+        finally:
+            self.pending -= 1
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.max_workers,
+            "pending": self.pending,
+            "max_pending": self.max_pending,
+            "rejected": self.rejected
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+calculation_pool = CalculationPool(settings.CALC_POOL_SIZE, settings.CALC_QUEUE_LIMIT)
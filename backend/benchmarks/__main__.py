@@ -0,0 +1,166 @@
+"""
+Benchmark runner.
+
+    python -m benchmarks run [--suite calculator|memory|serialization|http|auth|load|all] [--quick] [--repeat N] [--output results.json]
+    python -m benchmarks compare BASELINE CURRENT [--threshold 0.2] [--metric min_ms]
+    python -m benchmarks check [--baseline benchmarks/baselines/baseline.json] [--threshold 0.2] [--repeat N]
+
+Run from the backend directory. `check` runs the suites and compares them
+with a stored baseline, exiting with status 1 on a regression. Baseline
+times are scaled by how fast a fixed calibration workload ran just before
+each benchmark, here and when the baseline was recorded.
+
+Timings only compare on the machine that recorded them, so baselines are
+not committed: record one on the base commit, then check the change
+against it on the same machine.
+"""
+import argparse
+import os
+import sys
+
+from benchmarks.harness import (
+    MEMORY_METRIC,
+    TIME_METRICS,
+    compare_results,
+    environment_differences,
+    format_comparison,
+    load_environment,
+    load_results,
+    primary_metric,
+    save_results
+)
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baselines", "baseline.json")
+DEFAULT_THRESHOLD = 0.2
+SUITES = ["calculator", "memory", "serialization", "http", "auth", "load", "all"]
+
+
+def run_suites(suite: str, quick: bool, repeat: int = 1) -> dict:
+    """Run the suites `repeat` times, keeping each benchmark's fastest pass."""
+    results = {}
+    if suite in ("http", "auth", "load", "all"):
+        # Before the calculator suite imports the app and its settings are read
+        from benchmarks import endpoints
+        endpoints.prepare()
+    for _ in range(repeat):
+        current = {}
+        if suite in ("calculator", "all"):
+            from benchmarks import calculator
+            current.update(calculator.run(quick))
+        if suite in ("memory", "all"):
+            from benchmarks import memory
+            current.update(memory.run(quick))
+        if suite in ("serialization", "all"):
+            from benchmarks import serialization
+            current.update(serialization.run(quick))
+        if suite in ("http", "all"):
+            from benchmarks import endpoints
+            current.update(endpoints.run(quick))
+        if suite in ("auth", "all"):
+            from benchmarks import auth
+            current.update(auth.run(quick))
+        if suite in ("load", "all"):
+            from benchmarks import load
+            current.update(load.run(quick))
+        for name, result in current.items():
+            metric = primary_metric(result)
+            if name not in results or result[metric] < results[name][metric]:
+                results[name] = result
+    return results
+
+
+def _print_results(results: dict):
+    width = max(len(name) for name in results)
+    for name, result in sorted(results.items()):
+        if MEMORY_METRIC in result:
+            print(f"{name:<{width}}  peak {result[MEMORY_METRIC]:>11.1f} KiB")
+            continue
+        extra = ""
+        if "queries" in result:
+            extra = f"  {result['queries']} queries"
+        elif "bytes" in result:
+            extra = f"  {result['bytes']} bytes"
+        elif "throughput_rps" in result:
+            extra = f"  p95 {result['p95_ms']:>9.3f} ms  {result['throughput_rps']:>8.1f} req/s  {result['errors']} errors"
+        print(f"{name:<{width}}  median {result['median_ms']:>9.3f} ms  min {result['min_ms']:>9.3f} ms{extra}")
+
+
+def _report(rows: list) -> int:
+    print(format_comparison(rows))
+    regressed = [row["name"] for row in rows if row["status"] == "regressed"]
+    if regressed:
+        print(f"\n{len(regressed)} regression(s): {', '.join(regressed)}")
+        return 1
+    print("\nNo regressions.")
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Run benchmarks and optionally save them as JSON")
+    run.add_argument("--suite", choices=SUITES, default="all")
+    run.add_argument("--quick", action="store_true", help="Fewer rounds and portfolios, same inputs")
+    run.add_argument("--output", help="Write results to this JSON file (e.g. a new baseline)")
+    run.add_argument("--repeat", type=int, default=1, help="Passes to run, keeping the fastest of each")
+
+    compare = commands.add_parser("compare", help="Compare two saved result files")
+    compare.add_argument("baseline")
+    compare.add_argument("current")
+
+    check = commands.add_parser("check", help="Run benchmarks and compare them with a baseline")
+    check.add_argument("--baseline", default=DEFAULT_BASELINE)
+    check.add_argument("--suite", choices=SUITES, default="all")
+    check.add_argument("--quick", action="store_true")
+    check.add_argument("--output", help="Also save this run's results")
+    check.add_argument("--repeat", type=int, default=1)
+
+    for command in (compare, check):
+        command.add_argument(
+            "--threshold", type=float, default=DEFAULT_THRESHOLD,
+            help="Allowed slowdown as a fraction (0.2 = 20%%)"
+        )
+        command.add_argument("--metric", choices=TIME_METRICS, default=TIME_METRICS[0])
+
+    args = parser.parse_args(argv)
+
+    if args.command == "compare":
+        rows = compare_results(load_results(args.baseline), load_results(args.current), args.threshold, args.metric)
+        return _report(rows)
+
+    if args.command == "check":
+        if not os.path.exists(args.baseline):
+            print(
+                f"No baseline at {args.baseline}. Record one on the base commit first:\n"
+                f"  python -m benchmarks run --repeat {args.repeat} --output {args.baseline}",
+                file=sys.stderr
+            )
+            return 2
+        differences = environment_differences(load_environment(args.baseline))
+        if differences:
+            print(
+                f"Warning: the baseline was recorded with a different {', '.join(differences)}; "
+                "timings are not comparable across machines.",
+                file=sys.stderr
+            )
+
+    results = run_suites(args.suite, args.quick, args.repeat)
+    if args.output:
+        save_results(results, args.output)
+    if args.command == "run":
+        _print_results(results)
+        return 0
+
+    baseline = {
+        name: result
+        for name, result in load_results(args.baseline).items()
+        if args.suite == "all" or name.startswith(f"{args.suite}/")
+        # --quick runs a subset of the portfolios, don't report the rest as missing
+        if not args.quick or name in results
+    }
+    return _report(compare_results(baseline, results, args.threshold, args.metric))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
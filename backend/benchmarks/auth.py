@@ -0,0 +1,86 @@
+import asyncio
+import time
+from typing import Dict
+
+from benchmarks.harness import calibrate, measure_async, summarize_latencies
+from benchmarks.load import run_client
+
+# Concurrent clients logging in at once, and logins each client sends one after another
+LOGIN_CLIENTS = (1, 8)
+LOGINS_PER_CLIENT = 10
+QUICK_LOGINS_PER_CLIENT = 4
+
+EMAIL = "auth-bench@example.com"
+PASSWORD = "benchmark"
+
+
+async def _run(quick: bool) -> Dict[str, dict]:
+    import httpx
+    from app.config import get_settings
+    from app.database import async_engine
+    from app.main import app
+    from app.services.auth import invalidate_cached_user
+    from tests.query_counter import count_queries
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        await client.post("/register", json={"email": EMAIL, "password": PASSWORD})
+        credentials = {"username": EMAIL, "password": PASSWORD}
+        token = (await client.post("/token", data=credentials)).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        user_id = int((await client.get("/users/me", headers=headers)).json()["id"])
+
+        results = {}
+        count = QUICK_LOGINS_PER_CLIENT if quick else LOGINS_PER_CLIENT
+        for clients in LOGIN_CLIENTS:
+            calibration_ms = calibrate()
+            latencies = []
+            start = time.perf_counter()
+            errors = await asyncio.gather(*(
+                run_client(client.request, [("POST", "/token", {"data": credentials})], count, i, latencies) for i in range(clients)
+            ))
+            elapsed = time.perf_counter() - start
+            result = summarize_latencies(latencies, calibration_ms)
+            result.update({
+                "clients": clients,
+                "errors": sum(errors),
+                "throughput_rps": round(len(latencies) / elapsed, 2),
+                "bcrypt_rounds": get_settings().BCRYPT_ROUNDS
+            })
+            results[f"auth/login/{clients}clients"] = result
+
+        async def cached():
+            response = await client.get("/users/me", headers=headers)
+            response.raise_for_status()
+
+        async def uncached():
+            invalidate_cached_user(user_id)
+            await cached()
+
+        for name, fn in (("cached-user", cached), ("user-lookup", uncached)):
+            result = await measure_async(fn, 30 if quick else 100)
+            with count_queries() as queries:
+                await fn()
+            result["queries"] = queries.count
+            results[f"auth/request/{name}"] = result
+
+    await async_engine.dispose()
+    return results
+
+
+def run(quick: bool = False) -> Dict[str, dict]:
+    """
+    Login throughput and per-request authentication cost, keyed 'auth/...'.
+
+    'login' sends POST /token from concurrent clients, so the bcrypt
+    thread pool's throughput shows up in req/s. The hash cost is
+    BCRYPT_ROUNDS, which the scratch setup lowers to 4; set it in the
+    environment (e.g. BCRYPT_ROUNDS=12) to measure the production cost.
+    'request' times an authenticated GET /users/me with the user in the
+    auth cache and with the cache dropped first, so the token's user is
+    read from the database.
+    """
+    from benchmarks import endpoints
+
+    endpoints.prepare()
+    return asyncio.run(_run(quick))
@@ -0,0 +1,92 @@
+from decimal import Decimal
+from typing import Callable, Dict, List
+
+from app.services.batch_calculator import calculate_debt_payoff_batch
+from app.services.calculator import calculate_debt_payoff, payoff_schedule
+from app.services.cents_calculator import payoff_schedule_cents
+from app.services.event_calculator import calculate_debt_payoff_events
+from app.services.optimizer import optimize_allocation
+from app.services.serialization import dumps_json
+from benchmarks.harness import measure
+from benchmarks.portfolios import generate_portfolio
+
+STRATEGIES = ("avalanche", "snowball")
+OBJECTIVES = ("interest", "months")
+
+# (cards, apr profile, budget) portfolios every strategy is run against
+PORTFOLIOS = [
+    (5, "uniform", "moderate"),
+    (20, "clustered", "tight"),
+    (20, "promo", "aggressive"),
+    (50, "uniform", "tight")
+]
+QUICK_PORTFOLIOS = PORTFOLIOS[:2]
+
+# Monthly payment levels per portfolio for the batch engine and the per-request loop it replaces
+BATCH_LEVELS = 40
+QUICK_BATCH_LEVELS = 10
+
+
+def _schedule_json(credit_cards, strategy, monthly_payment) -> bytes:
+    """The /debt/calculate body: columnar schedule straight to JSON."""
+    schedule, totals = payoff_schedule(credit_cards, strategy, monthly_payment)
+    return dumps_json(schedule.to_dict(totals))
+
+
+def payment_levels(monthly_payment: Decimal, levels: int) -> List[Decimal]:
+    """`levels` budgets from the portfolio's own up to three times it."""
+    return [(monthly_payment * (1 + Decimal(2 * i) / levels)).quantize(Decimal("0.01")) for i in range(levels)]
+
+
+def cases(credit_cards, strategy, monthly_payment) -> Dict[str, Callable[[], object]]:
+    """The engine calls benchmarked for one portfolio and strategy, by case name."""
+    return {
+        "calculate_debt_payoff": lambda: calculate_debt_payoff(credit_cards, strategy, monthly_payment),
+        "schedule_json": lambda: _schedule_json(credit_cards, strategy, monthly_payment),
+        "cents": lambda: payoff_schedule_cents(credit_cards, strategy, monthly_payment),
+        "event_summary": lambda: calculate_debt_payoff_events(
+            credit_cards, strategy, monthly_payment, include_breakdown=False
+        )
+    }
+
+
+def run(quick: bool = False) -> Dict[str, dict]:
+    """
+    Microbenchmarks of the payoff engines, keyed 'calculator/<what>/<strategy>/<portfolio>'.
+
+    calculate_debt_payoff builds the full model response; the other cases
+    time the /debt/calculate JSON body, the cents engine and the event
+    engine's summary on the same inputs. 'batch' runs a range of monthly
+    payments through calculate_debt_payoff_batch and 'batch_loop' the same
+    payments one calculate_debt_payoff summary at a time. 'optimize' times
+    optimize_allocation, keyed by objective in place of the strategy.
+    """
+    rounds = 5 if quick else 15
+    results = {}
+    for cards, apr, budget in QUICK_PORTFOLIOS if quick else PORTFOLIOS:
+        credit_cards, monthly_payment = generate_portfolio(cards, apr, budget)
+        label = f"{cards}cards-{apr}-{budget}"
+        for strategy in STRATEGIES:
+            months = calculate_debt_payoff(credit_cards, strategy, monthly_payment, detail="summary").total_months
+            for case, fn in cases(credit_cards, strategy, monthly_payment).items():
+                result = measure(fn, rounds)
+                result["months"] = months
+                results[f"calculator/{case}/{strategy}/{label}"] = result
+
+            levels = payment_levels(monthly_payment, QUICK_BATCH_LEVELS if quick else BATCH_LEVELS)
+            batch = {
+                "batch": lambda: calculate_debt_payoff_batch(credit_cards, strategy, levels),
+                "batch_loop": lambda: [
+                    calculate_debt_payoff(credit_cards, strategy, level, detail="summary") for level in levels
+                ]
+            }
+            for case, fn in batch.items():
+                result = measure(fn, rounds if case == "batch" else 3)
+                result["levels"] = len(levels)
+                results[f"calculator/{case}/{strategy}/{label}"] = result
+
+        for objective in OBJECTIVES:
+            result = measure(lambda: optimize_allocation(credit_cards, monthly_payment, objective), rounds)
+            result["months"] = optimize_allocation(credit_cards, monthly_payment, objective).total_months
+            results[f"calculator/optimize/{objective}/{label}"] = result
+    return results
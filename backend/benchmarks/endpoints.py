@@ -0,0 +1,177 @@
+import asyncio
+import os
+import random
+import tempfile
+from datetime import datetime, timedelta
+from typing import Dict
+
+from benchmarks.harness import measure_async
+from benchmarks.portfolios import generate_portfolio
+
+# Ledger size seeded for the listing and summary benchmarks
+SEED_CARDS = 10
+SEED_EXPENSES = 20000
+SEED_PAYMENTS = 5000
+
+# Scratch database directory and seeded user, shared by every pass in this process
+_scratch = None
+_seeded = None
+
+
+def configure_environment(database_path: str):
+    """
+    Point the app at a scratch SQLite file before it is imported.
+
+    The plan cache is switched off so /debt/calculate is measured rather
+    than served from memory, calculations run in the thread pool so no
+    worker processes are spawned, and bcrypt is cheap so seeding is fast.
+    Explicit settings in the environment win. The app reads its settings
+    once, so this has to run before any app module is imported.
+    """
+    os.environ["DATABASE_URL"] = os.getenv("BENCH_DATABASE_URL", f"sqlite:///{database_path}")
+    os.environ.setdefault("PLAN_CACHE_BACKEND", "off")
+    os.environ.setdefault("CALC_POOL_SIZE", "0")
+    os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
+
+def _expenses_csv(card_ids, rows: int) -> str:
+    rng = random.Random(rows)
+    start = datetime(2022, 1, 1)
+    lines = ["description,amount,date,credit_card_id"]
+    for i in range(rows):
+        date = start + timedelta(minutes=rng.randrange(3 * 365 * 24 * 60))
+        card = rng.choice(card_ids) if rng.random() < 0.7 else ""
+        lines.append(f"expense {i},{rng.uniform(1, 300):.2f},{date.isoformat()},{card}")
+    return "\n".join(lines) + "\n"
+
+
+def _payments_csv(card_ids, rows: int) -> str:
+    rng = random.Random(rows)
+    start = datetime(2022, 1, 1)
+    lines = ["amount,interest_portion,principal_portion,credit_card_id,payment_date"]
+    for i in range(rows):
+        date = start + timedelta(minutes=rng.randrange(3 * 365 * 24 * 60))
+        interest = rng.uniform(0, 20)
+        principal = rng.uniform(5, 200)
+        lines.append(f"{interest + principal:.2f},{interest:.2f},{principal:.2f},{rng.choice(card_ids)},{date.isoformat()}")
+    return "\n".join(lines) + "\n"
+
+
+async def _seed(client, expenses: int, payments: int) -> dict:
+    await client.post("/register", json={"email": "bench@example.com", "password": "benchmark"})
+    token = (await client.post(
+        "/token", data={"username": "bench@example.com", "password": "benchmark"}
+    )).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    credit_cards, _ = generate_portfolio(SEED_CARDS, "uniform", "moderate")
+    card_ids = []
+    for card in credit_cards:
+        response = await client.post("/debt/cards", headers=headers, params={
+            "name": card.name,
+            "balance": float(card.balance) * 100,  # Large enough that the seeded payments never clear it
+            "interest_rate": float(card.interest_rate),
+            "min_payment": float(card.min_payment)
+        })
+        card_ids.append(response.json()["id"])
+
+    csv_headers = {**headers, "Content-Type": "text/csv"}
+    for path, body in (
+        ("/expenses/import", _expenses_csv(card_ids, expenses)),
+        ("/payments/import", _payments_csv(card_ids, payments))
+    ):
+        response = await client.post(path, headers=csv_headers, content=body)
+        response.raise_for_status()
+    return {"headers": headers, "card_ids": card_ids}
+
+
+async def ensure_seeded(client) -> dict:
+    """Seed the scratch ledger on first use; auth headers and card ids of the seeded user."""
+    global _seeded
+    if _seeded is None:
+        _seeded = await _seed(client, SEED_EXPENSES, SEED_PAYMENTS)
+    return _seeded
+
+
+async def _run(quick: bool) -> Dict[str, dict]:
+    import httpx
+    from app.database import async_engine
+    from app.main import app
+    from tests.query_counter import count_queries
+
+    rounds = 10 if quick else 30
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        seeded = await ensure_seeded(client)
+        headers, card_ids = seeded["headers"], seeded["card_ids"]
+        credit_cards, monthly_payment = generate_portfolio(20, "clustered", "tight")
+        plan = {
+            "credit_cards": [card.model_dump(mode="json") for card in credit_cards],
+            "strategy": "avalanche",
+            "monthly_payment": str(monthly_payment)
+        }
+        new_expense = {
+            "description": "benchmark",
+            "amount": 12.5,
+            "date": "2024-06-01T12:00:00",
+            "credit_card_id": card_ids[0],
+            "balance_type": "credit_card"
+        }
+        new_payment = {
+            "amount": "60",
+            "interest_portion": "10",
+            "principal_portion": "50",
+            "credit_card_id": card_ids[0]
+        }
+
+        async def request(method, url, **kwargs):
+            response = await client.request(method, url, **kwargs)
+            response.raise_for_status()
+            return response
+
+        cases = {
+            "POST /debt/calculate": lambda: request("POST", "/debt/calculate", json=plan),
+            "POST /debt/calculate?detail=summary": lambda: request(
+                "POST", "/debt/calculate", json=plan, params={"detail": "summary"}
+            ),
+            "GET /expenses": lambda: request("GET", "/expenses", headers=headers, params={"limit": 100}),
+            "GET /expenses/summary": lambda: request("GET", "/expenses/summary", headers=headers),
+            "POST /expenses/expenses": lambda: request("POST", "/expenses/expenses", headers=headers, json=new_expense),
+            "GET /payments/": lambda: request("GET", "/payments/", headers=headers, params={"limit": 100}),
+            "GET /payments/summary": lambda: request("GET", "/payments/summary", headers=headers),
+            "POST /payments/": lambda: request("POST", "/payments/", headers=headers, json=new_payment)
+        }
+
+        results = {}
+        for name, fn in cases.items():
+            result = await measure_async(fn, rounds)
+            # Statements for one more request, so query budgets are tracked alongside time
+            with count_queries() as queries:
+                await fn()
+            result["queries"] = queries.count
+            results[f"http/{name}"] = result
+
+    # Pooled connections belong to this pass's event loop
+    await async_engine.dispose()
+    return results
+
+
+def prepare():
+    """Create this process's scratch database directory and configure the app for it."""
+    global _scratch
+    if _scratch is None:
+        _scratch = tempfile.TemporaryDirectory()
+        configure_environment(os.path.join(_scratch.name, "bench.db"))
+
+
+def run(quick: bool = False) -> Dict[str, dict]:
+    """
+    In-process ASGI benchmarks of the main endpoints against a seeded SQLite ledger.
+
+    Requests go through httpx's ASGI transport, so routing, validation,
+    auth, the async session and serialization are all included, with no
+    network or server process. Each result also records how many SQL
+    statements one request runs.
+    """
+    prepare()
+    return asyncio.run(_run(quick))
@@ -0,0 +1,223 @@
+import gc
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Callable, Dict, List, Optional
+
+# Timing metrics compared against a baseline; query counts are compared exactly.
+# The minimum is the default as it is the least disturbed by background load.
+TIME_METRICS = ("min_ms", "median_ms")
+# Memory benchmarks report this instead, compared without calibration scaling
+MEMORY_METRIC = "peak_kib"
+
+
+def _summarize(samples: List[float], calibration_ms: float) -> dict:
+    return {
+        "calibration_ms": calibration_ms,
+        "rounds": len(samples),
+        "min_ms": round(min(samples) * 1000, 4),
+        "median_ms": round(statistics.median(samples) * 1000, 4),
+        "mean_ms": round(statistics.fmean(samples) * 1000, 4),
+        "stdev_ms": round(statistics.stdev(samples) * 1000, 4) if len(samples) > 1 else 0.0
+    }
+
+
+def summarize_latencies(samples: List[float], calibration_ms: float) -> dict:
+    """Summary of many request latencies, with the 95th percentile as well."""
+    result = _summarize(samples, calibration_ms)
+    result["p95_ms"] = round(statistics.quantiles(samples, n=20)[-1] * 1000, 4)
+    return result
+
+
+def _time_rounds(fn: Callable[[], object], rounds: int) -> List[float]:
+    samples = []
+    for _ in range(rounds):
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            fn()
+            samples.append(time.perf_counter() - start)
+        finally:
+            gc.enable()
+    return samples
+
+
+def _calibration_work():
+    # Fixed Decimal and interpreter workload, similar in kind to the calculator's inner loop
+    total = Decimal("0")
+    rate = Decimal("0.0175")
+    for i in range(5000):
+        total += (total + Decimal(i)) * rate
+    return total
+
+
+def calibrate() -> float:
+    """
+    Speed of this machine right now, as the best time of a fixed workload in ms.
+
+    Every benchmark is calibrated just before it runs, and comparisons scale
+    the baseline by the ratio of the two calibrations, so a slower or busier
+    machine (or moment) is not reported as a code regression.
+    """
+    return round(min(_time_rounds(_calibration_work, 5)) * 1000, 4)
+
+
+def measure(fn: Callable[[], object], rounds: int, warmup: int = 1) -> dict:
+    """Time `rounds` calls of fn after `warmup` untimed ones, with the GC paused during each call."""
+    calibration_ms = calibrate()
+    for _ in range(warmup):
+        fn()
+    return _summarize(_time_rounds(fn, rounds), calibration_ms)
+
+
+async def measure_async(fn: Callable[[], object], rounds: int, warmup: int = 1) -> dict:
+    """measure() for a coroutine function; the GC is paused during each call as well."""
+    calibration_ms = calibrate()
+    for _ in range(warmup):
+        await fn()
+    samples = []
+    for _ in range(rounds):
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            await fn()
+            samples.append(time.perf_counter() - start)
+        finally:
+            gc.enable()
+    return _summarize(samples, calibration_ms)
+
+
+def measure_memory(fn: Callable[[], object], warmup: int = 1) -> dict:
+    """Peak memory traced during one call of fn, after `warmup` untraced calls to fill caches."""
+    for _ in range(warmup):
+        fn()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {MEMORY_METRIC: round(peak / 1024, 1)}
+
+
+def primary_metric(result: dict, metric: str = TIME_METRICS[0]) -> str:
+    """The metric a result is judged on: `metric` for timings, MEMORY_METRIC for memory benchmarks."""
+    return MEMORY_METRIC if MEMORY_METRIC in result else metric
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment() -> dict:
+    return {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "commit": _git_commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds")
+    }
+
+
+def save_results(results: Dict[str, dict], path: str):
+    with open(path, "w") as f:
+        json.dump({"environment": environment(), "results": results}, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def load_results(path: str) -> Dict[str, dict]:
+    with open(path) as f:
+        return json.load(f)["results"]
+
+
+def load_environment(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f).get("environment", {})
+
+
+def environment_differences(recorded: dict) -> List[str]:
+    """The interpreter and machine fields where `recorded` differs from this process's environment()."""
+    current = environment()
+    return [key for key in ("python", "platform", "machine") if recorded.get(key) != current[key]]
+
+
+def compare_results(
+    baseline: Dict[str, dict],
+    current: Dict[str, dict],
+    threshold: float,
+    metric: str = "min_ms"
+) -> List[dict]:
+    """
+    Compare two result sets benchmark by benchmark.
+
+    Each baseline time is first scaled by the ratio of the two runs'
+    calibrations for that benchmark. A benchmark regresses when `metric`
+    (MEMORY_METRIC for memory benchmarks, unscaled) grew by more than
+    `threshold` (0.2 = 20%) or when it now runs more SQL queries than the
+    baseline. Benchmarks present on only one side are reported but never
+    fail.
+    """
+    rows = []
+    for name in sorted(set(baseline) | set(current)):
+        before, after = baseline.get(name), current.get(name)
+        if before is None or after is None:
+            rows.append({"name": name, "status": "new" if before is None else "missing"})
+            continue
+        key = primary_metric(after, metric)
+        scale = 1.0
+        if before.get("calibration_ms") and after.get("calibration_ms"):
+            scale = after["calibration_ms"] / before["calibration_ms"]
+        expected = before[key] * scale
+        change = after[key] / expected - 1 if expected else 0.0
+        status = "ok"
+        if change > threshold:
+            status = "regressed"
+        elif change < -threshold:
+            status = "improved"
+        if after.get("queries") is not None and before.get("queries") is not None:
+            if after["queries"] > before["queries"]:
+                status = "regressed"
+        rows.append({
+            "name": name,
+            "status": status,
+            "metric": key,
+            "before": expected,
+            "after": after[key],
+            "change": change,
+            "queries_before": before.get("queries"),
+            "queries_after": after.get("queries")
+        })
+    return rows
+
+
+def format_comparison(rows: List[dict]) -> str:
+    width = max([len(row["name"]) for row in rows] + [9])
+    lines = [
+        f"{'benchmark':<{width}}  {'metric':>9}  {'baseline':>12}  {'after':>10}  {'change':>8}  {'queries':>9}  status"
+    ]
+    for row in rows:
+        if "before" not in row:
+            lines.append(f"{row['name']:<{width}}  {'':>9}  {'':>12}  {'':>10}  {'':>8}  {'':>9}  {row['status']}")
+            continue
+        queries = ""
+        if row["queries_after"] is not None:
+            queries = f"{row['queries_before']}->{row['queries_after']}"
+        lines.append(
+            f"{row['name']:<{width}}  {row['metric']:>9}  {row['before']:>12.3f}  {row['after']:>10.3f}  "
+            f"{row['change']:>+7.1%}  {queries:>9}  {row['status']}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,119 @@
+import asyncio
+import time
+from typing import Dict, List
+
+from benchmarks.harness import calibrate, summarize_latencies
+from benchmarks.portfolios import generate_portfolio
+
+# Concurrent clients per run, and requests each client sends one after another
+CLIENTS = (1, 8, 32)
+QUICK_CLIENTS = (1, 8)
+REQUESTS_PER_CLIENT = 40
+QUICK_REQUESTS_PER_CLIENT = 15
+
+
+def pool_configurations(url: str) -> Dict[str, dict]:
+    """
+    Engine options compared by the suite: the app's DB_POOL_* settings and,
+    when they differ, SQLAlchemy's defaults for the driver (for PostgreSQL a
+    QueuePool of 5 connections plus 10 overflow, without pre-ping or
+    recycling), which is what the app ran with before those settings.
+    """
+    from app.database import _pool_options
+
+    tuned = _pool_options(url)
+    if not tuned:
+        # SQLite keeps its default pool, so there is nothing to compare
+        return {"tuned-pool": tuned}
+    return {"default-pool": {}, "tuned-pool": tuned}
+
+
+async def run_client(send, requests: List[tuple], count: int, offset: int, latencies: List[float]) -> int:
+    """Send `count` requests from the mix in turn, recording each latency; returns the number of errors."""
+    errors = 0
+    for i in range(count):
+        method, url, kwargs = requests[(offset + i) % len(requests)]
+        start = time.perf_counter()
+        response = await send(method, url, **kwargs)
+        latencies.append(time.perf_counter() - start)
+        if response.status_code >= 400:
+            errors += 1
+    return errors
+
+
+async def _run(quick: bool) -> Dict[str, dict]:
+    import httpx
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+    from app.database import ASYNC_DATABASE_URL, async_engine, get_async_db
+    from app.main import app
+    from benchmarks.endpoints import ensure_seeded
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        seeded = await ensure_seeded(client)
+        headers = seeded["headers"]
+        credit_cards, monthly_payment = generate_portfolio(20, "clustered", "tight")
+        plan = {
+            "credit_cards": [card.model_dump(mode="json") for card in credit_cards],
+            "strategy": "avalanche",
+            "monthly_payment": str(monthly_payment)
+        }
+        # Read-heavy mix of database-bound and calculation requests
+        requests = [
+            ("GET", "/expenses", {"headers": headers, "params": {"limit": 50}}),
+            ("GET", "/payments/", {"headers": headers, "params": {"limit": 50}}),
+            ("GET", "/debt/cards", {"headers": headers}),
+            ("GET", "/payments/summary", {"headers": headers}),
+            ("POST", "/debt/calculate", {"json": plan, "params": {"detail": "summary"}})
+        ]
+
+        results = {}
+        for name, options in pool_configurations(ASYNC_DATABASE_URL).items():
+            engine = create_async_engine(ASYNC_DATABASE_URL, **options)
+            sessions = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+
+            async def get_db():
+                async with sessions() as db:
+                    yield db
+
+            app.dependency_overrides[get_async_db] = get_db
+            try:
+                for clients in QUICK_CLIENTS if quick else CLIENTS:
+                    count = QUICK_REQUESTS_PER_CLIENT if quick else REQUESTS_PER_CLIENT
+                    calibration_ms = calibrate()
+                    latencies = []
+                    start = time.perf_counter()
+                    errors = await asyncio.gather(*(
+                        run_client(client.request, requests, count, i, latencies) for i in range(clients)
+                    ))
+                    elapsed = time.perf_counter() - start
+                    result = summarize_latencies(latencies, calibration_ms)
+                    result.update({
+                        "clients": clients,
+                        "errors": sum(errors),
+                        "throughput_rps": round(len(latencies) / elapsed, 2)
+                    })
+                    results[f"load/{name}/{clients}clients"] = result
+            finally:
+                app.dependency_overrides.pop(get_async_db, None)
+                await engine.dispose()
+
+    await async_engine.dispose()
+    return results
+
+
+def run(quick: bool = False) -> Dict[str, dict]:
+    """
+    Throughput and latency of concurrent clients, keyed 'load/<pool>/<clients>'.
+
+    Each client sends a fixed number of requests from a read-heavy mix
+    through the in-process ASGI transport, all clients at once, against the
+    ledger seeded for the http suite. The run is repeated with each pool
+    configuration by swapping the session dependency for one bound to a
+    fresh engine. The pool settings don't apply to SQLite, so point
+    BENCH_DATABASE_URL at PostgreSQL to compare them.
+    """
+    from benchmarks import endpoints
+
+    endpoints.prepare()
+    return asyncio.run(_run(quick))
@@ -0,0 +1,23 @@
+from typing import Dict
+
+from benchmarks.calculator import PORTFOLIOS, QUICK_PORTFOLIOS, STRATEGIES, cases
+from benchmarks.harness import measure_memory
+from benchmarks.portfolios import generate_portfolio
+
+
+def run(quick: bool = False) -> Dict[str, dict]:
+    """
+    Peak memory of the calculator cases, keyed 'memory/<what>/<strategy>/<portfolio>'.
+
+    Same engines and portfolios as the calculator suite, each call traced
+    once with tracemalloc. Peaks are allocation counts rather than timings,
+    so they don't depend on the machine and are compared without scaling.
+    """
+    results = {}
+    for cards, apr, budget in QUICK_PORTFOLIOS if quick else PORTFOLIOS:
+        credit_cards, monthly_payment = generate_portfolio(cards, apr, budget)
+        label = f"{cards}cards-{apr}-{budget}"
+        for strategy in STRATEGIES:
+            for case, fn in cases(credit_cards, strategy, monthly_payment).items():
+                results[f"memory/{case}/{strategy}/{label}"] = measure_memory(fn)
+    return results
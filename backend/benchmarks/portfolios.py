@@ -0,0 +1,74 @@
+import random
+from decimal import Decimal, ROUND_HALF_UP
+from typing import List, Tuple
+
+from app.models.debt import CreditCard
+
+CENT = Decimal("0.01")
+
+# APR distributions, each a function of the generator's Random
+APR_PROFILES = {
+    # Anywhere in the usual card range
+    "uniform": lambda rng: rng.uniform(12, 29.99),
+    # Most cards close to the market average
+    "clustered": lambda rng: min(max(rng.gauss(22, 3), 8), 34.99),
+    # A third of the cards on a low promotional rate, the rest expensive
+    "promo": lambda rng: rng.uniform(0.99, 4.99) if rng.random() < 0.33 else rng.uniform(20, 29.99)
+}
+
+# Monthly budget as a multiple of the summed minimum payments
+BUDGETS = {
+    "tight": Decimal("1.05"),
+    "moderate": Decimal("1.5"),
+    "aggressive": Decimal("3")
+}
+
+
+def _money(value: float) -> Decimal:
+    return Decimal(str(value)).quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+def generate_portfolio(
+    cards: int,
+    apr: str = "uniform",
+    budget: str = "moderate",
+    seed: int = 0
+) -> Tuple[List[CreditCard], Decimal]:
+    """
+    A reproducible synthetic set of cards and a monthly payment for it.
+
+    Balances are log-normal (median around $3,000). Each minimum payment
+    is 1% of the balance plus a month of interest, with a $25 floor, as
+    issuers commonly set it, so every card amortizes on its own.
+
+    Parameters:
+    -----------
+    cards : int
+        Number of credit cards
+    apr : str
+        One of APR_PROFILES
+    budget : str
+        One of BUDGETS
+    seed : int
+        Seed for the portfolio's own random generator
+
+    Returns:
+    --------
+    Tuple[List[CreditCard], Decimal]
+        The cards and the total monthly payment
+    """
+    rng = random.Random(f"{cards}-{apr}-{budget}-{seed}")
+    portfolio = []
+    for i in range(cards):
+        balance = _money(min(max(rng.lognormvariate(8, 0.8), 200), 40000))
+        rate = _money(APR_PROFILES[apr](rng))
+        min_payment = max(_money(float(balance) * (float(rate) / 1200 + 0.01)), Decimal("25.00"))
+        portfolio.append(CreditCard(
+            id=i + 1,
+            name=f"Card {i + 1}",
+            balance=balance,
+            interest_rate=rate,
+            min_payment=min_payment
+        ))
+    total_min_payment = sum(card.min_payment for card in portfolio)
+    return portfolio, (total_min_payment * BUDGETS[budget]).quantize(CENT, rounding=ROUND_HALF_UP)
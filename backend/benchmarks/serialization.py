@@ -0,0 +1,43 @@
+from typing import Dict
+
+from app.services.calculator import payoff_schedule
+from app.services.serialization import compress, dumps_json, dumps_msgpack
+from benchmarks.harness import measure
+from benchmarks.portfolios import generate_portfolio
+
+# (cards, apr profile, budget) portfolios whose /debt/calculate bodies are encoded
+PORTFOLIOS = [
+    (5, "uniform", "moderate"),
+    (20, "clustered", "tight")
+]
+QUICK_PORTFOLIOS = PORTFOLIOS[:1]
+
+FORMATS = {"json": dumps_json, "msgpack": dumps_msgpack}
+ENCODINGS = (None, "gzip", "br")
+
+
+def run(quick: bool = False) -> Dict[str, dict]:
+    """
+    Encode time and bytes on the wire for /debt/calculate bodies, keyed
+    'serialization/<format>-<encoding>/<portfolio>'.
+
+    Each case turns the same month-by-month schedule dict into JSON or
+    MessagePack and applies the content encoding, as negotiated_response
+    does; 'bytes' is the size of the body that would be sent.
+    """
+    rounds = 5 if quick else 15
+    results = {}
+    for cards, apr, budget in QUICK_PORTFOLIOS if quick else PORTFOLIOS:
+        credit_cards, monthly_payment = generate_portfolio(cards, apr, budget)
+        schedule, totals = payoff_schedule(credit_cards, "avalanche", monthly_payment)
+        data = schedule.to_dict(totals)
+        label = f"{cards}cards-{apr}-{budget}"
+        for name, dumps in FORMATS.items():
+            for encoding in ENCODINGS:
+                def encode():
+                    return compress(dumps(data), encoding)
+
+                result = measure(encode, rounds)
+                result["bytes"] = len(encode())
+                results[f"serialization/{name}-{encoding or 'identity'}/{label}"] = result
+    return results
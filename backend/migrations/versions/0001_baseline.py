@@ -0,0 +1,91 @@
+"""Baseline schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17 12:00:00
+
+Databases created earlier by Base.metadata.create_all already have these
+tables, so each one is only created when missing.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if "users" not in existing:
+        op.create_table(
+            "users",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("email", sa.String()),
+            sa.Column("hashed_password", sa.String()),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        )
+        op.create_index("ix_users_id", "users", ["id"])
+        op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    if "credit_cards" not in existing:
+        op.create_table(
+            "credit_cards",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("name", sa.String()),
+            sa.Column("balance", sa.Float()),
+            sa.Column("interest_rate", sa.Float()),
+            sa.Column("min_payment", sa.Float()),
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id")),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.Column("is_paid_off", sa.Boolean()),
+        )
+        op.create_index("ix_credit_cards_id", "credit_cards", ["id"])
+
+    if "payments" not in existing:
+        op.create_table(
+            "payments",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("amount", sa.Float()),
+            sa.Column("payment_date", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.Column("interest_portion", sa.Float()),
+            sa.Column("principal_portion", sa.Float()),
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id")),
+            sa.Column("credit_card_id", sa.Integer(), sa.ForeignKey("credit_cards.id")),
+        )
+        op.create_index("ix_payments_id", "payments", ["id"])
+
+    if "expenses" not in existing:
+        op.create_table(
+            "expenses",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("description", sa.String()),
+            sa.Column("amount", sa.Numeric(10, 2)),
+            sa.Column("date", sa.DateTime()),
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id")),
+            sa.Column("credit_card_id", sa.Integer(), sa.ForeignKey("credit_cards.id"), nullable=True),
+        )
+        op.create_index("ix_expenses_id", "expenses", ["id"])
+
+    if "user_balances" not in existing:
+        op.create_table(
+            "user_balances",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), unique=True),
+            sa.Column("balance", sa.Numeric(10, 2)),
+        )
+        op.create_index("ix_user_balances_id", "user_balances", ["id"])
+
+
+def downgrade() -> None:
+    op.drop_table("user_balances")
+    op.drop_table("expenses")
+    op.drop_table("payments")
+    op.drop_table("credit_cards")
+    op.drop_table("users")
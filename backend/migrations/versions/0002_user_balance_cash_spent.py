@@ -0,0 +1,47 @@
+"""Running total of cash expenses on user_balances
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 12:10:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    columns = {column["name"] for column in sa.inspect(op.get_bind()).get_columns("user_balances")}
+    if "cash_spent" not in columns:
+        with op.batch_alter_table("user_balances") as batch_op:
+            batch_op.add_column(
+                sa.Column("cash_spent", sa.Numeric(10, 2), nullable=False, server_default="0")
+            )
+
+    # Backfill from the ledger; users with cash expenses but no balance row get one
+    op.execute(
+        "UPDATE user_balances SET cash_spent = COALESCE(("
+        "SELECT SUM(expenses.amount) FROM expenses "
+        "WHERE expenses.user_id = user_balances.user_id AND expenses.credit_card_id IS NULL"
+        "), 0)"
+    )
+    op.execute(
+        "INSERT INTO user_balances (user_id, balance, cash_spent) "
+        "SELECT expenses.user_id, 0, SUM(expenses.amount) FROM expenses "
+        "WHERE expenses.credit_card_id IS NULL AND NOT EXISTS ("
+        "SELECT 1 FROM user_balances WHERE user_balances.user_id = expenses.user_id"
+        ") GROUP BY expenses.user_id"
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("user_balances") as batch_op:
+        batch_op.drop_column("cash_spent")
@@ -0,0 +1,35 @@
+"""Composite indexes for paginated expense and payment listings
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 12:20:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ("ix_payments_user_id_payment_date", "payments", ["user_id", "payment_date"]),
+    ("ix_payments_user_id_credit_card_id_payment_date", "payments", ["user_id", "credit_card_id", "payment_date"]),
+    ("ix_expenses_user_id_date", "expenses", ["user_id", "date"]),
+    ("ix_expenses_user_id_credit_card_id_date", "expenses", ["user_id", "credit_card_id", "date"]),
+]
+
+
+def upgrade() -> None:
+    # Tables made by create_all may already carry these indexes
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    for name, table, _ in INDEXES:
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,127 @@
+"""Monthly expense and payment rollup tables
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 12:30:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+expenses = sa.table(
+    "expenses",
+    sa.column("user_id", sa.Integer),
+    sa.column("date", sa.DateTime),
+    sa.column("credit_card_id", sa.Integer),
+    sa.column("amount", sa.Numeric(10, 2)),
+)
+payments = sa.table(
+    "payments",
+    sa.column("user_id", sa.Integer),
+    sa.column("payment_date", sa.DateTime),
+    sa.column("credit_card_id", sa.Integer),
+    sa.column("amount", sa.Float),
+    sa.column("interest_portion", sa.Float),
+    sa.column("principal_portion", sa.Float),
+)
+
+
+expense_totals = sa.table(
+    "expense_monthly_totals",
+    sa.column("user_id", sa.Integer),
+    sa.column("period", sa.Integer),
+    sa.column("credit_card_id", sa.Integer),
+    sa.column("count", sa.Integer),
+    sa.column("total", sa.Numeric(12, 2)),
+)
+payment_totals = sa.table(
+    "payment_monthly_totals",
+    sa.column("user_id", sa.Integer),
+    sa.column("period", sa.Integer),
+    sa.column("credit_card_id", sa.Integer),
+    sa.column("count", sa.Integer),
+    sa.column("amount", sa.Float),
+    sa.column("interest", sa.Float),
+    sa.column("principal", sa.Float),
+)
+
+
+def _period(date_column):
+    return sa.cast(sa.extract("year", date_column) * 100 + sa.extract("month", date_column), sa.Integer)
+
+
+def upgrade() -> None:
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if "expense_monthly_totals" not in existing:
+        op.create_table(
+            "expense_monthly_totals",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+            sa.Column("period", sa.Integer(), nullable=False),
+            sa.Column("credit_card_id", sa.Integer(), nullable=False),
+            sa.Column("count", sa.Integer(), nullable=False),
+            sa.Column("total", sa.Numeric(12, 2), nullable=False),
+            sa.UniqueConstraint("user_id", "period", "credit_card_id", name="uq_expense_monthly_totals"),
+        )
+        op.create_index("ix_expense_monthly_totals_id", "expense_monthly_totals", ["id"])
+
+    if "payment_monthly_totals" not in existing:
+        op.create_table(
+            "payment_monthly_totals",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+            sa.Column("period", sa.Integer(), nullable=False),
+            sa.Column("credit_card_id", sa.Integer(), nullable=False),
+            sa.Column("count", sa.Integer(), nullable=False),
+            sa.Column("amount", sa.Float(), nullable=False),
+            sa.Column("interest", sa.Float(), nullable=False),
+            sa.Column("principal", sa.Float(), nullable=False),
+            sa.UniqueConstraint("user_id", "period", "credit_card_id", name="uq_payment_monthly_totals"),
+        )
+        op.create_index("ix_payment_monthly_totals_id", "payment_monthly_totals", ["id"])
+
+    # Rebuild the rollups from the ledger even when the tables already existed: an app
+    # started before this migration creates them empty through create_all and then
+    # only adds the rows written since, so their contents can't be trusted
+    op.execute(expense_totals.delete())
+    period = _period(expenses.c.date)
+    card = sa.func.coalesce(expenses.c.credit_card_id, 0)
+    op.execute(expense_totals.insert().from_select(
+        ["user_id", "period", "credit_card_id", "count", "total"],
+        sa.select(expenses.c.user_id, period, card, sa.func.count(), sa.func.sum(expenses.c.amount))
+        .where(expenses.c.date.isnot(None))
+        .group_by(expenses.c.user_id, period, card)
+    ))
+
+    op.execute(payment_totals.delete())
+    period = _period(payments.c.payment_date)
+    card = sa.func.coalesce(payments.c.credit_card_id, 0)
+    op.execute(payment_totals.insert().from_select(
+        ["user_id", "period", "credit_card_id", "count", "amount", "interest", "principal"],
+        sa.select(
+            payments.c.user_id,
+            period,
+            card,
+            sa.func.count(),
+            sa.func.coalesce(sa.func.sum(payments.c.amount), 0),
+            sa.func.coalesce(sa.func.sum(payments.c.interest_portion), 0),
+            sa.func.coalesce(sa.func.sum(payments.c.principal_portion), 0),
+        )
+        .where(payments.c.payment_date.isnot(None))
+        .group_by(payments.c.user_id, period, card)
+    ))
+
+
+def downgrade() -> None:
+    op.drop_table("payment_monthly_totals")
+    op.drop_table("expense_monthly_totals")
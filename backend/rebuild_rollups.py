@@ -0,0 +1,23 @@
+import asyncio
+import sys
+from app.config import get_settings
+from app.database import AsyncSessionLocal, async_engine
+from app.services.summaries import rebuild_rollups
+
+async def _rebuild():
+    async with AsyncSessionLocal() as db:
+        await rebuild_rollups(db)
+        await db.commit()
+    await async_engine.dispose()
+
+def main():
+    # The rollups are only kept up to date while summaries are served from them
+    if not get_settings().SUMMARY_FROM_ROLLUPS:
+        print("SUMMARY_FROM_ROLLUPS is off, nothing to rebuild.")
+        return 1
+    asyncio.run(_rebuild())
+    print("Monthly rollups rebuilt from the ledger.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,21 @@
+import sys
+from app.database import SessionLocal
+from app.services.cash_ledger import reconcile_cash_totals
+
+def reconcile_balances(fix: bool = False):
+    # Verify the running cash totals against the expenses ledger
+    with SessionLocal() as db:
+        mismatches = reconcile_cash_totals(db, fix=fix)
+
+    for mismatch in mismatches:
+        print(f"user {mismatch['user_id']}: stored {mismatch['stored']}, ledger {mismatch['expected']}")
+    if not mismatches:
+        print("All cash totals match the ledger.")
+    elif fix:
+        print(f"Fixed {len(mismatches)} cash total(s).")
+    return mismatches
+
+if __name__ == "__main__":
+    fix = "--fix" in sys.argv
+    mismatches = reconcile_balances(fix=fix)
+    sys.exit(1 if mismatches and not fix else 0)
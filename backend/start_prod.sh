@@ -5,6 +5,17 @@ source venv/bin/activate
 
 # Set environment variables
 export ENV=production
+# Share the payoff result cache between the uvicorn workers
+export PLAN_CACHE_BACKEND=sqlite
+
+# Bring the database schema up to date
+alembic upgrade head
+
+# Summaries read the monthly rollups only when SUMMARY_FROM_ROLLUPS is on, and the
+# rollups are only maintained while it is, so rebuild them before serving from them
+if [ "${SUMMARY_FROM_ROLLUPS,,}" = "true" ]; then
+    python rebuild_rollups.py
+fi
 
 # Start the server with production settings
 uvicorn app.main:app --host 0.0.0.0 --port 8000 --workers 4 --log-level info 
\ No newline at end of file
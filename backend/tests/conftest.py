@@ -0,0 +1,34 @@
+import os
+import tempfile
+import uuid
+
+# Settings are read once at import time, so configure them before the app loads
+_scratch = tempfile.mkdtemp(prefix="debt-planner-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_scratch, 'test.db')}"
+os.environ["PLAN_CACHE_BACKEND"] = "off"
+os.environ["CALC_POOL_SIZE"] = "0"
+os.environ["BCRYPT_ROUNDS"] = "4"
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.database import Base, engine
+from app.main import app
+
+
+@pytest.fixture(scope="session")
+def client():
+    Base.metadata.create_all(bind=engine)
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def headers(client):
+    """Auth headers for a new user; one request is made so the user is already cached."""
+    email = f"{uuid.uuid4().hex}@example.com"
+    client.post("/register", json={"email": email, "password": "password"})
+    token = client.post("/token", data={"username": email, "password": "password"}).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    client.get("/debt/cards", headers=headers)
+    return headers
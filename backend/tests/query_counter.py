@@ -0,0 +1,47 @@
+from contextlib import contextmanager
+from typing import List
+
+from sqlalchemy import event
+
+from app.database import async_engine
+
+
+class QueryCounter:
+    """SQL statements seen while a count_queries block was active."""
+
+    def __init__(self):
+        self.statements: List[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def assert_at_most(self, limit: int):
+        if self.count > limit:
+            listing = "\n".join(f"  {statement}" for statement in self.statements)
+            raise AssertionError(f"Expected at most {limit} queries, ran {self.count}:\n{listing}")
+
+
+@contextmanager
+def count_queries(engine=None):
+    """
+    Count the statements an engine (the async app engine by default) executes inside the block.
+
+        with count_queries() as queries:
+            client.delete(f"/payments/{payment_id}", headers=headers)
+        queries.assert_at_most(3)
+
+    The listener is engine-wide, so run it without concurrent traffic.
+    """
+    target = engine if engine is not None else async_engine
+    sync_engine = getattr(target, "sync_engine", target)
+    counter = QueryCounter()
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        counter.statements.append(statement)
+
+    event.listen(sync_engine, "before_cursor_execute", record)
+    try:
+        yield counter
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", record)
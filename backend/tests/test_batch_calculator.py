@@ -0,0 +1,34 @@
+from decimal import Decimal
+
+import pytest
+
+from app.services.batch_calculator import calculate_debt_payoff_batch
+from app.services.calculator import calculate_debt_payoff
+from benchmarks.calculator import payment_levels
+from benchmarks.portfolios import generate_portfolio
+from tests.test_feasibility import PLANS
+
+
+@pytest.mark.parametrize("strategy", ["avalanche", "snowball"])
+def test_batch_matches_per_request_totals(strategy):
+    credit_cards, monthly_payment = generate_portfolio(8, "promo", "tight")
+    levels = payment_levels(monthly_payment, 12)
+    batch = calculate_debt_payoff_batch(credit_cards, strategy, levels)
+
+    for level, scenario in zip(levels, batch.scenarios):
+        plan = calculate_debt_payoff(credit_cards, strategy, level, detail="summary")
+        assert scenario.pays_off and scenario.stop_reason is None
+        assert scenario.total_months == plan.total_months
+        assert abs(scenario.total_interest_paid - plan.total_interest_paid) <= Decimal("0.01")
+
+
+@pytest.mark.parametrize("plan", PLANS)
+def test_scenarios_that_do_not_pay_off_are_reported(plan):
+    cards, monthly_payment, expected = PLANS[plan]
+    # One scenario on the plan's budget and one that clears everything, in one batch
+    payments = [Decimal(monthly_payment), 2 * sum(card.balance for card in cards)]
+    batch = calculate_debt_payoff_batch(cards, "avalanche", payments)
+
+    assert batch.scenarios[0].stop_reason == expected
+    assert batch.scenarios[0].pays_off is (expected is None)
+    assert batch.scenarios[1].pays_off and batch.scenarios[1].total_months == 1
@@ -0,0 +1,39 @@
+from decimal import Decimal
+
+import pytest
+
+from app.services.calculator import payoff_schedule
+from app.services.cents_calculator import ROUNDING_MODES, payoff_schedule_cents
+from benchmarks.portfolios import APR_PROFILES, BUDGETS, generate_portfolio
+
+CENT = Decimal("0.01")
+
+PORTFOLIOS = [
+    (cards, apr, budget, seed)
+    for cards in (1, 4, 10)
+    for apr in APR_PROFILES
+    for budget in BUDGETS
+    for seed in range(2)
+]
+
+
+@pytest.mark.parametrize("rounding", ROUNDING_MODES)
+@pytest.mark.parametrize("strategy", ["avalanche", "snowball"])
+def test_cents_engine_tracks_decimal_engine(rounding, strategy):
+    # Rounding moves each card's balance by under a cent a month, so the
+    # remaining debt may drift by at most a cent per card per month
+    for cards, apr, budget, seed in PORTFOLIOS:
+        credit_cards, monthly_payment = generate_portfolio(cards, apr, budget, seed)
+        exact, exact_totals = payoff_schedule(credit_cards, strategy, monthly_payment)
+        cents, cents_totals = payoff_schedule_cents(credit_cards, strategy, monthly_payment, rounding)
+
+        assert cents_totals["total_months"] == exact_totals["total_months"]
+        for exact_step, cents_step in zip(exact.to_steps(), cents.to_steps()):
+            drift = abs(exact_step.remaining_debt - cents_step.remaining_debt)
+            assert drift <= CENT * cents_step.month * cards, (cards, apr, budget, seed, cents_step.month)
+
+
+def test_unknown_rounding_mode():
+    credit_cards, monthly_payment = generate_portfolio(2)
+    with pytest.raises(ValueError):
+        payoff_schedule_cents(credit_cards, "avalanche", monthly_payment, "half_down")
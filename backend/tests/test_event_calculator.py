@@ -0,0 +1,54 @@
+from decimal import Decimal
+
+import pytest
+
+from app.services.calculator import calculate_debt_payoff
+from app.services.event_calculator import calculate_debt_payoff_events
+from benchmarks.portfolios import APR_PROFILES, BUDGETS, generate_portfolio
+from tests.test_feasibility import PLANS
+
+CENT = Decimal("0.01")
+
+PORTFOLIOS = {
+    f"{cards}-{apr}-{budget}-{seed}": generate_portfolio(cards, apr, budget, seed)
+    for cards in (1, 3, 8)
+    for apr in APR_PROFILES
+    for budget in BUDGETS
+    for seed in range(2)
+}
+PORTFOLIOS.update({
+    name: (cards, Decimal(monthly_payment))
+    for name, (cards, monthly_payment, _) in PLANS.items()
+})
+
+
+def _close(a, b):
+    return abs(Decimal(str(a)) - Decimal(str(b))) <= CENT
+
+
+@pytest.mark.parametrize("portfolio", PORTFOLIOS)
+@pytest.mark.parametrize("strategy", ["avalanche", "snowball"])
+def test_event_engine_matches_monthly_engine(portfolio, strategy):
+    credit_cards, monthly_payment = PORTFOLIOS[portfolio]
+    monthly = calculate_debt_payoff(credit_cards, strategy, monthly_payment, offset=3, limit=6)
+    events = calculate_debt_payoff_events(
+        credit_cards, strategy, monthly_payment, include_breakdown=True, offset=3, limit=6
+    )
+
+    assert events.stop_reason == monthly.stop_reason
+    assert events.pays_off == monthly.pays_off
+    assert events.total_months == monthly.total_months
+    assert _close(events.total_interest_paid, monthly.total_interest_paid)
+    assert _close(events.total_amount_paid, monthly.total_amount_paid)
+
+    assert [step.month for step in events.monthly_breakdown] == [step.month for step in monthly.monthly_breakdown]
+    for event_step, monthly_step in zip(events.monthly_breakdown, monthly.monthly_breakdown):
+        assert _close(event_step.total_payment, monthly_step.total_payment), event_step.month
+        assert _close(event_step.remaining_debt, monthly_step.remaining_debt), event_step.month
+        assert len(event_step.card_payments) == len(monthly_step.card_payments)
+        for event_card, monthly_card in zip(event_step.card_payments, monthly_step.card_payments):
+            assert event_card.card_id == monthly_card.card_id
+            assert _close(event_card.payment, monthly_card.payment), (event_step.month, event_card.card_id)
+            assert _close(event_card.remaining_balance, monthly_card.remaining_balance), (
+                event_step.month, event_card.card_id
+            )
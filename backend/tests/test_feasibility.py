@@ -0,0 +1,81 @@
+from decimal import Decimal
+
+import pytest
+
+from app.models.debt import CreditCard
+from app.services.feasibility import analyze_feasibility
+
+
+def _card(id, balance, interest_rate, min_payment):
+    return CreditCard(
+        id=id,
+        name=f"Card {id}",
+        balance=Decimal(balance),
+        interest_rate=Decimal(interest_rate),
+        min_payment=Decimal(min_payment)
+    )
+
+
+# (cards, monthly payment, expected stop_reason) for each way a plan can end
+PLANS = {
+    "pays_off": (
+        [_card(1, "3000", "19.99", "90"), _card(2, "1200", "24.99", "40")],
+        "400",
+        None
+    ),
+    # $200 of interest a month on the first card alone, against a $150 budget
+    "interest_over_budget": (
+        [_card(1, "10000", "24", "150")],
+        "150",
+        "never_pays_off"
+    ),
+    # The second card falls behind on its minimum while the first is paid off,
+    # and by then its interest is above the whole budget
+    "stalls_after_payoff": (
+        [_card(1, "2000", "10", "100"), _card(2, "12000", "24", "150")],
+        "250",
+        "never_pays_off"
+    ),
+    # Amortizes, but over about 3,100 months
+    "beyond_max_months": (
+        [_card(1, "10000", "3", "25.01")],
+        "25.01",
+        "max_months"
+    )
+}
+
+
+def test_analyze_feasibility():
+    cards, monthly_payment, _ = PLANS["interest_over_budget"]
+    assert analyze_feasibility(cards, Decimal(monthly_payment)) == "never_pays_off"
+
+    cards, monthly_payment, _ = PLANS["pays_off"]
+    assert analyze_feasibility(cards, Decimal(monthly_payment)) == "pays_off"
+
+    # Needs the simulation: the card's own interest is under the budget
+    cards, monthly_payment, _ = PLANS["stalls_after_payoff"]
+    assert analyze_feasibility(cards, Decimal(monthly_payment)) == "unknown"
+
+
+def test_high_rate_group_over_budget():
+    # Neither card's interest reaches $300, but together at the lower rate they do
+    cards = [_card(1, "8000", "24", "100"), _card(2, "8000", "23", "100"), _card(3, "500", "5", "25")]
+    assert analyze_feasibility(cards, Decimal("300")) == "never_pays_off"
+
+
+@pytest.mark.parametrize("plan", PLANS)
+@pytest.mark.parametrize("strategy", ["avalanche", "snowball"])
+def test_stop_reason_matches_across_engines(client, plan, strategy):
+    cards, monthly_payment, expected = PLANS[plan]
+    body = {
+        "credit_cards": [card.model_dump(mode="json") for card in cards],
+        "strategy": strategy,
+        "monthly_payment": monthly_payment
+    }
+    for engine in ("monthly", "event", "cents"):
+        for detail in ("summary", "yearly", "monthly"):
+            response = client.post("/debt/calculate", json=body, params={"engine": engine, "detail": detail})
+            assert response.status_code == 200
+            plan_result = response.json()
+            assert plan_result["stop_reason"] == expected, (engine, detail)
+            assert plan_result["pays_off"] is (expected is None)
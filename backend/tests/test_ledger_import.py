@@ -0,0 +1,47 @@
+import pytest
+
+
+@pytest.fixture
+def card_id(client, headers):
+    response = client.post(
+        "/debt/cards",
+        params={"name": "Card", "balance": 100, "interest_rate": 19.9, "min_payment": 25},
+        headers=headers
+    )
+    return response.json()["id"]
+
+
+def _card_balance(client, headers, card_id):
+    cards = client.get("/debt/cards", headers=headers).json()
+    return next(card["balance"] for card in cards if int(card["id"]) == card_id)
+
+
+def test_expense_import_sums_card_deltas_exactly(client, headers, card_id):
+    rows = [
+        {"description": "Coffee", "amount": "0.10", "date": "2026-01-15T08:00:00", "credit_card_id": card_id}
+        for _ in range(30)
+    ]
+    response = client.post("/expenses/import", json=rows, headers=headers)
+    assert response.status_code == 201
+    assert _card_balance(client, headers, card_id) == 103.0
+
+
+def test_payment_import_clamps_at_zero(client, headers, card_id):
+    rows = [
+        {"credit_card_id": card_id, "amount": "70", "interest_portion": "10", "principal_portion": "60"},
+        {"credit_card_id": card_id, "amount": "70", "interest_portion": "0", "principal_portion": "70"}
+    ]
+    response = client.post("/payments/import", json=rows, headers=headers)
+    assert response.status_code == 201
+    assert _card_balance(client, headers, card_id) == 0
+
+
+def test_payment_import_rejects_negative_principal(client, headers, card_id):
+    rows = [
+        {"credit_card_id": card_id, "amount": "150", "interest_portion": "0", "principal_portion": "150"},
+        {"credit_card_id": card_id, "amount": "10", "interest_portion": "30", "principal_portion": "-20"}
+    ]
+    response = client.post("/payments/import", json=rows, headers=headers)
+    assert response.status_code == 422
+    assert [error["row"] for error in response.json()["detail"]] == [2]
+    assert _card_balance(client, headers, card_id) == 100
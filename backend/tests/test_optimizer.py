@@ -0,0 +1,56 @@
+from decimal import Decimal
+from itertools import permutations
+
+import pytest
+
+from app.models.debt import StrategySpec
+from app.services.optimizer import optimize_allocation
+from app.services.strategy_compare import compare_strategies
+from benchmarks.portfolios import APR_PROFILES, BUDGETS, generate_portfolio
+from tests.test_feasibility import _card
+
+# Decimal rounding slack between equal-rate orders, which differ around the 24th digit
+TOLERANCE = Decimal("0.000000001")
+
+PORTFOLIOS = {
+    f"{cards}-{apr}-{budget}-{seed}": generate_portfolio(cards, apr, budget, seed)
+    for cards in (2, 3, 4, 5)
+    for apr in APR_PROFILES
+    for budget in BUDGETS
+    for seed in range(2)
+}
+# Equal rates leave the order open, which the optimizer settles by swapping neighbours
+PORTFOLIOS["equal-rates"] = (
+    [
+        _card(1, "4000", "19.99", "80"),
+        _card(2, "600", "19.99", "60"),
+        _card(3, "2500", "19.99", "25"),
+        _card(4, "900", "9.99", "25")
+    ],
+    Decimal("260")
+)
+
+
+def _every_order(credit_cards, monthly_payment):
+    specs = [
+        StrategySpec(strategy="custom", card_order=list(order))
+        for order in permutations(card.id for card in credit_cards)
+    ]
+    return compare_strategies(credit_cards, monthly_payment, specs).results
+
+
+@pytest.mark.parametrize("portfolio", PORTFOLIOS)
+@pytest.mark.parametrize("objective", ["interest", "months"])
+def test_optimizer_beats_every_order(portfolio, objective):
+    credit_cards, monthly_payment = PORTFOLIOS[portfolio]
+    best = optimize_allocation(credit_cards, monthly_payment, objective)
+    orders = [result for result in _every_order(credit_cards, monthly_payment) if result.pays_off]
+    assert best.pays_off == bool(orders)
+    if not orders:
+        return
+
+    if objective == "interest":
+        assert best.total_interest_paid <= min(result.total_interest_paid for result in orders) + TOLERANCE
+    else:
+        assert best.total_months <= min(result.total_months for result in orders)
+    assert sorted(best.card_order) == sorted(card.id for card in credit_cards)
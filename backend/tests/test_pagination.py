@@ -0,0 +1,39 @@
+def _page_through(client, url, headers, key):
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 2}
+        if cursor is not None:
+            params["cursor"] = cursor
+        page = client.get(url, params=params, headers=headers).json()
+        seen.extend(item["id"] for item in page[key])
+        cursor = page["nextCursor"]
+        if cursor is None:
+            return seen
+
+
+def test_payments_and_expenses_page_the_same_way(client, headers):
+    card_id = client.post(
+        "/debt/cards",
+        params={"name": "Card", "balance": 5000, "interest_rate": 19.9, "min_payment": 25},
+        headers=headers
+    ).json()["id"]
+    payment_ids, expense_ids = [], []
+    for day in range(1, 6):
+        payment = {"credit_card_id": card_id, "amount": 50, "interest_portion": 8, "principal_portion": 42}
+        payment_ids.append(client.post("/payments/", json=payment, headers=headers).json()["id"])
+        expense = {
+            "description": "Groceries",
+            "amount": 10,
+            "date": f"2026-01-0{day}T00:00:00",
+            "balance_type": "credit_card",
+            "credit_card_id": card_id
+        }
+        expense_ids.append(client.post("/expenses/expenses", json=expense, headers=headers).json()["expense"]["id"])
+
+    # Newest first, every row exactly once, cursor in the body
+    assert _page_through(client, "/payments/", headers, "payments") == payment_ids[::-1]
+    assert _page_through(client, f"/payments/cards/{card_id}", headers, "payments") == payment_ids[::-1]
+    assert _page_through(client, "/expenses", headers, "expenses") == expense_ids[::-1]
+
+    unpaged = client.get("/payments/", headers=headers).json()
+    assert len(unpaged["payments"]) == 5 and unpaged["nextCursor"] is None
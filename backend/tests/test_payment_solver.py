@@ -0,0 +1,52 @@
+from decimal import Decimal
+
+import pytest
+
+from app.services.calculator import calculate_debt_payoff
+from app.services.payment_solver import solve_minimum_payment
+from benchmarks.portfolios import APR_PROFILES, generate_portfolio
+from tests.test_feasibility import _card
+
+CENT = Decimal("0.01")
+
+PORTFOLIOS = {
+    f"{cards}-{apr}-{seed}": generate_portfolio(cards, apr, seed=seed)[0]
+    for cards in (1, 3, 6)
+    for apr in APR_PROFILES
+    for seed in range(2)
+}
+
+
+def _months(credit_cards, strategy, monthly_payment):
+    """Months to debt-free by the monthly engine, None if it never gets there."""
+    plan = calculate_debt_payoff(credit_cards, strategy, monthly_payment, detail="summary")
+    return plan.total_months if plan.pays_off else None
+
+
+@pytest.mark.parametrize("portfolio", PORTFOLIOS)
+@pytest.mark.parametrize("strategy", ["avalanche", "snowball"])
+@pytest.mark.parametrize("target_months", [1, 12, 60])
+def test_solved_payment_is_the_smallest_that_fits(portfolio, strategy, target_months):
+    credit_cards = PORTFOLIOS[portfolio]
+    solved = solve_minimum_payment(credit_cards, strategy, target_months)
+
+    months = _months(credit_cards, strategy, solved.monthly_payment)
+    assert months is not None and months <= target_months
+    assert solved.total_months == months
+    plan = calculate_debt_payoff(credit_cards, strategy, solved.monthly_payment, detail="summary")
+    assert abs(solved.total_interest_paid - plan.total_interest_paid) <= CENT
+
+    # A cent less either misses the target or drops below the summed minimums
+    total_min_payment = sum(card.min_payment for card in credit_cards)
+    cheaper = solved.monthly_payment - CENT
+    if cheaper >= total_min_payment:
+        months = _months(credit_cards, strategy, cheaper)
+        assert months is None or months > target_months
+
+
+def test_minimum_payments_already_fit():
+    # Paying the minimum on this card clears it in about four years
+    credit_cards = [_card(1, "1000", "12", "25")]
+    solved = solve_minimum_payment(credit_cards, "avalanche", 120)
+    assert solved.monthly_payment == Decimal("25")
+    assert solved.total_months == _months(credit_cards, "avalanche", Decimal("25"))
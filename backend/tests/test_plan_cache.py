@@ -0,0 +1,44 @@
+import asyncio
+import threading
+
+from app.services.plan_cache import MemoryCacheBackend, PlanCache, SQLiteCacheBackend
+
+
+def test_sqlite_backend_round_trips_bytes(tmp_path):
+    backend = SQLiteCacheBackend(str(tmp_path / "cache.db"), max_entries=2, ttl_seconds=60)
+    backend.set("a", b'{"total_months":12}')
+    backend.set("b", b"\x82\xa1a\x01")
+    assert backend.get("a") == b'{"total_months":12}'
+
+    # "b" is now the least recently used entry
+    backend.set("c", b"c")
+    assert backend.get("b") is None
+    assert backend.size() == 2
+
+
+def test_blocking_backend_runs_off_the_event_loop(tmp_path):
+    backend = SQLiteCacheBackend(str(tmp_path / "cache.db"), max_entries=8, ttl_seconds=60)
+    threads = []
+    get = backend.get
+
+    def recording_get(key):
+        threads.append(threading.current_thread())
+        return get(key)
+
+    backend.get = recording_get
+    cache = PlanCache(backend)
+
+    async def round_trip():
+        await cache.set_async("key", b"plan")
+        return await cache.get_async("key")
+
+    assert asyncio.run(round_trip()) == b"plan"
+    assert threads and threading.main_thread() not in threads
+    assert (cache.hits, cache.misses) == (1, 0)
+
+
+def test_memory_backend_stays_on_the_event_loop():
+    cache = PlanCache(MemoryCacheBackend(max_entries=8, ttl_seconds=60))
+    assert not cache.blocking
+    assert asyncio.run(cache.get_async("missing")) is None
+    assert cache.misses == 1
@@ -0,0 +1,49 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.config import get_settings
+from app.services.profiling import ProfilerMiddleware
+
+
+@pytest.fixture
+def profiled(tmp_path, monkeypatch):
+    settings = get_settings()
+    monkeypatch.setattr(settings, "PROFILE_MODE", "header")
+    monkeypatch.setattr(settings, "PROFILE_TOKEN", "secret")
+    monkeypatch.setattr(settings, "PROFILE_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "PROFILE_ENGINE", "cprofile")
+
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    app.add_middleware(ProfilerMiddleware)
+    with TestClient(app) as client:
+        yield client, tmp_path
+
+
+@pytest.mark.parametrize("value", [None, "1", "secre", "secret2"])
+def test_header_without_the_token_is_not_profiled(profiled, value):
+    client, directory = profiled
+    headers = {} if value is None else {"X-Profile": value}
+    response = client.get("/ping", headers=headers)
+    assert response.status_code == 200
+    assert "x-profile" not in response.headers
+    assert list(directory.iterdir()) == []
+
+
+def test_token_profiles_the_request(profiled):
+    client, directory = profiled
+    response = client.get("/ping", headers={"X-Profile": "secret"})
+    assert response.status_code == 200
+    assert [path.name for path in directory.iterdir()] == [response.headers["x-profile"]]
+
+
+def test_no_token_configured(profiled, monkeypatch):
+    client, directory = profiled
+    monkeypatch.setattr(get_settings(), "PROFILE_TOKEN", None)
+    client.get("/ping", headers={"X-Profile": "secret"})
+    assert list(directory.iterdir()) == []
@@ -0,0 +1,98 @@
+import pytest
+
+from app.config import get_settings
+from tests.query_counter import count_queries
+
+# Statements per request on SQLite with the user already in the auth cache
+
+
+@pytest.fixture
+def card_id(client, headers):
+    response = client.post(
+        "/debt/cards",
+        params={"name": "Card", "balance": 500, "interest_rate": 19.9, "min_payment": 25},
+        headers=headers
+    )
+    return response.json()["id"]
+
+
+def _expense(credit_card_id=None):
+    return {
+        "description": "Groceries",
+        "amount": 12.5,
+        "date": "2026-01-15T00:00:00",
+        "balance_type": "credit_card" if credit_card_id else "cash",
+        "credit_card_id": credit_card_id
+    }
+
+
+def test_create_card(client, headers):
+    with count_queries() as queries:
+        response = client.post(
+            "/debt/cards",
+            params={"name": "Card", "balance": 500, "interest_rate": 19.9, "min_payment": 25},
+            headers=headers
+        )
+    assert response.status_code == 201
+    queries.assert_at_most(1)
+
+
+def test_cash_expense(client, headers):
+    client.post("/expenses/balance", json={"balance": 100}, headers=headers)
+
+    with count_queries() as queries:
+        response = client.post("/expenses/expenses", json=_expense(), headers=headers)
+    assert response.status_code == 200
+    queries.assert_at_most(2)
+
+    expense_id = response.json()["expense"]["id"]
+    with count_queries() as queries:
+        response = client.delete(f"/expenses/{expense_id}", headers=headers)
+    assert response.status_code == 200
+    queries.assert_at_most(2)
+
+
+def test_card_expense(client, headers, card_id):
+    with count_queries() as queries:
+        response = client.post("/expenses/expenses", json=_expense(card_id), headers=headers)
+    assert response.status_code == 200
+    queries.assert_at_most(2)
+
+    expense_id = response.json()["expense"]["id"]
+    with count_queries() as queries:
+        response = client.delete(f"/expenses/{expense_id}", headers=headers)
+    assert response.status_code == 200
+    queries.assert_at_most(2)
+
+
+def test_payment(client, headers, card_id):
+    payment = {"credit_card_id": card_id, "amount": 50, "interest_portion": 8, "principal_portion": 42}
+    with count_queries() as queries:
+        response = client.post("/payments/", json=payment, headers=headers)
+    assert response.status_code == 201
+    queries.assert_at_most(2)
+
+    payment_id = response.json()["id"]
+    with count_queries() as queries:
+        response = client.delete(f"/payments/{payment_id}", headers=headers)
+    assert response.status_code == 200
+    queries.assert_at_most(2)
+
+
+def test_list_expenses(client, headers, card_id):
+    client.post("/expenses/expenses", json=_expense(), headers=headers)
+    client.post("/expenses/expenses", json=_expense(card_id), headers=headers)
+
+    with count_queries() as queries:
+        response = client.get("/expenses", headers=headers)
+    assert response.status_code == 200
+    queries.assert_at_most(2)
+
+
+def test_card_expense_with_rollups(client, headers, card_id, monkeypatch):
+    # Serving summaries from rollups costs one upsert per write
+    monkeypatch.setattr(get_settings(), "SUMMARY_FROM_ROLLUPS", True)
+    with count_queries() as queries:
+        response = client.post("/expenses/expenses", json=_expense(card_id), headers=headers)
+    assert response.status_code == 200
+    queries.assert_at_most(3)
@@ -0,0 +1,77 @@
+import random
+from decimal import Decimal
+
+import pytest
+
+from app.models.debt import CreditCard
+from app.services import replanner
+from app.services.calculator import payoff_schedule
+
+USER_ID = 1
+
+
+def _portfolio(rng: random.Random):
+    cards = [
+        CreditCard(
+            id=i + 1,
+            name=f"Card {i + 1}",
+            balance=Decimal(str(round(rng.uniform(100, 5000), 2))),
+            interest_rate=Decimal(str(round(rng.uniform(0.5, 25), 2))),
+            min_payment=Decimal(rng.randint(60, 200))
+        )
+        for i in range(rng.randint(1, 6))
+    ]
+    return cards, sum(card.min_payment for card in cards) + Decimal(rng.randint(0, 600))
+
+
+@pytest.fixture
+def full_plans(monkeypatch):
+    """Count the plans computed from scratch rather than replanned."""
+    calls = []
+    full_plan = replanner._full_plan
+
+    def counting(*args):
+        calls.append(args)
+        return full_plan(*args)
+
+    monkeypatch.setattr(replanner, "_full_plan", counting)
+    replanner.invalidate_user_plan(USER_ID)
+    yield calls
+    replanner.invalidate_user_plan(USER_ID)
+
+
+@pytest.mark.parametrize("seed", range(20))
+@pytest.mark.parametrize("strategy", ["avalanche", "snowball"])
+def test_replan_matches_full_recompute(full_plans, seed, strategy):
+    rng = random.Random(seed)
+    cards, monthly_payment = _portfolio(rng)
+    replanner.get_user_plan(USER_ID, cards, strategy, monthly_payment)
+
+    for _ in range(3):
+        position = rng.randrange(len(cards))
+        change = Decimal(str(round(rng.uniform(-300, 300), 2)))
+        cards = list(cards)
+        cards[position] = cards[position].model_copy(
+            update={"balance": max(Decimal("1"), cards[position].balance + change)}
+        )
+        schedule, totals = replanner.get_user_plan(USER_ID, cards, strategy, monthly_payment)
+        expected_schedule, expected = payoff_schedule(cards, strategy, monthly_payment)
+
+        assert totals["total_months"] == expected["total_months"]
+        assert totals["stop_reason"] == expected["stop_reason"]
+        assert abs(totals["total_interest_paid"] - expected["total_interest_paid"]) < Decimal("1e-9")
+        assert abs(totals["total_amount_paid"] - expected["total_amount_paid"]) < Decimal("1e-9")
+        assert schedule.months == expected_schedule.months
+        for column in ("payments", "interest", "balances", "remaining_debts"):
+            for got, want in zip(getattr(schedule, column), getattr(expected_schedule, column)):
+                assert abs(got - want) < Decimal("1e-9"), column
+
+
+def test_single_balance_change_is_replanned(full_plans):
+    cards, monthly_payment = _portfolio(random.Random("replan"))
+    cards = [card.model_copy(update={"balance": Decimal("4000")}) for card in cards]
+    replanner.get_user_plan(USER_ID, cards, "avalanche", monthly_payment)
+    cards[0] = cards[0].model_copy(update={"balance": Decimal("3900")})
+    replanner.get_user_plan(USER_ID, cards, "avalanche", monthly_payment)
+    replanner.get_user_plan(USER_ID, cards, "avalanche", monthly_payment)
+    assert len(full_plans) == 1
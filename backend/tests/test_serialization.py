@@ -0,0 +1,18 @@
+import json
+from decimal import Decimal
+
+import pytest
+
+from app.services import serialization
+from app.services.serialization import dumps_json
+
+
+@pytest.mark.parametrize("fast", [True, False])
+def test_dumps_json_matches_json_dumps(monkeypatch, fast):
+    if not fast:
+        monkeypatch.setattr(serialization, "orjson", None)
+    elif serialization.orjson is None:
+        pytest.skip("orjson is not installed")
+
+    data = {"by_card": {1: Decimal("12.50"), 2: 3}, "months": [{"month": 1, "paid": Decimal("0.1")}]}
+    assert json.loads(dumps_json(data)) == {"by_card": {"1": 12.5, "2": 3}, "months": [{"month": 1, "paid": 0.1}]}
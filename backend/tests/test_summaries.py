@@ -0,0 +1,87 @@
+import asyncio
+
+from sqlalchemy import func, select
+
+from app.config import get_settings
+from app.database import AsyncSessionLocal, SessionLocal
+from app.models.db_models import ExpenseMonthlyTotal, PaymentMonthlyTotal
+from app.services.summaries import rebuild_rollups
+
+
+def _rollup_rows(user_id):
+    with SessionLocal() as db:
+        expenses = db.execute(
+            select(func.count()).where(ExpenseMonthlyTotal.user_id == user_id)
+        ).scalar_one()
+        payments = db.execute(
+            select(func.count()).where(PaymentMonthlyTotal.user_id == user_id)
+        ).scalar_one()
+    return expenses + payments
+
+
+def _user_id(client, headers):
+    return client.get("/users/me", headers=headers).json()["id"]
+
+
+def _write_ledger(client, headers):
+    card_id = client.post(
+        "/debt/cards",
+        params={"name": "Card", "balance": 5000, "interest_rate": 19.9, "min_payment": 25},
+        headers=headers
+    ).json()["id"]
+    expenses = [
+        {"description": "Rent", "amount": 900, "date": "2026-01-31T23:30:00", "balance_type": "cash"},
+        {
+            "description": "Flight",
+            "amount": 240.5,
+            "date": "2026-02-01T00:15:00",
+            "balance_type": "credit_card",
+            "credit_card_id": card_id
+        }
+    ]
+    ids = [client.post("/expenses/expenses", json=expense, headers=headers).json()["expense"]["id"] for expense in expenses]
+    payment = {"credit_card_id": card_id, "amount": 100, "interest_portion": 20, "principal_portion": 80}
+    client.post("/payments/", json=payment, headers=headers)
+    client.post(
+        "/expenses/import",
+        content="description,amount,date,credit_card_id\nBooks,35.25,2026-03-05T10:00:00,\n",
+        headers={**headers, "Content-Type": "text/csv"}
+    )
+    client.delete(f"/expenses/{ids[0]}", headers=headers)
+    return card_id
+
+
+def test_rollups_untouched_while_disabled(client, headers):
+    assert not get_settings().SUMMARY_FROM_ROLLUPS
+    _write_ledger(client, headers)
+    assert _rollup_rows(_user_id(client, headers)) == 0
+
+
+def test_rollups_match_the_ledger(client, headers, monkeypatch):
+    monkeypatch.setattr(get_settings(), "SUMMARY_FROM_ROLLUPS", True)
+    card_id = _write_ledger(client, headers)
+    client.delete(f"/debt/cards/{card_id}", headers=headers)
+
+    from_rollups = [client.get(f"/{kind}/summary", headers=headers).json() for kind in ("expenses", "payments")]
+    monkeypatch.setattr(get_settings(), "SUMMARY_FROM_ROLLUPS", False)
+    from_ledger = [client.get(f"/{kind}/summary", headers=headers).json() for kind in ("expenses", "payments")]
+
+    assert _rollup_rows(_user_id(client, headers)) > 0
+    assert from_rollups == from_ledger
+    assert [month["month"] for month in from_ledger[0]["months"]] == ["2026-02", "2026-03"]
+
+
+def test_rebuild_after_turning_rollups_on(client, headers, monkeypatch):
+    _write_ledger(client, headers)
+    from_ledger = [client.get(f"/{kind}/summary", headers=headers).json() for kind in ("expenses", "payments")]
+
+    monkeypatch.setattr(get_settings(), "SUMMARY_FROM_ROLLUPS", True)
+
+    async def rebuild():
+        async with AsyncSessionLocal() as db:
+            await rebuild_rollups(db)
+            await db.commit()
+
+    asyncio.run(rebuild())
+    from_rollups = [client.get(f"/{kind}/summary", headers=headers).json() for kind in ("expenses", "payments")]
+    assert from_rollups == from_ledger
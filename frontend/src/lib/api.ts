@@ -181,7 +181,7 @@ class ApiClient {
   async getUserPayments() {
     const response = await this.client.get('/payments');
     // Convert Decimal values to numbers
-    return response.data.map((payment: any) => ({
+    return response.data.payments.map((payment: any) => ({
       ...payment,
       amount: Number(payment.amount),
       interest_portion: Number(payment.interest_portion),
@@ -191,7 +191,7 @@ class ApiClient {
 
   async getCardPayments(cardId: number) {
     const response = await this.client.get(`/payments/cards/${cardId}`);
-    return response.data;
+    return response.data.payments;
   }
 
   async deletePayment(paymentId: number): Promise<void> {